@@ -1,8 +1,229 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from datetime import datetime, timedelta
+import argparse
+import csv
+import json
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from datetime import datetime
+
+from app.Crawling.bulk_loader import load_known_rec_idx, load_saramin_stream, parse_rec_idx
+from app.Crawling.columnar import parquet_sink
+from app.Crawling.fetcher import CRAWL_CONCURRENCY, CRAWL_RATE, Fetcher
+from app.Crawling.page_cache import PageCache
+from app.Crawling.parsers import CRAWL_PARSER, PARSERS, get_parser
+
+
+CRAWL_BASE_URL = os.getenv('CRAWL_BASE_URL', 'https://www.saramin.co.kr')  # 로컬 stub 서버로 바꿔 테스트할 수 있다
+SEARCH_PATH = "/zf_user/search?search_area=main&search_done=y&search_optional_item=n&loc_mcd=101000%2C102000&cat_mcls=2&recruitPage={page}&recruitSort={sort}&recruitPageCount=40&inner_com_type=&company_cd=0%2C1%2C2%2C3%2C4%2C5%2C6%2C7%2C9%2C10&searchword=&show_applied=&quick_apply=&except_read=&ai_head_hunting=&mainSearch=n"
+HEADERS = {
+    'User-Agent':'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Whale/3.28.266.14 Safari/537.36'
+}
+CRAWL_MAX_PAGES = int(os.getenv('CRAWL_MAX_PAGES', 100))  # 증분 크롤링 최대 페이지
+CRAWL_STOP_AFTER = int(os.getenv('CRAWL_STOP_AFTER', 2))  # 새 공고가 없는 페이지가 이만큼 연속이면 증분 크롤링 종료
+CRAWL_CHECKPOINT = os.getenv('CRAWL_CHECKPOINT', './data/crawl_checkpoint.json')  # 증분 크롤링 진행 상황 파일
+CSV_COLUMNS = ['채용 제목', '채용 링크', '회사명', '회사 링크', '지역', '경력', '학력', '고용형태', '연봉', '직무 분야', '등록일', '마감일']
+
+
+def parse_page(html, now=None, parser=None):
+    """
+    검색 결과 페이지 HTML 의 채용공고 목록을 CSV 행 형식의 dict 목록으로 변환한다.
+
+    Args:
+        html (str): 검색 결과 페이지
+        now (datetime): 상대 날짜(마감일)의 기준 시각 (기본: 현재)
+        parser (str): 파서 backend 이름 (기본: CRAWL_PARSER)
+    """
+    return get_parser(parser).parse_page(html, now)
+
+
+def iter_numbered_pages(pages=1, fetcher=None, base_url=CRAWL_BASE_URL, cache=None, parser=None,
+                        sort='relation', start_page=1):
+    """
+    start_page 부터 pages 페이지까지 크롤링하여 (페이지 번호, 채용공고 목록) 을 순서대로 반환하는 generator.
+    요청에 실패한 페이지는 채용공고 목록이 None 이다.
+
+    Args:
+        pages (int): 마지막 페이지 번호
+        fetcher (Fetcher): 요청에 사용할 fetcher (기본: 환경 변수 설정)
+        base_url (str): 요청 대상 주소
+        cache (PageCache): 지정하면 받은 HTML 을 캐시에 저장한다 (iter_cached_pages 로 재파싱)
+        parser (str): 파서 backend 이름 (기본: CRAWL_PARSER)
+        sort (str): 검색 정렬 (relation: 관련도순, reg_dt: 등록일순)
+        start_page (int): 첫 페이지 번호
+    """
+    fetcher = fetcher or Fetcher(headers=HEADERS)
+    urls = (base_url + SEARCH_PATH.format(page=page, sort=sort) for page in range(start_page, pages + 1))
+    recorder = cache.start_crawl() if cache else None
+
+    try:
+        for page, (url, response, error) in enumerate(fetcher.map(urls), start=start_page):
+            if error is not None:
+                print(f"페이지 요청 중 에러 발생: {error}")
+                yield page, None
+                continue
+
+            if recorder:
+                recorder.record(page, url, response.text)
+            print(f"{page}페이지 크롤링 완료")
+            yield page, parse_page(response.text, parser=parser)
+    finally:
+        if recorder:
+            recorder.close()
+            print(f"원본 HTML 저장 완료: crawl_id={recorder.crawl_id}")
+
+
+def iter_saramin_pages(pages=1, fetcher=None, base_url=CRAWL_BASE_URL, cache=None, parser=None):
+    """
+    사람인 채용공고를 페이지 단위로 크롤링하는 generator.
+    페이지를 동시에 요청하되 호스트당 요청 빈도는 fetcher 의 rate limit 을 따른다. (서버 부하 방지)
+    페이지를 받는 즉시 순서대로 반환하므로 소비자가 크롤링이 끝나기를 기다리지 않고 적재할 수 있다.
+
+    Args:
+        pages (int): 크롤링할 페이지 수
+        fetcher (Fetcher): 요청에 사용할 fetcher (기본: 환경 변수 설정)
+        base_url (str): 요청 대상 주소
+        cache (PageCache): 지정하면 받은 HTML 을 캐시에 저장한다 (iter_cached_pages 로 재파싱)
+        parser (str): 파서 backend 이름 (기본: CRAWL_PARSER)
+
+    Yields:
+        list: 한 페이지의 채용공고 (CSV 행 형식의 dict 목록)
+    """
+    for _, jobs in iter_numbered_pages(pages, fetcher, base_url, cache, parser):
+        if jobs is not None:
+            yield jobs
+
+
+class CrawlCheckpoint:
+    """
+    증분 크롤링 진행 상황 파일. 페이지를 처리할 때마다 마지막으로 끝낸 페이지를 기록하고,
+    크롤링이 정상적으로 끝나면 지운다. 중단된 크롤링은 다음 실행 때 이어서 진행한다.
+
+    Args:
+        path (str): checkpoint 파일 경로
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """
+        Returns:
+            dict: {"last_page", "known_streak"} (파일이 없으면 처음부터)
+        """
+        if not os.path.exists(self.path):
+            return {'last_page': 0, 'known_streak': 0}
+        with open(self.path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def save(self, last_page, known_streak):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'last_page': last_page,
+                'known_streak': known_streak,
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+            }, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def iter_new_pages(known, max_pages=CRAWL_MAX_PAGES, stop_after=CRAWL_STOP_AFTER, checkpoint=None, **kwargs):
+    """
+    등록일순으로 크롤링하다가 이미 저장된 공고만 있는 페이지가 stop_after 페이지 연속으로 나오면 멈추는 generator.
+    새 공고가 없는 날에는 몇 페이지만 요청하고 끝난다.
+
+    등록일순 목록은 크롤링 중에도 새 공고가 앞에 끼어들어 뒤로 밀리므로, 이어서 진행할 때 일부 공고를
+    다시 받을 수 있다. (적재는 rec_idx 기준 upsert 라 중복되지 않는다)
+
+    Args:
+        known (set): 이미 저장된 rec_idx
+        max_pages (int): 최대 페이지 번호
+        stop_after (int): 이 페이지 수만큼 연속으로 새 공고가 없으면 멈춘다
+        checkpoint (CrawlCheckpoint): 지정하면 중단된 위치부터 이어서 진행하고 진행 상황을 기록한다
+        **kwargs: iter_numbered_pages 인자 (fetcher, base_url, cache, parser)
+
+    Yields:
+        list: 한 페이지의 채용공고
+    """
+    state = checkpoint.load() if checkpoint else {'last_page': 0, 'known_streak': 0}
+    known_streak = state['known_streak']
+    if state['last_page']:
+        print(f"{state['last_page']}페이지까지 진행한 크롤링을 이어서 진행합니다.")
+
+    finished = False
+    for page, jobs in iter_numbered_pages(max_pages, sort='reg_dt', start_page=state['last_page'] + 1, **kwargs):
+        if jobs is None:
+            print(f"{page}페이지를 받지 못해 중단합니다. 다음 실행 때 이 페이지부터 이어서 진행합니다.")
+            return
+
+        new_jobs = sum(1 for job in jobs if parse_rec_idx(job['채용 링크']) not in known)
+        known_streak = known_streak + 1 if new_jobs == 0 else 0
+        yield jobs
+
+        # 소비자가 페이지를 처리한 뒤에 진행 상황을 기록한다
+        if checkpoint:
+            checkpoint.save(page, known_streak)
+        if not jobs or known_streak >= stop_after:
+            print(f"새 공고가 없는 페이지가 {known_streak}페이지 연속이라 {page}페이지에서 멈춥니다.")
+            finished = True
+            break
+    else:
+        finished = True
+
+    if finished and checkpoint:
+        checkpoint.clear()
+
+
+def _parse_cached(args):
+    root, digest, fetched_at, parser = args
+    return parse_page(PageCache(root).load(digest), datetime.fromisoformat(fetched_at), parser)
+
+
+def iter_cached_pages(crawl_id='latest', processes=None, cache=None, parser=None):
+    """
+    캐시에 저장된 크롤링을 네트워크 없이 여러 프로세스에서 다시 파싱하는 generator.
+    상대 날짜(마감일)는 페이지를 받은 시각 기준으로 계산하므로 원래 크롤링과 같은 결과가 나온다.
+
+    Args:
+        crawl_id (str): 크롤링 id ('latest' 면 가장 최근)
+        processes (int): 파싱 프로세스 수 (기본: CPU 수)
+        cache (PageCache): 캐시 (기본: CRAWL_CACHE_DIR)
+        parser (str): 파서 backend 이름 (기본: CRAWL_PARSER)
+
+    Yields:
+        list: 한 페이지의 채용공고 (iter_saramin_pages 와 같은 형식, 페이지 순서)
+    """
+    cache = cache or PageCache()
+    tasks = [(cache.root, entry['sha256'], entry['fetched_at'], parser) for entry in cache.manifest(crawl_id)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield from executor.map(_parse_cached, tasks, chunksize=max(1, len(tasks) // ((processes or os.cpu_count() or 1) * 4)))
+
+
+def iter_saramin_jobs(pages=1):
+    """사람인 채용공고를 한 건씩 반환하는 generator."""
+    for jobs in iter_saramin_pages(pages):
+        yield from jobs
+
+
+def csv_sink(chunks, file_path, append=False):
+    """
+    chunk(행 목록)를 CSV 파일에 쓰면서 그대로 다시 반환하는 generator.
+    크롤링 결과를 DB 로 보내면서 CSV 도 남길 때 사용한다. append 면 기존 파일 뒤에 이어 쓴다.
+    """
+    append = append and os.path.exists(file_path)
+    with open(file_path, mode='a' if append else 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+        if not append:
+            writer.writeheader()
+        for rows in chunks:
+            writer.writerows(rows)
+            file.flush()
+            yield rows
 
 
 def crawl_saramin(pages=1):
@@ -15,112 +236,52 @@ def crawl_saramin(pages=1):
     Returns:
         DataFrame: 채용공고 정보가 담긴 데이터프레임
     """
+    return pd.DataFrame(list(iter_saramin_jobs(pages)), columns=CSV_COLUMNS)
 
-    jobs = []
-    headers = {
-        'User-Agent':'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Whale/3.28.266.14 Safari/537.36'
-    }
-
-    for page in range(1, pages + 1):
-        url = f"https://www.saramin.co.kr/zf_user/search?search_area=main&search_done=y&search_optional_item=n&loc_mcd=101000%2C102000&cat_mcls=2&recruitPage={page}&recruitSort=relation&recruitPageCount=40&inner_com_type=&company_cd=0%2C1%2C2%2C3%2C4%2C5%2C6%2C7%2C9%2C10&searchword=&show_applied=&quick_apply=&except_read=&ai_head_hunting=&mainSearch=n"
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # 채용공고 목록 가져오기
-            job_listings = soup.select('div.item_recruit')
-
-            for job in job_listings:
-                try:
-                    title_tag = job.select_one('h2.job_tit a')
-                    title = title_tag.text.strip() if title_tag else '정보 없음'
-                    job_link = 'https://www.saramin.co.kr' + title_tag['href'] if title_tag else '정보 없음'
-
-                    # 회사명 및 링크
-                    company_tag = job.select_one('strong.corp_name a')
-                    company = company_tag.text.strip() if company_tag else '정보 없음'
-                    company_link = 'https://www.saramin.co.kr' + company_tag['href'] if company_tag else '정보 없음'
-
-                    # 채용 조건
-                    conditions = job.select('div.job_condition span')
-                    location = conditions[0].text.strip() if len(conditions) > 0 else '정보 없음'
-                    career = conditions[1].text.strip() if len(conditions) > 1 else '정보 없음'
-                    education = conditions[2].text.strip() if len(conditions) > 2 else '정보 없음'
-                    employment_type = conditions[3].text.strip() if len(conditions) > 3 else '정보 없음'
-                    salary = conditions[4].text.strip() if len(conditions) > 4 else '정보 없음'
-
-                    # 직무 분야
-                    sectors = job.select('div.job_sector a')
-                    sector_list = [sector.text.strip() for sector in sectors]
-                    job_sector = ', '.join(sector_list) if sector_list else '정보 없음'
-
-                    # 등록일
-                    register_date_tag = job.select_one('span.job_day')
-                    register_date = register_date_tag.text.strip()
-                    if '등록일' in register_date or '수정일' in register_date:
-                        register_date = register_date.replace('등록일 ', '').replace('수정일 ', '')
-                        register_date = f"20{register_date}"
-
-                    else:
-                        register_date = '정보 없음'
-
-                    # 마감일
-                    deadline_tag = job.select_one('span.date')
-                    deadline = deadline_tag.text.strip()
-                    if '내일마감' in deadline:
-                        deadline = (datetime.now() + timedelta(days=1)).strftime('%Y/%m/%d')
-                    elif '오늘마감' in deadline:
-                        deadline = datetime.now().strftime('%Y/%m/%d')
-                    elif '상시채용' in deadline:
-                        deadline = '상시채용'
-                    elif '채용시' in deadline:
-                        deadline = '채용시'
-                    else:
-                        # "~ MM/DD(요일)" 형태를 "YYYY/MM/DD"로 변환
-                        try:
-                            deadline = deadline.replace('~ ', '').split('(')[0].strip()
-                            deadline = datetime.strptime(deadline, '%m/%d').replace(
-                                year=datetime.now().year).strftime('%Y/%m/%d')
-                        except ValueError:
-                            deadline = '정보 없음'
-
-                    # 데이터 저장
-                    jobs.append({
-                        '채용 제목': title,
-                        '채용 링크': job_link,
-                        '회사명': company,
-                        '회사 링크': company_link,
-                        '지역': location,
-                        '경력': career,
-                        '학력': education,
-                        '고용형태': employment_type,
-                        '연봉': salary,
-                        '직무 분야': job_sector,
-                        '등록일': register_date,
-                        '마감일': deadline,
-                    })
-
-                except AttributeError as e:
-                    print(f"항목 파싱 중 에러 발생: {e}")
-                    continue
 
-            print(f"{page}페이지 크롤링 완료")
-            time.sleep(3)  # 서버 부하 방지를 위한 딜레이
-
-        except requests.RequestException as e:
-            print(f"페이지 요청 중 에러 발생: {e}")
-            continue
+def main():
+    parser = argparse.ArgumentParser(description='사람인 채용공고 크롤링')
+    parser.add_argument('--pages', type=int, default=25)  # 40 * 25 = 1000개 데이터
+    parser.add_argument('--csv', default='./data/saramin.csv', help="CSV 저장 경로 ('' 이면 저장하지 않음)")
+    parser.add_argument('--parquet', default='', help='정규화한 결과를 Parquet 으로도 저장할 경로')
+    parser.add_argument('--db', action='store_true', help='크롤링한 페이지를 바로 DB 에 적재')
+    parser.add_argument('--concurrency', type=int, default=CRAWL_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=CRAWL_RATE, help='호스트당 초당 요청 수')
+    parser.add_argument('--cache', action='store_true', help='받은 원본 HTML 을 CRAWL_CACHE_DIR 에 저장')
+    parser.add_argument('--replay', metavar='CRAWL_ID', help="요청 없이 저장된 크롤링을 다시 파싱 ('latest': 가장 최근)")
+    parser.add_argument('--processes', type=int, default=None, help='--replay 파싱 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--parser', choices=sorted(PARSERS), default=CRAWL_PARSER, help='HTML 파서 backend')
+    parser.add_argument('--incremental', action='store_true',
+                        help='등록일순으로 DB 에 없는 공고만 나올 때까지 크롤링 (--pages 대신 --max-pages)')
+    parser.add_argument('--max-pages', type=int, default=CRAWL_MAX_PAGES)
+    parser.add_argument('--stop-after', type=int, default=CRAWL_STOP_AFTER)
+    parser.add_argument('--checkpoint', default=CRAWL_CHECKPOINT, help="증분 크롤링 진행 상황 파일 ('' 이면 사용하지 않음)")
+    args = parser.parse_args()
 
-    return pd.DataFrame(jobs)
+    started = time.perf_counter()
+    if args.replay:
+        chunks = iter_cached_pages(args.replay, args.processes, parser=args.parser)
+    elif args.incremental:
+        checkpoint = CrawlCheckpoint(args.checkpoint) if args.checkpoint else None
+        fetcher = Fetcher(args.concurrency, args.rate, headers=HEADERS)
+        chunks = iter_new_pages(load_known_rec_idx(), args.max_pages, args.stop_after, checkpoint, fetcher=fetcher,
+                                cache=PageCache() if args.cache else None, parser=args.parser)
+    else:
+        # 서울, 경기 지역 it 개발 . 데이터 전체 크롤링
+        fetcher = Fetcher(args.concurrency, args.rate, headers=HEADERS)
+        chunks = iter_saramin_pages(args.pages, fetcher, cache=PageCache() if args.cache else None,
+                                    parser=args.parser)
+    if args.csv:
+        chunks = csv_sink(chunks, args.csv, append=args.incremental)  # 증분 크롤링은 기존 CSV 뒤에 추가
+    if args.parquet:
+        chunks = parquet_sink(chunks, args.parquet)
 
-def main():
-    # 서울, 경기 지역 it 개발 . 데이터 전체 크롤링
-    df = crawl_saramin(pages=25) # 40 * 25 = 1000개 데이터
-    df.to_csv('./data/saramin.csv', index=False)
-    print(f"크롤링 완료: 총 {len(df)}개 공고 저장")
+    if args.db:
+        load_saramin_stream(chunks)
+    else:
+        total = sum(len(rows) for rows in chunks)
+        print(f"크롤링 완료: 총 {total}개 공고 저장 ({time.perf_counter() - started:.2f}초)")
 
 # 사용 예시
 if __name__ == "__main__":
-   main()
\ No newline at end of file
+   main()
@@ -0,0 +1,59 @@
+"""
+대량 적재 벤치마크.
+
+data/saramin.csv 를 지정한 행 수(기본 1,000,000)만큼 복제한 임시 CSV 를 만들어 BulkLoader 로 적재하고
+rows/sec 을 출력한다. 복제한 행은 채용 링크의 rec_idx 를 바꿔 서로 다른 공고가 되도록 한다.
+
+주의: .env 에 설정된 DB 에 실제로 적재하므로 벤치마크용 DB 에서 실행할 것.
+
+사용 예:
+    python -m app.Crawling.bench_bulk_load --rows 1000000 --chunk-size 1000
+"""
+import argparse
+import csv
+import os
+import re
+import tempfile
+
+from app.Crawling.bulk_loader import BULK_CHUNK_SIZE, load_saramin_csv
+
+_REC_IDX = re.compile(r'rec_idx=\d+')
+
+
+def replicate_csv(source, target, rows):
+    """source CSV 의 행을 반복하여 rows 행짜리 target CSV 를 만든다."""
+    with open(source, mode='r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        fieldnames = reader.fieldnames
+        template = list(reader)
+
+    with open(target, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        for i in range(rows):
+            row = dict(template[i % len(template)])
+            row['채용 링크'] = _REC_IDX.sub(f'rec_idx={900000000 + i}', row['채용 링크'])
+            writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='saramin.csv 대량 적재 벤치마크')
+    parser.add_argument('--source', default='./data/saramin.csv')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        print(f"{args.source} 를 {args.rows:,}행으로 복제 중...")
+        replicate_csv(args.source, path, args.rows)
+        stats = load_saramin_csv(path, args.chunk_size)
+        print(f"[bench] rows={stats.rows} chunk_size={args.chunk_size} "
+              f"seconds={stats.seconds:.2f} rows_per_sec={stats.rows_per_sec:,.0f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+크롤링 fetcher 벤치마크 / 동작 확인.
+
+로컬 stub HTTP 서버가 사람인 검색 결과 형식의 페이지를 지연(--latency) 후 응답하고, 일부 요청에는
+503/429 를 먼저 반환한다. 같은 요청 빈도(--rate)에서 기존 순차 방식(요청 후 sleep)과 Fetcher 의
+소요 시간, 서버가 받은 요청 간격, 재시도 횟수를 비교한다. 실제 사람인 서버에는 요청하지 않는다.
+
+사용 예:
+    python -m app.Crawling.bench_fetcher --pages 25 --rate 2 --latency 0.5
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from app.Crawling.Crawling import HEADERS, SEARCH_PATH, iter_saramin_pages
+from app.Crawling.fetcher import CRAWL_CONCURRENCY, Fetcher
+
+ITEM = """
+<div class="item_recruit">
+  <h2 class="job_tit"><a href="/zf_user/jobs/relay/view?rec_idx={rec_idx}">채용 {rec_idx}</a></h2>
+  <strong class="corp_name"><a href="/zf_user/company-info/view?csn={rec_idx}">회사 {rec_idx}</a></strong>
+  <div class="job_condition"><span>서울 강남구</span><span>신입</span><span>대졸</span><span>정규직</span></div>
+  <div class="job_sector"><a>Python</a><a>Backend</a></div>
+  <span class="job_day">등록일 24/12/01</span>
+  <span class="date">~ 12/31(화)</span>
+</div>
+"""
+
+
+class StubState:
+    def __init__(self, latency, fail_every):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.times = []
+        self.failed_pages = set()
+
+
+def make_handler(state):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive
+
+        def do_GET(self):
+            page = int(parse_qs(urlsplit(self.path).query).get('recruitPage', ['1'])[0])
+            with state.lock:
+                state.requests += 1
+                state.times.append(time.monotonic())
+                fail = state.fail_every and page % state.fail_every == 0 and page not in state.failed_pages
+                if fail:
+                    state.failed_pages.add(page)
+            time.sleep(state.latency)
+
+            if fail:
+                status, body = (429 if page % 2 else 503), b''
+            else:
+                status = 200
+                body = ''.join(ITEM.format(rec_idx=page * 100 + i) for i in range(40)).encode()
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def min_interval(times):
+    times = sorted(times)
+    return min((b - a for a, b in zip(times, times[1:])), default=0.0)
+
+
+def sequential(base_url, pages, delay):
+    """기존 방식: 페이지마다 새 연결로 요청한 뒤 delay 초 대기 (재시도 없음)"""
+    count = 0
+    for page in range(1, pages + 1):
+        try:
+            response = requests.get(base_url + SEARCH_PATH.format(page=page, sort='relation'), headers=HEADERS)
+            response.raise_for_status()
+            count += response.text.count('item_recruit')
+        except requests.RequestException:
+            pass
+        time.sleep(delay)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='크롤링 fetcher 벤치마크 (로컬 stub 서버)')
+    parser.add_argument('--pages', type=int, default=25)
+    parser.add_argument('--rate', type=float, default=2, help='호스트당 초당 요청 수 (순차 방식은 1/rate 초 sleep)')
+    parser.add_argument('--latency', type=float, default=0.5, help='stub 서버 응답 지연(초)')
+    parser.add_argument('--concurrency', type=int, default=CRAWL_CONCURRENCY)
+    parser.add_argument('--fail-every', type=int, default=7, help='n 번째 페이지마다 첫 요청에 429/503 반환 (0: 사용 안 함)')
+    args = parser.parse_args()
+
+    for name in ('sequential', 'fetcher'):
+        state = StubState(args.latency, args.fail_every)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        started = time.perf_counter()
+        if name == 'sequential':
+            jobs = sequential(base_url, args.pages, 1 / args.rate)
+        else:
+            fetcher = Fetcher(args.concurrency, args.rate, burst=1, backoff=0.5, headers=HEADERS)
+            jobs = sum(len(rows) for rows in iter_saramin_pages(args.pages, fetcher, base_url))
+        seconds = time.perf_counter() - started
+        server.shutdown()
+        server.server_close()
+
+        print(f"[bench] {name:<10} pages={args.pages} jobs={jobs} requests={state.requests} "
+              f"seconds={seconds:.2f} min_interval={min_interval(state.times):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+HTML 파서 backend 벤치마크.
+
+저장된 크롤링(--crawl, page_cache)의 원본 HTML 을 backend 마다 파싱하여 pages/sec 을 출력하고,
+모든 backend 가 같은 레코드를 만드는지 확인한다. 저장된 크롤링이 없으면 사람인 검색 결과 형식의
+합성 페이지(--pages)를 사용한다. 네트워크는 사용하지 않는다.
+
+사용 예:
+    python -m app.Crawling.bench_parsers --crawl latest --repeat 3
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from app.Crawling.page_cache import PageCache
+from app.Crawling.parsers import PARSERS
+
+# 항목마다 조건/직무 분야 개수와 마감일 형식을 바꾸고, 일부는 필수 요소를 빼서 예외 처리 경로도 비교한다
+ITEM = """
+<div class="item_recruit" value="{rec_idx}">
+  <div class="area_job">
+    <h2 class="job_tit"><a href="/zf_user/jobs/relay/view?rec_idx={rec_idx}&amp;view_type=search" title="채용 {rec_idx}">
+      <span>[{rec_idx}] 백엔드 &amp; 데이터 엔지니어</span></a></h2>
+    <div class="job_date">{deadline}</div>
+    <div class="job_condition">{conditions}</div>
+    <div class="job_sector">{sectors}<span class="job_day">{job_day}</span></div>
+  </div>
+  <div class="area_corp"><strong class="corp_name"><a href="/zf_user/company-info/view?csn={rec_idx}">(주)회사 {rec_idx}</a></strong></div>
+</div>
+"""
+CONDITIONS = ['<span><a>서울</a> <a>강남구</a></span>', '<span>신입 · 경력</span>', '<span>대졸↑</span>',
+              '<span>정규직</span>', '<span>면접 후 결정</span>']
+SECTORS = ['<a>Python</a>', '<a>Django</a>', '<a>AWS</a>', '<a>SQL</a>']
+DEADLINES = ['~ 12/31(화)', '내일마감', '오늘마감', '상시채용', '채용시', '~ 02/30(일)']
+
+
+def synthetic_page(page):
+    items = []
+    for i in range(40):
+        rec_idx = page * 100 + i
+        deadline = '' if i == 39 else f'<span class="date">{DEADLINES[i % len(DEADLINES)]}</span>'
+        items.append(ITEM.format(
+            rec_idx=rec_idx,
+            deadline=deadline,
+            conditions=''.join(CONDITIONS[:1 + i % len(CONDITIONS)]),
+            sectors=''.join(SECTORS[:i % (len(SECTORS) + 1)]),
+            job_day='수정일 24/11/30' if i % 3 else '등록일 24/12/01',
+        ))
+    return f"<html><head><meta charset='utf-8'></head><body><div id='recruit_info_list'>{''.join(items)}</div></body></html>"
+
+
+def load_fixtures(crawl_id, pages):
+    """(html, fetched_at) 목록"""
+    if crawl_id:
+        cache = PageCache()
+        return [(cache.load(entry['sha256']), datetime.fromisoformat(entry['fetched_at']))
+                for entry in cache.manifest(crawl_id)]
+    now = datetime.now()
+    return [(synthetic_page(page), now) for page in range(1, pages + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML 파서 backend 벤치마크')
+    parser.add_argument('--crawl', metavar='CRAWL_ID', help="저장된 크롤링 사용 ('latest': 가장 최근)")
+    parser.add_argument('--pages', type=int, default=50, help='합성 페이지 수 (--crawl 이 없을 때)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.crawl, args.pages)
+    results = {}
+    for name, backend in PARSERS.items():
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            records = [backend.parse_page(html, now) for html, now in fixtures]
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        results[name] = records
+        jobs = sum(len(page) for page in records)
+        print(f"[bench] parser={name:<5} pages={len(fixtures)} jobs={jobs} "
+              f"seconds={best:.3f} pages_per_sec={len(fixtures) / best:,.1f}")
+
+    reference_name, reference = next(iter(results.items()))
+    for name, records in results.items():
+        if records != reference:
+            print(f"레코드 불일치: {reference_name} != {name}")
+            sys.exit(1)
+    print(f"모든 parser 의 레코드가 같습니다. ({', '.join(results)})")
+
+
+if __name__ == '__main__':
+    main()
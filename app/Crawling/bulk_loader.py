@@ -0,0 +1,468 @@
+"""
+사람인 CSV 대량 적재기.
+
+CSV 를 chunk 단위로 읽어 회사/태그를 메모리 맵으로 해석하고, chunk 마다 한 트랜잭션 안에서
+multi-row INSERT 로 기록한다. (행마다 SELECT/INSERT/commit 하던 방식 대비 왕복과 fsync 가 chunk 당 몇 번으로 줄어든다)
+
+공고는 채용 링크의 rec_idx 로 식별하며, 내용 해시를 비교해 새 공고는 추가하고 바뀐 공고만 갱신한다.
+같은 CSV 를 다시 적재해도 중복 공고가 생기지 않고 바뀐 부분만 기록된다.
+
+사용 예:
+    python -m app.Crawling.bulk_loader data/saramin.csv
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+import app.utils.DB_Utils
+from app.utils.versions import bump_version, record_change
+
+load_dotenv()
+
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))  # 한 트랜잭션에 적재할 행 수
+
+# 마감일 문자열 -> 저장 값
+DEADLINE_SENTINELS = {'상시채용': '9999-12-30', '채용시': '9999-12-31'}
+
+_REC_IDX = re.compile(r'[?&]rec_idx=(\d+)')
+
+# 내용 해시에 포함하는 필드 (채용 링크는 검색마다 search_uuid 가 달라지므로 제외)
+HASHED_FIELDS = ('title', 'company_name', 'company_link', 'region', 'district', 'career', 'education',
+                 'employment', 'salary', 'register_date', 'deadline', 'tags')
+
+
+def parse_date(value):
+    """'YYYY/MM/DD' 또는 'YYYY-MM-DD' 를 date 로 변환한다. 형식이 다르면('정보 없음' 등) None."""
+    value = (value or '').strip()
+    for fmt in ('%Y/%m/%d', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def parse_rec_idx(link):
+    """사람인 채용 링크에서 rec_idx 를 추출한다. 없으면 None."""
+    match = _REC_IDX.search(link or '')
+    return int(match.group(1)) if match else None
+
+
+def content_hash(record):
+    """레코드 내용의 sha256. 내용이 같으면 크롤링 시점과 관계없이 같은 값."""
+    values = [sorted(record[field]) if field == 'tags' else record[field] for field in HASHED_FIELDS]
+    raw = json.dumps(values, default=str, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def split_location(value):
+    """'서울 강남구', '경기 성남시 분당구', '서울전체' 를 (region, district) 로 나눈다."""
+    parts = value.replace('서울전체', '서울 전체').replace('경기전체', '경기 전체').split()
+    if not parts:
+        return None, None
+    return parts[0], ' '.join(parts[1:])
+
+
+def normalize_row(row):
+    """
+    CSV 한 행을 적재용 레코드로 변환한다.
+
+    Args:
+        row (dict): csv.DictReader 의 행 (크롤러 출력 컬럼)
+
+    Returns:
+        dict: title, link, company_name, company_link, region, district, career, education,
+              employment, salary, register_date, deadline, tags, rec_idx, content_hash 키를 가진 레코드
+    """
+    region, district = split_location(row['지역'])
+    deadline = (row['마감일'] or '').strip()
+    tags = [tag for tag in row['직무 분야'].split(', ') if tag]
+
+    record = {
+        'title': row['채용 제목'],
+        'link': row['채용 링크'],
+        'company_name': row['회사명'],
+        'company_link': row['회사 링크'],
+        'region': region,
+        'district': district,
+        'career': row['경력'],
+        'education': row['학력'],
+        'employment': row['고용형태'],
+        'salary': row['연봉'],
+        'register_date': parse_date(row['등록일']),
+        'deadline': DEADLINE_SENTINELS.get(deadline) or parse_date(deadline),
+        'tags': list(dict.fromkeys(tags)),
+        'rec_idx': parse_rec_idx(row['채용 링크']),
+    }
+    record['content_hash'] = content_hash(record)
+    return record
+
+
+def read_chunks(file_path, chunk_size=BULK_CHUNK_SIZE):
+    """CSV 를 chunk_size 행씩 나누어 dict 목록으로 반환하는 generator."""
+    with open(file_path, mode='r', encoding='utf-8') as csvfile:
+        chunk = []
+        for row in csv.DictReader(csvfile):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class LoadStats:
+    """
+    적재 통계. rows_per_sec 은 읽은 행 기준.
+
+    inserted: 새 공고, updated: 내용이 바뀐 공고, unchanged: 그대로인 공고(기록하지 않음),
+    skipped: 잘못된 행, expired: 이번 CSV 에 없고 마감일이 지난 기존 공고 수
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.expired = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.rows}행 처리 (추가 {self.inserted}, 갱신 {self.updated}, 변경 없음 {self.unchanged}, "
+                f"건너뜀 {self.skipped}, 만료 {self.expired}), "
+                f"{self.seconds:.1f}초, {self.rows_per_sec:,.0f} rows/sec")
+
+
+class BulkLoader:
+    """
+    채용 공고 대량 적재기.
+
+    지역/회사/태그 id 를 처음에 한 번 메모리로 읽어 두고, 새 회사/태그는 chunk 마다
+    multi-row INSERT 후 다시 읽어 맵에 추가한다.
+
+    Args:
+        connection: DB 연결. 적재 중에는 이 연결을 혼자 사용한다.
+        chunk_size (int): 한 트랜잭션에 적재할 행 수
+        publish (bool): chunk 마다 바뀐 공고를 ChangeLog 에 남겨 API 워커가 바로 반영하게 한다.
+                        (크롤링 결과를 스트리밍 적재할 때 사용. False 면 적재를 마칠 때 jobs 버전만 올린다)
+    """
+
+    def __init__(self, connection, chunk_size=BULK_CHUNK_SIZE, publish=False):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.publish = publish
+        self.locations = {}  # (region, district) -> location_id
+        self.companies = {}  # company name -> company_id
+        self.tags = {}       # tag name -> tag_id
+        self.seen = set()    # 이번 적재에서 본 rec_idx
+
+    def load_reference(self):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT id, region, district FROM Locations")
+            self.locations = {(region, district): location_id for location_id, region, district in cursor.fetchall()}
+            cursor.execute("SELECT id, name FROM Companies")
+            self.companies = {name: company_id for company_id, name in cursor.fetchall()}
+            cursor.execute("SELECT id, name FROM Tags")
+            self.tags = {name: tag_id for tag_id, name in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+    def resolve(self, cursor, records):
+        """
+        레코드에 location_id, company_id, tag_ids 를 채운다. 없는 회사/태그는 추가한다.
+        지역을 알 수 없는 레코드는 제외한다.
+
+        Returns:
+            tuple: (해석된 레코드 목록, 제외된 레코드 수)
+        """
+        resolved = []
+        for record in records:
+            record['location_id'] = self.locations.get((record['region'], record['district']))
+            if record['location_id']:
+                resolved.append(record)
+            else:
+                print(f"지역 정보가 없습니다: {record['region']}, {record['district']}")
+
+        # 새 회사: 처음 나온 레코드의 지역/링크로 추가
+        new_companies = {}
+        for record in resolved:
+            if record['company_name'] not in self.companies:
+                new_companies.setdefault(record['company_name'], (record['location_id'], record['company_link']))
+        if new_companies:
+            cursor.executemany(
+                "INSERT INTO Companies (name, location_id, link) VALUES (%s, %s, %s)",
+                [(name, location_id, link) for name, (location_id, link) in new_companies.items()]
+            )
+            placeholders = ', '.join(['%s'] * len(new_companies))
+            cursor.execute(f"SELECT id, name FROM Companies WHERE name IN ({placeholders})", list(new_companies))
+            self.companies.update({name: company_id for company_id, name in cursor.fetchall()})
+
+        # 새 태그: 다른 프로세스가 먼저 추가한 태그는 그대로 두고 id 만 읽는다
+        new_tags = list(dict.fromkeys(tag for record in resolved for tag in record['tags'] if tag not in self.tags))
+        if new_tags:
+            cursor.executemany("INSERT IGNORE INTO Tags (name) VALUES (%s)", new_tags)
+            if cursor.rowcount:
+                bump_version(cursor, 'tags')  # API 워커들의 태그 캐시 갱신
+            placeholders = ', '.join(['%s'] * len(new_tags))
+            cursor.execute(f"SELECT id, name FROM Tags WHERE name IN ({placeholders})", new_tags)
+            self.tags.update({name: tag_id for tag_id, name in cursor.fetchall()})
+
+        for record in resolved:
+            record['company_id'] = self.companies[record['company_name']]
+            record['tag_ids'] = [self.tags[tag] for tag in record['tags']]
+        return resolved, len(records) - len(resolved)
+
+    def write(self, cursor, records):
+        """
+        해석된 레코드를 rec_idx 기준으로 upsert 한다. 내용 해시가 같은 공고는 기록하지 않는다.
+        (commit 은 호출자가 수행)
+
+        Returns:
+            tuple: (추가 수, 갱신 수, 변경 없음 수)
+        """
+        # 같은 chunk 안에서 rec_idx 가 겹치면 마지막 행을 사용
+        latest, new_records = {}, []
+        for record in records:
+            if record['rec_idx'] is None:
+                new_records.append(record)
+            else:
+                latest[record['rec_idx']] = record
+
+        existing = {}
+        if latest:
+            placeholders = ', '.join(['%s'] * len(latest))
+            cursor.execute(
+                f"SELECT rec_idx, id, content_hash FROM Jobs WHERE rec_idx IN ({placeholders})",
+                list(latest)
+            )
+            existing = {rec_idx: (job_id, digest) for rec_idx, job_id, digest in cursor.fetchall()}
+
+        changed = []
+        for rec_idx, record in latest.items():
+            if rec_idx not in existing:
+                new_records.append(record)
+            elif existing[rec_idx][1] != record['content_hash']:
+                record['id'] = existing[rec_idx][0]
+                changed.append(record)
+
+        job_ids = self._insert(cursor, new_records)
+        self._update(cursor, changed)
+        if self.publish:
+            for job_id in job_ids + [record['id'] for record in changed]:
+                record_change(cursor, 'jobs', job_id)
+        return len(new_records), len(changed), len(records) - len(new_records) - len(changed)
+
+    def _insert(self, cursor, records):
+        if not records:
+            return []
+
+        # 한 문장의 multi-row INSERT 는 연속된 id 를 받으므로 lastrowid 부터 순서대로 대응된다
+        placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'] * len(records))
+        params = []
+        for record in records:
+            params += [
+                record['title'], record['company_id'], record['location_id'], record['career'],
+                record['education'], record['employment'], record['salary'], record['register_date'],
+                record['deadline'], record['link'], record['rec_idx'], record['content_hash'],
+            ]
+        cursor.execute(f"""
+            INSERT INTO Jobs (title, company_id, location_id, career, education, employment, salary, register_date,
+                              deadline, link, rec_idx, content_hash)
+            VALUES {placeholders}
+        """, params)
+        first_id = cursor.lastrowid
+        job_ids = list(range(first_id, first_id + len(records)))
+
+        # id 대응 확인 (PK 범위 조회 한 번)
+        cursor.execute("SELECT id, link FROM Jobs WHERE id BETWEEN %s AND %s ORDER BY id", (job_ids[0], job_ids[-1]))
+        if [link for _, link in cursor.fetchall()] != [record['link'] for record in records]:
+            raise RuntimeError("Jobs id 가 연속으로 할당되지 않았습니다. (innodb_autoinc_lock_mode 확인)")
+
+        job_tags = [(job_id, tag_id) for job_id, record in zip(job_ids, records) for tag_id in record['tag_ids']]
+        if job_tags:
+            cursor.executemany("INSERT IGNORE INTO JobTags (job_id, tag_id) VALUES (%s, %s)", job_tags)
+        return job_ids
+
+    def _update(self, cursor, records):
+        if not records:
+            return
+
+        # PK 로 multi-row upsert 하여 바뀐 공고를 한 문장으로 갱신 (조회수 등 나머지 컬럼은 유지)
+        placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'] * len(records))
+        params = []
+        for record in records:
+            params += [
+                record['id'], record['title'], record['company_id'], record['location_id'], record['career'],
+                record['education'], record['employment'], record['salary'], record['register_date'],
+                record['deadline'], record['link'], record['content_hash'],
+            ]
+        cursor.execute(f"""
+            INSERT INTO Jobs (id, title, company_id, location_id, career, education, employment, salary,
+                              register_date, deadline, link, content_hash)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE
+                title = VALUES(title), company_id = VALUES(company_id), location_id = VALUES(location_id),
+                career = VALUES(career), education = VALUES(education), employment = VALUES(employment),
+                salary = VALUES(salary), register_date = VALUES(register_date), deadline = VALUES(deadline),
+                link = VALUES(link), content_hash = VALUES(content_hash)
+        """, params)
+
+        # 태그는 다시 기록
+        job_ids = [record['id'] for record in records]
+        placeholders = ', '.join(['%s'] * len(job_ids))
+        cursor.execute(f"DELETE FROM JobTags WHERE job_id IN ({placeholders})", job_ids)
+        job_tags = [(record['id'], tag_id) for record in records for tag_id in record['tag_ids']]
+        if job_tags:
+            cursor.executemany("INSERT IGNORE INTO JobTags (job_id, tag_id) VALUES (%s, %s)", job_tags)
+
+    def load_chunk(self, rows, stats):
+        """CSV 행 chunk 하나를 한 트랜잭션으로 적재한다. 잘못된 행은 건너뛴다."""
+        records = []
+        for row in rows:
+            try:
+                records.append(normalize_row(row))
+            except (KeyError, AttributeError) as e:
+                print(f"에러 발생: 잘못된 행 {e}")
+                stats.rows += 1
+                stats.skipped += 1
+        if records:
+            self.load_records(records, stats)
+
+    def load_records(self, records, stats):
+        """정규화된 레코드 chunk 를 한 트랜잭션으로 적재한다. 실패하면 레코드 단위로 다시 시도해 문제 행만 건너뛴다."""
+        cursor = self.connection.cursor()
+        try:
+            resolved, unresolved = self.resolve(cursor, records)
+            inserted, updated, unchanged = self.write(cursor, resolved)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            # 실패한 트랜잭션에서 추가했던 회사/태그 id 는 무효이므로 다시 읽는다
+            self.load_reference()
+            if len(records) == 1:
+                print(f"에러 발생: {e}")
+                stats.rows += 1
+                stats.skipped += 1
+                return
+            print(f"chunk 적재 실패, 행 단위로 다시 시도: {e}")
+            for record in records:
+                self.load_records([record], stats)
+            return
+        finally:
+            cursor.close()
+
+        stats.rows += len(records)
+        stats.inserted += inserted
+        stats.updated += updated
+        stats.unchanged += unchanged
+        stats.skipped += unresolved
+        self.seen.update(record['rec_idx'] for record in resolved if record['rec_idx'] is not None)
+
+    def load_file(self, file_path):
+        """
+        CSV 파일 전체를 적재한다.
+
+        Returns:
+            LoadStats: 적재 통계
+        """
+        return self.load_stream(read_chunks(file_path, self.chunk_size))
+
+    def load_stream(self, chunks, normalized=False):
+        """
+        CSV 행 chunk 를 받는 대로 적재한다. 크롤러의 페이지 generator 를 그대로 넘길 수 있다.
+
+        Args:
+            chunks (iterable): CSV 행 형식 dict 목록의 iterable
+            normalized (bool): chunk 가 이미 정규화된 레코드 목록인 경우 (columnar.iter_parquet_records)
+
+        Returns:
+            LoadStats: 적재 통계
+        """
+        self.load_reference()
+        self.seen = set()
+        stats = LoadStats()
+        load = self.load_records if normalized else self.load_chunk
+        for rows in chunks:
+            if rows:
+                load(rows, stats)
+                print(stats)
+        self.finish(stats)
+        return stats
+
+    def finish(self, stats):
+        """적재를 마치고 만료 공고 수를 세며, 바뀐 공고가 있으면 jobs 버전을 올린다."""
+        cursor = self.connection.cursor()
+        try:
+            # 이번 CSV 에 없고 마감일이 지난 기존 크롤링 공고 (북마크/지원 내역이 참조하므로 삭제하지 않음)
+            cursor.execute("SELECT rec_idx FROM Jobs WHERE rec_idx IS NOT NULL AND deadline < CURDATE()")
+            stats.expired = sum(1 for (rec_idx,) in cursor.fetchall() if rec_idx not in self.seen)
+
+            # 바뀐 공고가 있으면 API 워커들이 공고 색인/응답 캐시를 다시 만들도록 jobs 버전을 올린다
+            # (ChangeLog 없이 버전만 올라가면 워커는 전체를 다시 읽는다. publish 면 chunk 마다 이미 남겼다)
+            if (stats.inserted or stats.updated) and not self.publish:
+                bump_version(cursor, 'jobs')
+            self.connection.commit()
+        finally:
+            cursor.close()
+
+
+def load_saramin_csv(file_path, chunk_size=BULK_CHUNK_SIZE):
+    connection = app.utils.DB_Utils.get_db_connection()
+    try:
+        stats = BulkLoader(connection, chunk_size).load_file(file_path)
+    finally:
+        connection.close()
+    print(f"적재 완료: {stats}")
+    return stats
+
+
+def load_known_rec_idx():
+    """DB 에 저장된 크롤링 공고의 rec_idx 집합 (증분 크롤링의 중단 기준)"""
+    connection = app.utils.DB_Utils.get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT rec_idx FROM Jobs WHERE rec_idx IS NOT NULL")
+        return {rec_idx for (rec_idx,) in cursor.fetchall()}
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def load_saramin_stream(chunks, chunk_size=BULK_CHUNK_SIZE):
+    """
+    크롤러가 반환하는 페이지(행 목록)를 받는 대로 적재한다. 페이지마다 commit 하고 ChangeLog 에 남기므로
+    크롤링이 끝나기 전에도 적재된 공고가 API 에 보인다. chunk_size 보다 큰 페이지는 나누어 적재한다.
+    """
+    def split(pages):
+        for rows in pages:
+            for start in range(0, len(rows), chunk_size):
+                yield rows[start:start + chunk_size]
+
+    connection = app.utils.DB_Utils.get_db_connection()
+    try:
+        stats = BulkLoader(connection, chunk_size, publish=True).load_stream(split(chunks))
+    finally:
+        connection.close()
+    print(f"적재 완료: {stats}")
+    return stats
+
+
+if __name__ == '__main__':
+    load_saramin_csv(sys.argv[1] if len(sys.argv) > 1 else './data/saramin.csv')
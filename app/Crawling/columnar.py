@@ -0,0 +1,218 @@
+"""
+크롤링 결과 columnar(Parquet) 저장/적재.
+
+CSV 는 날짜/마감일/지역이 모두 문자열이라 적재할 때 행마다 다시 파싱해야 한다. 여기서는 크롤링 결과를
+batch 단위로 pandas 벡터 연산으로 정규화하여 타입이 있는 컬럼으로 Parquet 에 저장한다.
+
+    title, link, company_name, company_link (string)
+    region, district                        (string, '서울 강남구' 분리)
+    career, education, employment, salary   (string)
+    register_date, deadline                 (date32, 알 수 없으면 null)
+    deadline_always, deadline_until_hired   (bool, '상시채용' / '채용시')
+    tags                                    (list<string>)
+    rec_idx                                 (int64, 채용 링크의 rec_idx)
+
+분석할 때는 read_table 로 pyarrow Table 을 읽어 필요한 컬럼만 zero-copy 로 사용하고, 적재할 때는
+iter_parquet_records 가 row group 단위로 BulkLoader 레코드를 만든다.
+
+사용 예:
+    python -m app.Crawling.columnar convert data/saramin.csv data/saramin.parquet
+    python -m app.Crawling.columnar load data/saramin.parquet
+"""
+import argparse
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+import app.utils.DB_Utils
+from app.Crawling.bulk_loader import BULK_CHUNK_SIZE, DEADLINE_SENTINELS, BulkLoader, content_hash, read_chunks
+
+load_dotenv()
+
+PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'zstd')  # Parquet 압축 방식
+
+# 크롤러 CSV 컬럼 -> columnar 컬럼 (그대로 옮기는 문자열 컬럼)
+TEXT_COLUMNS = {
+    '채용 제목': 'title',
+    '채용 링크': 'link',
+    '회사명': 'company_name',
+    '회사 링크': 'company_link',
+    '경력': 'career',
+    '학력': 'education',
+    '고용형태': 'employment',
+    '연봉': 'salary',
+}
+
+SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('link', pa.string()),
+    ('company_name', pa.string()),
+    ('company_link', pa.string()),
+    ('region', pa.string()),
+    ('district', pa.string()),
+    ('career', pa.string()),
+    ('education', pa.string()),
+    ('employment', pa.string()),
+    ('salary', pa.string()),
+    ('register_date', pa.date32()),
+    ('deadline', pa.date32()),
+    ('deadline_always', pa.bool_()),
+    ('deadline_until_hired', pa.bool_()),
+    ('tags', pa.list_(pa.string())),
+    ('rec_idx', pa.int64()),
+])
+
+
+def _parse_dates(values):
+    """'YYYY/MM/DD' 또는 'YYYY-MM-DD' 문자열 Series 를 날짜로 변환한다. 형식이 다르면 NaT."""
+    values = values.str.strip()
+    dates = pd.to_datetime(values, format='%Y/%m/%d', errors='coerce')
+    return dates.fillna(pd.to_datetime(values, format='%Y-%m-%d', errors='coerce'))
+
+
+def normalize_frame(frame):
+    """
+    크롤러 CSV 컬럼의 DataFrame 을 타입이 있는 columnar DataFrame 으로 변환한다. (bulk_loader.normalize_row 와 같은 규칙)
+
+    Args:
+        frame (DataFrame): 크롤러 출력 컬럼 (채용 제목, 지역, 마감일, 직무 분야 ...)
+
+    Returns:
+        DataFrame: SCHEMA 컬럼
+    """
+    frame = frame.fillna('').astype(str)
+    result = pd.DataFrame({column: frame[source] for source, column in TEXT_COLUMNS.items()})
+
+    # 지역: '서울 강남구', '경기 성남시 분당구', '서울전체' -> (region, district)
+    location = (frame['지역']
+                .str.replace('서울전체', '서울 전체', regex=False)
+                .str.replace('경기전체', '경기 전체', regex=False)
+                .str.replace(r'\s+', ' ', regex=True)
+                .str.strip())
+    parts = location.str.extract(r'^(\S+) ?(.*)$')
+    result['region'] = parts[0]
+    result['district'] = parts[1]
+
+    result['register_date'] = _parse_dates(frame['등록일']).dt.date
+    deadline = frame['마감일'].str.strip()
+    result['deadline_always'] = deadline == '상시채용'
+    result['deadline_until_hired'] = deadline == '채용시'
+    result['deadline'] = _parse_dates(deadline).dt.date
+
+    # 직무 분야: 'A, B, A' -> ['A', 'B'] (빈 값 제외, 순서 유지)
+    result['tags'] = [list(dict.fromkeys(tag for tag in tags if tag)) for tags in frame['직무 분야'].str.split(', ')]
+    result['rec_idx'] = frame['채용 링크'].str.extract(r'[?&]rec_idx=(\d+)')[0].astype('Int64')
+
+    result = result.astype({'register_date': 'object', 'deadline': 'object'})
+    return result.where(result.notna(), None)
+
+
+def to_table(frame):
+    """normalize_frame 결과를 pyarrow Table 로 변환한다."""
+    return pa.Table.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+
+
+def parquet_sink(chunks, file_path, compression=PARQUET_COMPRESSION):
+    """
+    chunk(CSV 행 형식 dict 목록)를 정규화하여 Parquet 에 row group 으로 쓰면서 그대로 다시 반환하는 generator.
+    (Crawling.csv_sink 와 같은 방식으로 크롤러 출력에 연결한다)
+    """
+    with pq.ParquetWriter(file_path, SCHEMA, compression=compression) as writer:
+        for rows in chunks:
+            if rows:
+                writer.write_table(to_table(normalize_frame(pd.DataFrame(rows))))
+            yield rows
+
+
+def convert_csv(csv_path, parquet_path, chunk_size=BULK_CHUNK_SIZE):
+    """크롤러 CSV 를 Parquet 으로 변환한다. chunk_size 행마다 row group 하나."""
+    rows = 0
+    for chunk in parquet_sink(read_chunks(csv_path, chunk_size), parquet_path):
+        rows += len(chunk)
+    print(f"변환 완료: {rows}행 -> {parquet_path}")
+    return rows
+
+
+def read_table(file_path, columns=None):
+    """
+    Parquet 을 pyarrow Table 로 읽는다. (분석용, table.column('region') 등은 복사 없이 사용)
+
+    Args:
+        columns (list): 읽을 컬럼 (기본: 전체). 지정한 컬럼만 디스크에서 읽는다.
+    """
+    return pq.read_table(file_path, columns=columns, memory_map=True)
+
+
+def records_from_batch(batch):
+    """
+    pyarrow RecordBatch 를 BulkLoader 레코드 목록으로 변환한다. (bulk_loader.normalize_row 결과와 같은 형식)
+    """
+    columns = {name: batch.column(name).to_pylist() for name in batch.schema.names}
+    records = []
+    for i in range(batch.num_rows):
+        if columns['deadline_always'][i]:
+            deadline = DEADLINE_SENTINELS['상시채용']
+        elif columns['deadline_until_hired'][i]:
+            deadline = DEADLINE_SENTINELS['채용시']
+        else:
+            deadline = columns['deadline'][i]
+        record = {
+            'title': columns['title'][i],
+            'link': columns['link'][i],
+            'company_name': columns['company_name'][i],
+            'company_link': columns['company_link'][i],
+            'region': columns['region'][i],
+            'district': columns['district'][i],
+            'career': columns['career'][i],
+            'education': columns['education'][i],
+            'employment': columns['employment'][i],
+            'salary': columns['salary'][i],
+            'register_date': columns['register_date'][i],
+            'deadline': deadline,
+            'tags': columns['tags'][i],
+            'rec_idx': columns['rec_idx'][i],
+        }
+        record['content_hash'] = content_hash(record)
+        records.append(record)
+    return records
+
+
+def iter_parquet_records(file_path, chunk_size=BULK_CHUNK_SIZE):
+    """Parquet 을 chunk_size 행씩 BulkLoader 레코드 목록으로 반환하는 generator."""
+    for batch in pq.ParquetFile(file_path, memory_map=True).iter_batches(batch_size=chunk_size):
+        yield records_from_batch(batch)
+
+
+def load_parquet(file_path, chunk_size=BULK_CHUNK_SIZE):
+    connection = app.utils.DB_Utils.get_db_connection()
+    try:
+        stats = BulkLoader(connection, chunk_size).load_stream(iter_parquet_records(file_path, chunk_size),
+                                                               normalized=True)
+    finally:
+        connection.close()
+    print(f"적재 완료: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='크롤링 결과 Parquet 변환/적재')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help='크롤러 CSV 를 Parquet 으로 변환')
+    convert.add_argument('csv_path')
+    convert.add_argument('parquet_path')
+    load = commands.add_parser('load', help='Parquet 을 DB 에 적재')
+    load.add_argument('parquet_path')
+    parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        convert_csv(args.csv_path, args.parquet_path, args.chunk_size)
+    else:
+        load_parquet(args.parquet_path, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
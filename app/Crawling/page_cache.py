@@ -0,0 +1,119 @@
+"""
+크롤링 원본 HTML 디스크 캐시.
+
+받은 HTML 은 내용의 sha256 으로 gzip 압축해 저장하고(같은 내용은 한 번만 저장), 크롤링마다
+어떤 URL 을 언제 받아 어떤 내용이었는지 manifest(JSON lines)에 남긴다.
+
+    {CRAWL_CACHE_DIR}/objects/ab/abcdef....html.gz
+    {CRAWL_CACHE_DIR}/crawls/20241201T120000.jsonl   # {"page", "url", "fetched_at", "sha256"} 한 줄씩
+
+파싱 로직을 바꾼 뒤에는 사이트에 다시 요청하지 않고 저장된 크롤링을 다시 파싱할 수 있다.
+(Crawling.iter_cached_pages, python -m app.Crawling.Crawling --replay latest)
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CRAWL_CACHE_DIR = os.getenv('CRAWL_CACHE_DIR', './data/crawl_cache')  # 원본 HTML 캐시 경로
+
+
+class PageCache:
+    """
+    content-addressed HTML 저장소와 크롤링 manifest.
+
+    Args:
+        root (str): 캐시 디렉터리
+    """
+
+    def __init__(self, root=CRAWL_CACHE_DIR):
+        self.root = root
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.html.gz")
+
+    def _manifest_path(self, crawl_id):
+        return os.path.join(self.root, 'crawls', f"{crawl_id}.jsonl")
+
+    def store(self, text):
+        """
+        HTML 을 저장하고 sha256 을 반환한다. 이미 있는 내용이면 다시 쓰지 않는다.
+
+        Returns:
+            str: 내용의 sha256 (hex)
+        """
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 프로세스가 덜 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꾼다
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def load(self, digest):
+        with gzip.open(self._object_path(digest), 'rb') as file:
+            return file.read().decode('utf-8')
+
+    def start_crawl(self):
+        """새 크롤링의 manifest 를 만든다."""
+        return CrawlRecorder(self)
+
+    def crawls(self):
+        """저장된 크롤링 id 목록 (오래된 순)."""
+        directory = os.path.join(self.root, 'crawls')
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-len('.jsonl')] for name in os.listdir(directory) if name.endswith('.jsonl'))
+
+    def manifest(self, crawl_id='latest'):
+        """
+        크롤링 manifest 를 페이지 순서로 읽는다.
+
+        Args:
+            crawl_id (str): 크롤링 id, 'latest' 면 가장 최근 크롤링
+
+        Returns:
+            list: {"page", "url", "fetched_at", "sha256"} 목록
+        """
+        if crawl_id == 'latest':
+            crawls = self.crawls()
+            if not crawls:
+                raise FileNotFoundError(f"저장된 크롤링이 없습니다: {self.root}")
+            crawl_id = crawls[-1]
+        with open(self._manifest_path(crawl_id), encoding='utf-8') as file:
+            entries = [json.loads(line) for line in file if line.strip()]
+        return sorted(entries, key=lambda entry: entry['page'])
+
+
+class CrawlRecorder:
+    """크롤링 한 번에서 받은 페이지를 캐시에 저장하고 manifest 에 기록한다."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.crawl_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        path = cache._manifest_path(self.crawl_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, page, url, text, fetched_at=None):
+        fetched_at = fetched_at or datetime.now()
+        entry = {
+            'page': page,
+            'url': url,
+            'fetched_at': fetched_at.isoformat(timespec='seconds'),
+            'sha256': self.cache.store(text),
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,204 @@
+"""
+사람인 검색 결과 페이지 파서.
+
+HTML 에서 항목별 원문(제목, 링크, 채용 조건 등)을 꺼내는 부분만 backend 마다 구현하고,
+등록일/마감일 변환 등 레코드 생성은 공통 함수(build_record)로 처리하여 backend 와 관계없이 같은 레코드를 만든다.
+
+- bs4: BeautifulSoup(html.parser) + CSS select (기존 방식, 순수 Python)
+- lxml: lxml.html + XPath (C 로 구현되어 훨씬 빠르다)
+
+backend 별 속도와 결과 일치 여부는 bench_parsers 로 확인한다.
+"""
+import os
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv
+import lxml.etree
+import lxml.html
+
+load_dotenv()
+
+CRAWL_PARSER = os.getenv('CRAWL_PARSER', 'lxml')  # 사용할 파서 backend (lxml, bs4)
+
+SARAMIN_URL = 'https://www.saramin.co.kr'
+
+
+def build_record(raw, now=None):
+    """
+    항목 원문을 CSV 행 형식의 dict 로 변환한다.
+    now 는 '내일마감', '~ MM/DD' 같은 상대 날짜의 기준 시각이다. (캐시 재파싱 시 받은 시각)
+
+    Args:
+        raw (dict): title, href, company, company_href (없으면 None), conditions, sectors (문자열 목록),
+                    job_day, date (없으면 None)
+
+    Raises:
+        AttributeError: 필수 요소(등록일, 마감일)가 없는 경우
+    """
+    if raw['job_day'] is None or raw['date'] is None:
+        raise AttributeError("등록일 또는 마감일 요소가 없습니다.")
+
+    title = raw['title'] if raw['title'] is not None else '정보 없음'
+    job_link = SARAMIN_URL + raw['href'] if raw['title'] is not None else '정보 없음'
+
+    # 회사명 및 링크
+    company = raw['company'] if raw['company'] is not None else '정보 없음'
+    company_link = SARAMIN_URL + raw['company_href'] if raw['company'] is not None else '정보 없음'
+
+    # 채용 조건
+    conditions = raw['conditions']
+    location = conditions[0] if len(conditions) > 0 else '정보 없음'
+    career = conditions[1] if len(conditions) > 1 else '정보 없음'
+    education = conditions[2] if len(conditions) > 2 else '정보 없음'
+    employment_type = conditions[3] if len(conditions) > 3 else '정보 없음'
+    salary = conditions[4] if len(conditions) > 4 else '정보 없음'
+
+    # 직무 분야
+    job_sector = ', '.join(raw['sectors']) if raw['sectors'] else '정보 없음'
+
+    # 등록일
+    register_date = raw['job_day']
+    if '등록일' in register_date or '수정일' in register_date:
+        register_date = register_date.replace('등록일 ', '').replace('수정일 ', '')
+        register_date = f"20{register_date}"
+
+    else:
+        register_date = '정보 없음'
+
+    # 마감일
+    now = now or datetime.now()
+    deadline = raw['date']
+    if '내일마감' in deadline:
+        deadline = (now + timedelta(days=1)).strftime('%Y/%m/%d')
+    elif '오늘마감' in deadline:
+        deadline = now.strftime('%Y/%m/%d')
+    elif '상시채용' in deadline:
+        deadline = '상시채용'
+    elif '채용시' in deadline:
+        deadline = '채용시'
+    else:
+        # "~ MM/DD(요일)" 형태를 "YYYY/MM/DD"로 변환
+        try:
+            deadline = deadline.replace('~ ', '').split('(')[0].strip()
+            deadline = datetime.strptime(deadline, '%m/%d').replace(
+                year=now.year).strftime('%Y/%m/%d')
+        except ValueError:
+            deadline = '정보 없음'
+
+    return {
+        '채용 제목': title,
+        '채용 링크': job_link,
+        '회사명': company,
+        '회사 링크': company_link,
+        '지역': location,
+        '경력': career,
+        '학력': education,
+        '고용형태': employment_type,
+        '연봉': salary,
+        '직무 분야': job_sector,
+        '등록일': register_date,
+        '마감일': deadline,
+    }
+
+
+class ListingParser:
+    """검색 결과 페이지 파서. 하위 클래스는 _items(html) 과 _extract(item) 을 구현한다."""
+
+    name = None
+
+    def parse_page(self, html, now=None):
+        """검색 결과 페이지 HTML 의 채용공고 목록을 CSV 행 형식의 dict 목록으로 변환한다."""
+        jobs = []
+        for item in self._items(html):
+            try:
+                jobs.append(build_record(self._extract(item), now))
+            except AttributeError as e:
+                print(f"항목 파싱 중 에러 발생: {e}")
+        return jobs
+
+    def _items(self, html):
+        raise NotImplementedError
+
+    def _extract(self, item):
+        raise NotImplementedError
+
+
+class Bs4Parser(ListingParser):
+    name = 'bs4'
+
+    def _items(self, html):
+        return BeautifulSoup(html, 'html.parser').select('div.item_recruit')
+
+    def _extract(self, job):
+        title_tag = job.select_one('h2.job_tit a')
+        company_tag = job.select_one('strong.corp_name a')
+        job_day = job.select_one('span.job_day')
+        date = job.select_one('span.date')
+        return {
+            'title': title_tag.text.strip() if title_tag else None,
+            'href': title_tag['href'] if title_tag else None,
+            'company': company_tag.text.strip() if company_tag else None,
+            'company_href': company_tag['href'] if company_tag else None,
+            'conditions': [span.text.strip() for span in job.select('div.job_condition span')],
+            'sectors': [sector.text.strip() for sector in job.select('div.job_sector a')],
+            'job_day': job_day.text.strip() if job_day else None,
+            'date': date.text.strip() if date else None,
+        }
+
+
+def _has_class(name):
+    """CSS 의 .name 과 같은 XPath 조건"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlParser(ListingParser):
+    name = 'lxml'
+
+    # bs4 backend 의 CSS selector 와 같은 요소를 고르는 XPath (미리 컴파일)
+    _ITEMS = lxml.etree.XPath(f"//div[{_has_class('item_recruit')}]")
+    _TITLE = lxml.etree.XPath(f".//h2[{_has_class('job_tit')}]//a")
+    _COMPANY = lxml.etree.XPath(f".//strong[{_has_class('corp_name')}]//a")
+    _CONDITIONS = lxml.etree.XPath(f".//div[{_has_class('job_condition')}]//span")
+    _SECTORS = lxml.etree.XPath(f".//div[{_has_class('job_sector')}]//a")
+    _JOB_DAY = lxml.etree.XPath(f".//span[{_has_class('job_day')}]")
+    _DATE = lxml.etree.XPath(f".//span[{_has_class('date')}]")
+
+    def _items(self, html):
+        if not html.strip():
+            return []
+        return self._ITEMS(lxml.html.fromstring(html))
+
+    @staticmethod
+    def _first_text(elements):
+        return elements[0].text_content().strip() if elements else None
+
+    def _extract(self, job):
+        title_tags = self._TITLE(job)
+        company_tags = self._COMPANY(job)
+        return {
+            'title': self._first_text(title_tags),
+            'href': title_tags[0].attrib['href'] if title_tags else None,
+            'company': self._first_text(company_tags),
+            'company_href': company_tags[0].attrib['href'] if company_tags else None,
+            'conditions': [span.text_content().strip() for span in self._CONDITIONS(job)],
+            'sectors': [sector.text_content().strip() for sector in self._SECTORS(job)],
+            'job_day': self._first_text(self._JOB_DAY(job)),
+            'date': self._first_text(self._DATE(job)),
+        }
+
+
+PARSERS = {parser.name: parser for parser in (Bs4Parser(), LxmlParser())}
+
+
+def get_parser(name=None):
+    """
+    이름으로 파서 backend 를 반환한다.
+
+    Args:
+        name (str): backend 이름 (기본: CRAWL_PARSER)
+    """
+    name = name or CRAWL_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"알 수 없는 파서입니다: {name} (사용 가능: {', '.join(PARSERS)})")
+    return PARSERS[name]
@@ -0,0 +1,317 @@
+"""
+병렬 CSV 적재 파이프라인.
+
+적재를 단계별 스레드로 나누고 크기가 정해진 큐로 연결한다.
+
+    parse(1) -> normalize(N) -> resolve(1) -> write(M)
+
+- parse: CSV 를 chunk 단위로 읽는다.
+- normalize: 지역 분리, 마감일 변환, rec_idx/내용 해시 계산 (normalize_row)
+- resolve: 지역/회사/태그 id 를 채운다. 새 회사/태그 추가가 겹치지 않도록 한 스레드가 맡는다.
+- write: 각자 커넥션을 가진 writer 들이 chunk 를 upsert 한다 (BulkLoader.write)
+
+큐가 가득 차면 앞 단계가 기다리므로(backpressure) 메모리 사용량은 큐 크기로 제한된다.
+단계별로 처리 시간(busy), 입력을 기다린 시간(starved), 출력 큐가 차서 기다린 시간(blocked)을
+기록하여 어느 단계가 전체 속도를 제한하는지 보여준다.
+
+사용 예:
+    python -m app.Crawling.pipeline data/saramin.csv --writers 4 --normalizers 2
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+
+from dotenv import load_dotenv
+
+import app.utils.DB_Utils
+from app.Crawling.bulk_loader import BULK_CHUNK_SIZE, BulkLoader, LoadStats, normalize_row, read_chunks
+
+load_dotenv()
+
+PIPELINE_WRITERS = int(os.getenv('PIPELINE_WRITERS', 4))          # DB writer 스레드(커넥션) 수
+PIPELINE_NORMALIZERS = int(os.getenv('PIPELINE_NORMALIZERS', 2))  # normalize 스레드 수
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 8))    # 단계 사이 큐에 쌓을 수 있는 chunk 수
+
+_DONE = object()  # 단계 종료 신호
+_POLL_INTERVAL = 0.1  # 큐를 기다리는 중 중단 여부를 확인하는 주기(초)
+
+
+class _Stopped(Exception):
+    """다른 단계가 실패하여 파이프라인이 중단된 경우"""
+
+
+class StageMetrics:
+    """단계 하나의 처리량과 대기 시간. 같은 단계의 스레드들이 함께 기록한다."""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.chunks = 0
+        self.rows = 0
+        self.busy = 0.0      # 처리에 쓴 시간 (스레드 합계)
+        self.starved = 0.0   # 입력 큐가 비어 기다린 시간
+        self.blocked = 0.0   # 출력 큐가 가득 차 기다린 시간
+        self._lock = threading.Lock()
+
+    def add(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    @property
+    def capacity(self):
+        """이 단계가 쉬지 않고 처리할 때의 rows/sec (스레드 수 반영)"""
+        return self.rows / self.busy * self.workers if self.busy else 0.0
+
+    def __str__(self):
+        return (f"{self.name:<10} x{self.workers}  {self.rows:>9}행  busy {self.busy:7.2f}s  "
+                f"starved {self.starved:7.2f}s  blocked {self.blocked:7.2f}s  "
+                f"capacity {self.capacity:>10,.0f} rows/sec")
+
+
+class IngestPipeline:
+    """
+    단계별 스레드로 CSV 를 적재하는 파이프라인.
+
+    Args:
+        writers (int): DB writer 수. 각 writer 가 커넥션 하나를 사용하므로 DB_POOL_MAX_SIZE - 1 이하로 둔다.
+        normalizers (int): normalize 스레드 수
+        chunk_size (int): chunk 당 행 수 (writer 한 트랜잭션)
+        queue_size (int): 단계 사이 큐의 최대 chunk 수
+    """
+
+    def __init__(self, writers=PIPELINE_WRITERS, normalizers=PIPELINE_NORMALIZERS,
+                 chunk_size=BULK_CHUNK_SIZE, queue_size=PIPELINE_QUEUE_SIZE):
+        self.writers = writers
+        self.normalizers = normalizers
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.stats = None
+        self.metrics = {}
+        self._stats_lock = threading.Lock()
+        self._errors = []
+        self._stop = threading.Event()  # 한 단계라도 실패하면 설정, 모든 단계가 큐 대기를 멈추고 종료한다
+
+    def _get(self, source, metrics):
+        started = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                item = source.get(timeout=_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        metrics.add(starved=time.perf_counter() - started)
+        return item
+
+    def _put(self, target, item, metrics=None):
+        started = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        if metrics is not None:
+            metrics.add(blocked=time.perf_counter() - started)
+
+    def _finish(self, output, count):
+        """다음 단계 스레드 수만큼 종료 신호를 보낸다. (중단된 경우에는 보내지 않는다)"""
+        try:
+            for _ in range(count):
+                self._put(output, _DONE)
+        except _Stopped:
+            pass
+
+    def _count(self, **values):
+        with self._stats_lock:
+            for key, value in values.items():
+                setattr(self.stats, key, getattr(self.stats, key) + value)
+
+    def _parse(self, file_path, output):
+        metrics = self.metrics['parse']
+        try:
+            chunks = read_chunks(file_path, self.chunk_size)
+            while True:
+                started = time.perf_counter()
+                rows = next(chunks, None)
+                metrics.add(busy=time.perf_counter() - started)
+                if rows is None:
+                    break
+                metrics.add(chunks=1, rows=len(rows))
+                self._count(rows=len(rows))
+                self._put(output, rows, metrics)
+        finally:
+            self._finish(output, self.normalizers)
+
+    def _normalize(self, source, output):
+        metrics = self.metrics['normalize']
+        try:
+            while True:
+                rows = self._get(source, metrics)
+                if rows is _DONE:
+                    break
+                started = time.perf_counter()
+                records = []
+                for row in rows:
+                    try:
+                        records.append(normalize_row(row))
+                    except (KeyError, AttributeError) as e:
+                        print(f"에러 발생: 잘못된 행 {e}")
+                        self._count(skipped=1)
+                metrics.add(busy=time.perf_counter() - started, chunks=1, rows=len(rows))
+                self._put(output, records, metrics)
+        finally:
+            self._finish(output, 1)
+
+    def _resolve(self, resolver, source, output):
+        metrics = self.metrics['resolve']
+        connection = resolver.connection
+        remaining = self.normalizers
+        try:
+            while remaining:
+                records = self._get(source, metrics)
+                if records is _DONE:
+                    remaining -= 1
+                    continue
+                started = time.perf_counter()
+                cursor = connection.cursor()
+                try:
+                    # 새 회사/태그는 writer 가 참조하기 전에 commit 해 둔다
+                    resolved, unresolved = resolver.resolve(cursor, records)
+                    connection.commit()
+                except Exception as e:
+                    connection.rollback()
+                    resolver.load_reference()
+                    print(f"회사/태그 처리 실패, chunk 건너뜀: {e}")
+                    self._count(skipped=len(records))
+                    continue
+                finally:
+                    cursor.close()
+                    metrics.add(busy=time.perf_counter() - started, chunks=1, rows=len(records))
+                self._count(skipped=unresolved)
+                resolver.seen.update(record['rec_idx'] for record in resolved if record['rec_idx'] is not None)
+                self._put(output, resolved, metrics)
+        finally:
+            self._finish(output, self.writers)
+
+    def _write(self, source):
+        metrics = self.metrics['write']
+        connection = app.utils.DB_Utils.get_db_connection()
+        writer = BulkLoader(connection, self.chunk_size)
+        try:
+            while True:
+                records = self._get(source, metrics)
+                if records is _DONE:
+                    break
+                started = time.perf_counter()
+                self._write_chunk(writer, records)
+                metrics.add(busy=time.perf_counter() - started, chunks=1, rows=len(records))
+        finally:
+            connection.close()
+
+    def _write_chunk(self, writer, records):
+        """chunk 를 한 트랜잭션으로 기록한다. 실패하면(다른 writer 와 rec_idx 충돌 등) 행 단위로 다시 시도한다."""
+        cursor = writer.connection.cursor()
+        try:
+            inserted, updated, unchanged = writer.write(cursor, records)
+            writer.connection.commit()
+        except Exception as e:
+            writer.connection.rollback()
+            if len(records) == 1:
+                print(f"에러 발생: {e}")
+                self._count(skipped=1)
+                return
+            print(f"chunk 적재 실패, 행 단위로 다시 시도: {e}")
+            for record in records:
+                self._write_chunk(writer, [record])
+            return
+        finally:
+            cursor.close()
+        self._count(inserted=inserted, updated=updated, unchanged=unchanged)
+
+    def _run_thread(self, target, *args):
+        try:
+            target(*args)
+        except _Stopped:
+            pass
+        except Exception as e:
+            self._errors.append(e)
+            print(f"파이프라인 단계 실패 ({target.__name__}): {e}")
+            # 남은 단계가 가득 찬 큐/빈 큐를 계속 기다리지 않도록 전체를 중단한다
+            self._stop.set()
+
+    def run(self, file_path):
+        """
+        CSV 파일 전체를 적재한다.
+
+        Returns:
+            LoadStats: 적재 통계 (self.metrics 에 단계별 지표)
+        """
+        self.stats = LoadStats()
+        self._errors = []
+        self._stop = threading.Event()
+        self.metrics = {
+            'parse': StageMetrics('parse', 1),
+            'normalize': StageMetrics('normalize', self.normalizers),
+            'resolve': StageMetrics('resolve', 1),
+            'write': StageMetrics('write', self.writers),
+        }
+        parsed = queue.Queue(self.queue_size)
+        normalized = queue.Queue(self.queue_size)
+        resolved = queue.Queue(self.queue_size)
+
+        connection = app.utils.DB_Utils.get_db_connection()
+        try:
+            resolver = BulkLoader(connection, self.chunk_size)
+            resolver.load_reference()
+
+            threads = [threading.Thread(target=self._run_thread, args=(self._parse, file_path, parsed))]
+            threads += [threading.Thread(target=self._run_thread, args=(self._normalize, parsed, normalized))
+                        for _ in range(self.normalizers)]
+            threads += [threading.Thread(target=self._run_thread, args=(self._resolve, resolver, normalized, resolved))]
+            threads += [threading.Thread(target=self._run_thread, args=(self._write, resolved))
+                        for _ in range(self.writers)]
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            if self._errors:
+                raise self._errors[0]
+            resolver.finish(self.stats)
+        finally:
+            connection.close()
+
+        self.report()
+        return self.stats
+
+    def report(self):
+        print(f"적재 완료: {self.stats}")
+        for metrics in self.metrics.values():
+            print(metrics)
+        bottleneck = min((m for m in self.metrics.values() if m.rows), key=lambda m: m.capacity, default=None)
+        if bottleneck:
+            print(f"병목 단계: {bottleneck.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='사람인 CSV 병렬 적재')
+    parser.add_argument('file_path', nargs='?', default='./data/saramin.csv')
+    parser.add_argument('--writers', type=int, default=PIPELINE_WRITERS)
+    parser.add_argument('--normalizers', type=int, default=PIPELINE_NORMALIZERS)
+    parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE)
+    parser.add_argument('--queue-size', type=int, default=PIPELINE_QUEUE_SIZE)
+    args = parser.parse_args()
+
+    IngestPipeline(args.writers, args.normalizers, args.chunk_size, args.queue_size).run(args.file_path)
+
+
+if __name__ == '__main__':
+    main()
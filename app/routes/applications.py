@@ -1,8 +1,8 @@
 import pymysql
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import get_jwt_identity
 from app.utils.DB_Utils import get_db_connection
-from app.utils.jwt_token import jwt_required
+from app.utils.jwt_token import get_jwt_identity, jwt_required
+from app.utils.pagination import InvalidCursor, decode_cursor, next_cursor, after_key
 
 bp = Blueprint('applications', __name__, url_prefix='/applications')
 
@@ -74,6 +74,7 @@ def get_applications():
     order = request.args.get('order', default='asc', type=str)  # 정렬 순서
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=20, type=int)
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
 
     # user_id가 없으면 에러 반환
     if not user_id:
@@ -83,6 +84,11 @@ def get_applications():
     if order not in ['asc', 'desc']:
         return jsonify({"status": "error", "message": "Invalid order. Use 'asc' or 'desc'."}), 400
 
+    try:
+        last_key = decode_cursor(page_cursor, 2) if page_cursor else None
+    except InvalidCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -100,12 +106,20 @@ def get_applications():
             query += " AND a.status = %s"
             params.append(status)
 
-        # 정렬 기준: created_at
-        query += f" ORDER BY a.applied_at {order.upper()}"
+        offset = (page - 1) * per_page
+
+        # cursor 가 있으면 (applied_at, id) 가 마지막 지원 이후인 항목부터 조회
+        if last_key is not None:
+            condition, cursor_params = after_key('a.applied_at', 'a.id', *last_key, descending=order == 'desc')
+            query += f" AND {condition}"
+            params.extend(cursor_params)
+            offset = 0
+
+        # 정렬 기준: applied_at (같은 시각은 id 순)
+        query += f" ORDER BY a.applied_at {order.upper()}, a.id {order.upper()}"
 
         # 페이지네이션 추가
         query += " LIMIT %s OFFSET %s"
-        offset = (page - 1) * per_page
         params.extend([per_page, offset])
 
         # 쿼리 실행
@@ -119,7 +133,8 @@ def get_applications():
             "pagination": {
                 "current_page": page,
                 "per_page": per_page,
-                "total_items": len(applications)
+                "total_items": len(applications),
+                "next_cursor": next_cursor(applications, per_page, 'applied_at', 'id'),
             }
         }), 200
 
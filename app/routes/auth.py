@@ -1,12 +1,14 @@
 import pymysql
-import base64
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import (
-    create_access_token,
-    get_jwt_identity, get_jwt
+from flask_jwt_extended import create_access_token
+from app.utils.DB_Utils import get_db_connection, release_request_connection
+from app.utils.login_history import login_history
+from app.utils.passwords import PasswordHasherBusy, password_hasher
+from app.utils.jwt_token import (
+    create_refresh_token, decode_refresh_token, invalidate_user_tokens, REFRESH_SECRET_KEY, jwt_required,
+    rotated_refresh_tokens, token_digest, ACCESS_TOKEN_LIFETIME, get_jwt, get_jwt_identity
 )
-from app.utils.DB_Utils import get_db_connection
-from app.utils.jwt_token import create_refresh_token, decode_refresh_token, REFRESH_SECRET_KEY, jwt_required
+from app.utils.revocation import revocation_index, revoke_token, revoke_user_tokens
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 # 회원가입
@@ -20,8 +22,11 @@ def register():
     if not email or not password or not name:
         return jsonify({"status": "error", "message": "Missing required fields."}), 400
 
-    # 비밀번호 인코딩
-    encoded_password = base64.b64encode(password.encode()).decode()
+    # 비밀번호 해시
+    try:
+        encoded_password = password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
 
     # DB 저장
     connection = get_db_connection()
@@ -39,7 +44,8 @@ def register():
         # refresh_token 저장
         user_id = new_user[0]
         refresh_token = create_refresh_token(user_id)
-        cursor.execute("INSERT INTO RefreshTokens (user_id, token) VALUES (%s, %s)", (user_id, refresh_token))
+        cursor.execute("INSERT INTO RefreshTokens (user_id, token_hash) VALUES (%s, %s)",
+                       (user_id, token_digest(refresh_token)))
         connection.commit()
 
         return jsonify({"status": "success",
@@ -63,44 +69,66 @@ def login():
     if not email or not password:
         return jsonify({"status": "error", "message": "Missing required fields."}), 400
 
-    decoded_password = base64.b64encode(password.encode()).decode()
-
-    # 사용자 인증
+    # 사용자 조회
     connection = get_db_connection()
     cursor = connection.cursor()
     try:
-        cursor.execute(
-            "SELECT id FROM Users WHERE email = %s AND password = %s",
-            (email, decoded_password)
-        )
+        cursor.execute("SELECT id, password FROM Users WHERE email = %s", (email,))
         user = cursor.fetchone()
-        if user:
-            user_id = user[0]
-            # LoginHistory에 기록 추가
-            cursor.execute(
-                "INSERT INTO LoginHistory (user_id) VALUES (%s)",
-                 (user_id,)
-            )
-            connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+    # 해시 계산(최대 PASSWORD_HASH_TIMEOUT) 동안 풀 커넥션을 잡고 있지 않도록 먼저 반환
+    release_request_connection()
+
+    # 사용자 인증
+    try:
+        valid, needs_rehash = password_hasher.verify(password, user[1] if user else None)
+    except PasswordHasherBusy as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+    if not valid:
+        return jsonify({"status": "error", "message": "Invalid credentials."}), 401
+
+    user_id = user[0]
+    # 최근 로그인 시각 기록. 예전 형식(base64)이거나 해시 비용 설정이 바뀐 경우 비밀번호도 새 설정으로 다시 저장
+    update_fields = ["last_login = NOW()", "updated_at = updated_at"]
+    params = []
+    if needs_rehash:
+        try:
+            params.append(password_hasher.hash(password))
+            update_fields.append("password = %s")
+        except PasswordHasherBusy:
+            pass  # 다음 로그인 때 다시 저장
+    params.append(user_id)
 
-            new_access_token = create_access_token(identity=str(user_id))
-            new_refresh_token = create_refresh_token(user_id)
+    new_access_token = create_access_token(identity=str(user_id))
+    new_refresh_token = create_refresh_token(user_id)
 
-            # Refresh Token을 데이터베이스에 저장 (기존 토큰 무효화)
-            cursor.execute("REPLACE INTO RefreshTokens (user_id, token) VALUES (%s, %s)", (user_id, new_refresh_token))
-            connection.commit()
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"UPDATE Users SET {', '.join(update_fields)} WHERE id = %s", tuple(params))
 
-            return jsonify({"status": "success",
-                            "message": "Login successful.",
-                            "new_refresh_token": new_refresh_token,
-                            "new_access_token": new_access_token}), 200
-        else:
-            return jsonify({"status": "error", "message": "Invalid credentials."}), 401
+        # Refresh Token 해시를 데이터베이스에 저장 (기존 토큰 무효화)
+        cursor.execute("""
+            INSERT INTO RefreshTokens (user_id, token_hash) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE token_hash = VALUES(token_hash), created_at = NOW()
+        """, (user_id, token_digest(new_refresh_token)))
+        connection.commit()
     finally:
         cursor.close()
         connection.close()
+    invalidate_user_tokens(user_id)  # 이전 refresh token 기준의 만료 토큰 응답 캐시 제거
+
+    # LoginHistory 는 모아서 저장
+    login_history.append(user_id)
+
+    return jsonify({"status": "success",
+                    "message": "Login successful.",
+                    "new_refresh_token": new_refresh_token,
+                    "new_access_token": new_access_token}), 200
 
-# 토큰 refresh
+# 토큰 refresh (refresh token 회전)
 @bp.route('/refresh', methods=['POST'])
 def refresh_token():
     data = request.json
@@ -109,29 +137,88 @@ def refresh_token():
     if not refresh_token:
         return jsonify({"status": "error", "message": "Refresh token is required"}), 400
 
+    # 이미 회전된 토큰은 서명 검증과 DB 조회 없이 거부
+    token_hash = token_digest(refresh_token)
+    if rotated_refresh_tokens.get(token_hash) is not None:
+        return jsonify({"status": "error", "message": "Invalid refresh token"}), 401
+
     try:
         # Refresh Token 검증
         decoded = decode_refresh_token(refresh_token, REFRESH_SECRET_KEY)
         user_id = decoded.get("user_id")
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 401
 
-        # 데이터베이스에 Refresh Token이 존재하는지 확인
-        connection = get_db_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT id FROM RefreshTokens WHERE token = %s AND user_id = %s", (refresh_token, user_id))
-        if not cursor.fetchone():
+    # 저장된 해시와 일치할 때만 새 토큰으로 교체 (unique 인덱스 조회 + 교체를 한 문장으로)
+    new_refresh_token = create_refresh_token(user_id)
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "UPDATE RefreshTokens SET token_hash = %s, created_at = NOW() WHERE token_hash = %s AND user_id = %s",
+            (token_digest(new_refresh_token), token_hash, user_id)
+        )
+        if cursor.rowcount != 1:
+            connection.rollback()
             return jsonify({"status": "error", "message": "Invalid refresh token"}), 401
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+    rotated_refresh_tokens.set(token_hash, user_id)
 
-        # 새로운 Access Token 발급
-        new_access_token = create_access_token(identity=str(user_id))
-        return jsonify({"status": "success", "access_token": new_access_token}), 200
+    # 새로운 Access Token 발급
+    new_access_token = create_access_token(identity=str(user_id))
+    return jsonify({"status": "success",
+                    "message": "Tokens have been refreshed.",
+                    "access_token": new_access_token,
+                    "refresh_token": new_refresh_token}), 200
 
-    except ValueError as e:
-        return jsonify({"status": "error", "message": str(e)}), 401
 
+# 로그아웃 (현재 access token 폐기 + refresh token 삭제)
+@bp.route('/logout', methods=['POST'])
+@jwt_required  # JWT 인증 필요
+def logout():
+    user_id = get_jwt_identity()
+    claims = get_jwt()
+
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        revoked_id = revoke_token(cursor, user_id, claims['jti'], claims['exp'])
+        cursor.execute("DELETE FROM RefreshTokens WHERE user_id = %s", (user_id,))
+        connection.commit()
     finally:
         cursor.close()
         connection.close()
 
+    # 이 워커에 바로 반영 (다른 워커는 변경 피드로 반영)
+    revocation_index.refresh([revoked_id] if revoked_id else [])
+    invalidate_user_tokens(user_id)
+    return jsonify({"status": "success", "message": "Logged out successfully."}), 200
+
+
+# 모든 기기에서 로그아웃 (지금까지 발급된 access token 전체 폐기 + refresh token 삭제)
+@bp.route('/logout-all', methods=['POST'])
+@jwt_required  # JWT 인증 필요
+def logout_all():
+    user_id = get_jwt_identity()
+    claims = get_jwt()
+
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        revoked_ids = [revoke_user_tokens(cursor, user_id, ACCESS_TOKEN_LIFETIME),
+                       revoke_token(cursor, user_id, claims['jti'], claims['exp'])]
+        cursor.execute("DELETE FROM RefreshTokens WHERE user_id = %s", (user_id,))
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+
+    revocation_index.refresh([revoked_id for revoked_id in revoked_ids if revoked_id])
+    invalidate_user_tokens(user_id)
+    return jsonify({"status": "success", "message": "All sessions have been logged out."}), 200
 
 
 @bp.route('/profile', methods=['PUT'])
@@ -148,24 +235,29 @@ def update_profile():
     if not new_password and not new_name:
         return jsonify({"status": "error", "message": "Invalid refresh token"}), 400
 
+    # 수정 쿼리 작성
+    update_fields = []
+    params = []
+
+    if new_password:
+        # 해시 계산 동안 풀 커넥션을 잡고 있지 않도록 (토큰 확인에 쓴 커넥션이 있으면) 먼저 반환
+        release_request_connection()
+        try:
+            encoded_password = password_hasher.hash(new_password)
+        except PasswordHasherBusy as e:
+            return jsonify({"status": "error", "message": str(e)}), 503
+        update_fields.append("password = %s")
+        params.append(encoded_password)
+
+    if new_name:
+        update_fields.append("name = %s")
+        params.append(new_name)
+
     # 데이터베이스 연결
     connection = get_db_connection()
     cursor = connection.cursor()
 
     try:
-        # 수정 쿼리 작성
-        update_fields = []
-        params = []
-
-        if new_password:
-            encoded_password = base64.b64encode(new_password.encode()).decode()
-            update_fields.append("password = %s")
-            params.append(encoded_password)
-
-        if new_name:
-            update_fields.append("name = %s")
-            params.append(new_name)
-
         # 수정할 데이터가 존재할 경우에만 실행
         if update_fields:
             params.append(user_id)  # WHERE 절의 사용자 ID 추가
@@ -195,20 +287,13 @@ def get_info():
     try:
         # 사용자 정보 조회
         cursor.execute(
-            "SELECT id, email, name, created_at, updated_at FROM Users WHERE id = %s",
+            "SELECT id, email, name, created_at, updated_at, last_login FROM Users WHERE id = %s",
             (user_id,)
         )
         user = cursor.fetchone()
         if not user:
             return jsonify({"status": "error", "message": "User not found."}), 404
 
-        # 최근 로그인 기록 조회
-        cursor.execute(
-            "SELECT login_time FROM LoginHistory WHERE user_id = %s ORDER BY login_time DESC LIMIT 1",
-            (user_id,)
-        )
-        last_login = cursor.fetchone()
-
         # 응답 데이터 생성
         user_data = {
             "id": user[0],
@@ -216,7 +301,7 @@ def get_info():
             "name": user[2],
             "created_at": user[3],
             "updated_at": user[4],
-            "last_login": last_login[0] if last_login else None,  # 최근 로그인 시간
+            "last_login": user[5],  # 최근 로그인 시간
         }
         return jsonify({"status": "success", "data": user_data}), 200
 
@@ -252,6 +337,7 @@ def delete_account():
         # 사용자 데이터 삭제
         cursor.execute("DELETE FROM Users WHERE id = %s", (user_id,))
         connection.commit()
+        invalidate_user_tokens(user_id)
 
         return jsonify({"status": "success", "message": "Account has been successfully deleted."}), 200
 
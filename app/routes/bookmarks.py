@@ -1,8 +1,8 @@
 import pymysql
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import get_jwt_identity
 from app.utils.DB_Utils import get_db_connection
-from app.utils.jwt_token import jwt_required
+from app.utils.jwt_token import get_jwt_identity, jwt_required
+from app.utils.pagination import InvalidCursor, decode_cursor, next_cursor, after_key
 
 bp = Blueprint('bookmarks', __name__, url_prefix='/bookmarks')
 
@@ -59,27 +59,39 @@ def get_bookmarks():
     user_id = get_jwt_identity()  # JWT에서 사용자 ID 추출
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=20, type=int)
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
 
     if not user_id:
         return jsonify({"status": "error", "message": "User ID is required"}), 400
 
     offset = (page - 1) * per_page
+    keyset, keyset_params = '', []
+
+    # cursor 가 있으면 (favorited_at, id) 가 마지막 북마크 이후인 항목부터 조회
+    if page_cursor:
+        try:
+            condition, keyset_params = after_key('f.favorited_at', 'f.id', *decode_cursor(page_cursor, 2), descending=True)
+        except InvalidCursor as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        keyset = f"AND {condition}"
+        offset = 0
 
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     try:
         # 북마크 목록 조회 쿼리 (최신순으로 정렬)
-        query = """
-            SELECT f.id AS bookmark_id, f.user_id, j.id AS job_id, j.title, c.name AS company_name, j.salary, j.deadline
+        query = f"""
+            SELECT f.id AS bookmark_id, f.user_id, j.id AS job_id, j.title, c.name AS company_name, j.salary, j.deadline,
+                   f.favorited_at
             FROM Favorites f
             JOIN Jobs j ON f.job_id = j.id
             JOIN Companies c ON j.company_id = c.id
-            WHERE f.user_id = %s
-            ORDER BY f.favorited_at DESC
+            WHERE f.user_id = %s {keyset}
+            ORDER BY f.favorited_at DESC, f.id DESC
             LIMIT %s OFFSET %s
         """
-        params = (user_id, per_page, offset)
+        params = (user_id, *keyset_params, per_page, offset)
 
         cursor.execute(query, params)
         bookmarks = cursor.fetchall()
@@ -97,7 +109,8 @@ def get_bookmarks():
             "pagination": {
                 "current_page": page,
                 "per_page": per_page,
-                "total_items": len(bookmarks)
+                "total_items": len(bookmarks),
+                "next_cursor": next_cursor(bookmarks, per_page, 'favorited_at', 'bookmark_id'),
             }
         }), 200
 
@@ -1,18 +1,69 @@
+import json
+
 import pymysql
 from flask import Blueprint, request, jsonify
 from app.utils.DB_Utils import get_db_connection
-from ..utils.DB_Ids import locations, tags
+from ..utils.DB_Ids import reference
 from app.utils.jwt_token import jwt_required
+from app.utils.facet_index import facet_index
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, next_cursor, after_key
+from app.utils.response_cache import response_cache
+from app.utils.search_index import search_index
+from app.utils.view_counter import view_counter
+from app.utils.versions import record_change
 
 bp = Blueprint('jobs', __name__, url_prefix='/jobs')
 
+MAX_BATCH_IDS = 50  # /jobs/batch 한 번에 조회할 수 있는 최대 공고 수
+
+
+# DB 에 반영된 조회수가 캐시된 상세 응답에 보이도록 반영 후 해당 공고 캐시를 지움
+view_counter.on_flush(lambda job_ids: response_cache.invalidate(*(f'job:{job_id}' for job_id in job_ids)))
+
+
+def warm_up_indexes():
+    """서버 시작 시 검색/필터 색인을 미리 만들고 응답 캐시를 변경 피드에 연결한다."""
+    for index in (search_index, facet_index, response_cache):
+        try:
+            index.ensure_built()
+        except Exception as e:
+            print(f"{type(index).__name__} 생성 실패 (첫 요청 시 다시 시도): {e}")
+
+
+def _list_tags(**view_args):
+    return ['jobs:list']
+
+
+def _detail_tags(job_id):
+    return [f'job:{job_id}']
+
+
+def _job_changed(job_id):
+    """commit 된 공고 변경을 이 워커의 색인에 바로 반영한다. (다른 워커는 ChangeLog 로 반영)"""
+    for index in (search_index, facet_index):
+        try:
+            index.refresh([job_id])
+        except Exception as e:
+            print(f"{type(index).__name__} 갱신 실패 (job_id={job_id}): {e}")
+    # 색인을 먼저 갱신한 뒤 응답 캐시를 지워야 이전 결과가 다시 캐시되지 않는다
+    response_cache.invalidate_jobs([job_id])
+
+
 @bp.route('/', methods=['GET'])
 @jwt_required
+@response_cache.cached(_list_tags)
 def get_jobs():
     page = request.args.get('page', default=1, type=int)  # 기본값 1
     page_size = request.args.get('page_size', default=20, type=int)  # 기본값 20
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
+
+    # cursor 가 있으면 앞 페이지를 건너뛰지 않고 마지막 id 이후부터 조회
+    try:
+        last_id, = decode_cursor(page_cursor, 1) if page_cursor else (0,)
+    except InvalidCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
 
-    offset = (page - 1) * page_size # 페이지네이션 계산
+    offset = 0 if page_cursor else (page - 1) * page_size # 페이지네이션 계산
 
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
@@ -21,10 +72,11 @@ def get_jobs():
             SELECT j.id, j.title, c.name AS company_name, j.salary, j.deadline
             FROM Jobs j
             JOIN Companies c ON j.company_id = c.id
+            WHERE j.id > %s
             ORDER BY j.id ASC  -- ID 순으로 정렬
             LIMIT %s OFFSET %s
         """
-        cursor.execute(query, (page_size, offset))
+        cursor.execute(query, (last_id, page_size, offset))
         jobs = cursor.fetchall()
 
         return jsonify({
@@ -33,6 +85,7 @@ def get_jobs():
             "pagination": {
                 "current_page": page,
                 "per_page": page_size,
+                "next_cursor": next_cursor(jobs, page_size, 'id'),
             }
         }), 200
     except Exception as e:
@@ -44,58 +97,68 @@ def get_jobs():
 
 @bp.route('/search', methods=['GET'])
 @jwt_required
+@response_cache.cached(_list_tags)
 def search_jobs():
     keyword = request.args.get('keyword', default=None, type=str)
     page = request.args.get('page', default=1, type=int) # 기본 값 1
     page_size = request.args.get('page_size', default=20, type=int)  # 기본값 20
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
 
     if not keyword:
         return jsonify({"status": "error", "message": "Keyword is required for search"}), 400
 
-    connection = get_db_connection()
-    cursor = connection.cursor(pymysql.cursors.DictCursor)
-
     try:
-        # 키워드 검색 쿼리
-        search_query = """
-            SELECT j.id, j.title, c.name AS company_name, j.salary, j.deadline
-            FROM Jobs j
-            JOIN Companies c ON j.company_id = c.id
-            WHERE j.title LIKE %s OR c.name LIKE %s
-            LIMIT %s OFFSET %s
-        """
-
-        like_keyword = f"%{keyword}%"  # SQL에서 부분 일치를 위한 키워드 포맷
-        offset = (page - 1) * page_size  # 페이지네이션 계산
-
-        cursor.execute(search_query, (like_keyword, like_keyword, page_size, offset))
-        jobs = cursor.fetchall()
-
-        if not jobs:
-            return jsonify({"status": "success", "data": [], "message": "No jobs found for the given keyword"}), 200
-
-        return jsonify({
-            "status": "success",
-            "data": jobs,
-            "pagination": {
-                "current_page": page,
-            }
-        }), 200
+        cursor_version, cursor_position = decode_cursor(page_cursor, 2) if page_cursor else (None, None)
+        if page_cursor and (type(cursor_position) is not int or cursor_position < 0):
+            raise InvalidCursor("Invalid cursor.")
+    except InvalidCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
 
+    try:
+        # 메모리 색인에서 BM25 점수 순으로 검색 (점수 내림차순, 같은 점수는 id 오름차순)
+        version, results = search_index.search(keyword)
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
-    finally:
-        cursor.close()
-        connection.close()
+    # 점수는 공고가 추가/수정/삭제될 때마다 달라지므로 cursor 는 점수 대신 (색인 version, 위치)를 담는다.
+    # 그 사이 색인이 바뀌었으면 같은 위치가 다른 공고를 가리키므로 처음부터 다시 조회하도록 한다
+    if page_cursor:
+        if cursor_version != version:
+            return jsonify({
+                "status": "error",
+                "message": "Search results have changed since the previous page. Start again without a cursor."
+            }), 400
+        start = cursor_position
+    else:
+        start = (page - 1) * page_size  # 페이지네이션 계산
+    jobs = [job for _, job in results[start:start + page_size]]
+
+    if not jobs:
+        return jsonify({"status": "success", "data": [], "message": "No jobs found for the given keyword"}), 200
+
+    cursor_token = None
+    if len(jobs) == page_size and start + page_size < len(results):
+        cursor_token = encode_cursor(version, start + page_size)
+
+    return jsonify({
+        "status": "success",
+        "data": jobs,
+        "pagination": {
+            "current_page": page,
+            "total_items": len(results),
+            "next_cursor": cursor_token,
+        }
+    }), 200
 
 @bp.route('/filter', methods=['GET'])
 @jwt_required
+@response_cache.cached(_list_tags)
 def filter_jobs():
     query_locations = request.args.getlist('location')  # 여러 개의 location 값 처리
     query_tags = request.args.getlist('tag')  # 여러 개의 tag 값 처리
     page = request.args.get('page', default=1, type=int)  # 기본 값 1
     page_size = request.args.get('page_size', default=20, type=int)  # 기본값 20
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
 
     # 최소 하나의 location 또는 tag가 입력되지 않으면 에러
     if not query_locations and not query_tags:
@@ -104,80 +167,61 @@ def filter_jobs():
             "message": "At least one location or tag must be provided."
         }), 400
 
-    # Location id
-    location_ids = set()
-    for user_input in query_locations:
-        if ' ' in user_input:  # 입력이 'region district' 형태일 때
-            region, district = user_input.split(maxsplit=1)
-        else:  # 입력이 'region' 형태일 때
-            region, district = user_input, None
-
-        # 메모리 데이터에서 필터링
-        for (mem_region, mem_district), location_id in locations.items():
-            if mem_region == region and (district is None or mem_district == district):
-                location_ids.add(location_id)
-
-    # Tag id
-    tag_ids = [
-        tag_id for tag_name, tag_id in tags.items()
-        if tag_name in query_tags
-    ]
-
-    if not location_ids and not tag_ids:
+    try:
+        last_id, = decode_cursor(page_cursor, 1) if page_cursor else (None,)
+    except InvalidCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    try:
+        # 지역/태그 bitmap 연산으로 결과 id 와 facet 별 결과 수 계산
+        matched, facets = facet_index.filter(query_locations, query_tags)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    if matched is None:
         return jsonify({
             "status": "success",
             "data": [],
             "message": "No jobs found with the given filters."
         }), 200
 
+    # 결과 id 는 오름차순이므로 cursor 는 마지막 id 의 순위로 위치를 찾는다
+    try:
+        start = matched.rank(int(last_id)) if last_id is not None else (page - 1) * page_size
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "Invalid cursor."}), 400
+    page_ids = list(matched[start:start + page_size])
+
+    if not page_ids:
+        return jsonify({"status": "success", "data": [], "facets": facets,
+                        "message": "No jobs found with the given filters."}), 200
+
     # Database connection
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     try:
-        # query
-        query = """
-            SELECT DISTINCT j.id, j.title, c.name AS company_name, j.salary, j.deadline
+        # 현재 페이지의 공고만 PK 로 조회
+        placeholders = ', '.join(['%s'] * len(page_ids))
+        query = f"""
+            SELECT j.id, j.title, c.name AS company_name, j.salary, j.deadline
             FROM Jobs j
             JOIN Companies c ON j.company_id = c.id
-            LEFT JOIN JobTags jt ON j.id = jt.job_id
-            WHERE 
+            WHERE j.id IN ({placeholders})
+            ORDER BY j.id ASC
         """
-
-        # 조건 작성
-        conditions = []
-
-        # location 필터링 조건 추가
-        if location_ids:
-            location_placeholders = ', '.join(['%s'] * len(location_ids))
-            conditions.append(f"j.location_id IN ({location_placeholders})")
-
-        # tag 필터링 조건 추가
-        if tag_ids:
-            tag_placeholders = ', '.join(['%s'] * len(tag_ids))
-            conditions.append(f"jt.tag_id IN ({tag_placeholders})")
-
-        # 조건 결합
-        query += " AND ".join(conditions)
-
-        # 페이지네이션 추가
-        query += " LIMIT %s OFFSET %s"
-        offset = (page - 1) * page_size
-        params = list(location_ids) + tag_ids + [page_size, offset]
-
-        cursor.execute(query, tuple(params))
+        cursor.execute(query, page_ids)
         jobs = cursor.fetchall()
 
-        if not jobs:
-            return jsonify({"status": "success", "data": [], "message": "No jobs found with the given filters."}), 200
-
         return jsonify({
             "status": "success",
             "data": jobs,
+            "facets": facets,
             "pagination": {
                 "current_page": page,
                 "page_size": page_size,
-                "total_items": len(jobs)
+                "total_items": len(matched),
+                "next_cursor": encode_cursor(page_ids[-1]) if start + page_size < len(matched) else None,
             }
         }), 200
 
@@ -190,10 +234,12 @@ def filter_jobs():
 
 @bp.route('/sort', methods=['GET'])
 @jwt_required
+@response_cache.cached(_list_tags)
 def sort_jobs():
     order = request.args.get('order', default='asc')  # 정렬 순서 (asc 또는 desc)
     page = request.args.get('page', default=1, type=int)  # 기본 값 1
     page_size = request.args.get('page_size', default=20, type=int)  # 기본값 20
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
 
     # 정렬 순서 확인
     if order not in ['asc', 'desc']:
@@ -202,20 +248,35 @@ def sort_jobs():
             "message": "Invalid order. Valid values are 'asc' or 'desc'."
         }), 400
 
+    try:
+        last_key = decode_cursor(page_cursor, 2) if page_cursor else None
+    except InvalidCursor as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     try:
         # query
+        offset = (page - 1) * page_size
+        keyset, params = '', []
+
+        # cursor 가 있으면 (deadline, id) 가 마지막 행 이후인 공고부터 조회
+        if last_key is not None:
+            condition, params = after_key('j.deadline', 'j.id', *last_key, descending=order == 'desc')
+            keyset = f"WHERE {condition}"
+            offset = 0
+
+        # 같은 마감일 안에서는 id 로 정렬하여 순서를 고정
         query = f"""
             SELECT j.id, j.title, c.name AS company_name, j.salary, j.deadline
             FROM Jobs j
             JOIN Companies c ON j.company_id = c.id
-            ORDER BY j.deadline {order.upper()}
+            {keyset}
+            ORDER BY j.deadline {order.upper()}, j.id {order.upper()}
             LIMIT %s OFFSET %s
         """
-        offset = (page - 1) * page_size
-        params = [page_size, offset]
+        params += [page_size, offset]
 
         cursor.execute(query, params)
         jobs = cursor.fetchall()
@@ -228,6 +289,7 @@ def sort_jobs():
             "data": jobs,
             "pagination": {
                 "current_page": page,
+                "next_cursor": next_cursor(jobs, page_size, 'deadline', 'id'),
             }
         }), 200
 
@@ -268,7 +330,7 @@ def create_job():
         location_parts = location.split()
         region = location_parts[0]
         district = ''.join(location_parts[1:]) if len(location_parts) > 1 else '전체'
-        location_id = locations.get((region, district))
+        location_id = reference.location_id(region, district)
 
         if not location_id:
             return jsonify({"status": "error", "message": f"Invalid location: {location}"}), 400
@@ -295,17 +357,18 @@ def create_job():
         # 태그 등록
         tag_ids = []
         for tag in input_tags:
-            tag_id = tags.get(tag)
+            tag_id = reference.tag_id(tag)
             if not tag_id:
-                cursor.execute("INSERT INTO Tags (name) VALUES (%s)", (tag,))
+                tag_id = reference.create_tag(cursor, tag)
                 connection.commit()
-                tag_id = cursor.lastrowid
-                tags[tag] = tag_id
+                reference.add_tag(tag, tag_id)
             tag_ids.append(tag_id)
 
         for tag_id in tag_ids:
             cursor.execute("INSERT INTO JobTags (job_id, tag_id) VALUES (%s, %s)", (job_id, tag_id))
+        record_change(cursor, 'jobs', job_id)
         connection.commit()
+        _job_changed(job_id)
 
         return jsonify({"status": "success", "message": "Job created successfully", "Job_id": job_id }), 201
 
@@ -355,7 +418,7 @@ def update_job(job_id):
             location_parts = location.split()
             region = location_parts[0]
             district = ' '.join(location_parts[1:]) if len(location_parts) > 1 else '전체'
-            location_id = locations.get((region, district))
+            location_id = reference.location_id(region, district)
 
             if not location_id:
                 return jsonify({"status": "error", "message": f"Invalid location: {location}"}), 400
@@ -408,8 +471,6 @@ def update_job(job_id):
 
         # 태그 업데이트
         if input_tags:
-            print("Tags:", tags)  # `tags`는 딕셔너리이어야 합니다.
-            print("Type of tags:", type(tags))
             print("Input Tags:", input_tags)  # `input_tags`는 리스트여야 합니다.
             print("Type of input_tags:", type(input_tags))
             # 태그 초기화
@@ -419,18 +480,21 @@ def update_job(job_id):
             # 새로운 태그 추가
             tag_ids = []
             for tag in input_tags:
-                tag_id = tags.get(tag)
+                tag_id = reference.tag_id(tag)
                 if not tag_id:
-                    cursor.execute("INSERT INTO Tags (name) VALUES (%s)", (tag,))
+                    tag_id = reference.create_tag(cursor, tag)
                     connection.commit()
-                    tag_id = cursor.lastrowid
-                    tags[tag] = tag_id
+                    reference.add_tag(tag, tag_id)
                 tag_ids.append(tag_id)
 
             for tag_id in tag_ids:
                 cursor.execute("INSERT INTO JobTags (job_id, tag_id) VALUES (%s, %s)", (job_id, tag_id))
             connection.commit()
 
+        record_change(cursor, 'jobs', job_id)
+        connection.commit()
+        _job_changed(job_id)
+
         return jsonify({"status": "success", "message": "Job updated successfully"}), 200
 
     except Exception as e:
@@ -467,7 +531,9 @@ def delete_job(job_id):
 
         # 삭제
         cursor.execute("DELETE FROM Jobs WHERE id = %s", (job_id,))
+        record_change(cursor, 'jobs', job_id)
         connection.commit()
+        _job_changed(job_id)
 
         return jsonify({"status": "success", "message": "Job deleted successfully."}), 200
 
@@ -482,45 +548,112 @@ def delete_job(job_id):
 @bp.route('/<int:job_id>', methods=['GET'])
 @jwt_required
 def get_job_detail(job_id):
+    response = _job_detail(job_id)
+
+    # 조회수 증가는 메모리에 모았다가 주기적으로 DB 에 반영 (없는 공고는 세지 않음)
+    if response.status_code in (200, 304):
+        view_counter.increment(job_id)
+    return response
+
+def _overlay_views(data, job_id):
+    # 캐시된 DB 조회수에 아직 반영되지 않은 조회수(이번 조회 포함)를 더함
+    data['data']['views'] += view_counter.pending(job_id) + 1
+
+@response_cache.cached(_detail_tags, overlay=_overlay_views)
+def _job_detail(job_id):
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     try:
-        # Jobs, Companies
-        query_job = """
-            SELECT j.id, j.title, j.salary, j.career, j.education, j.employment, j.deadline, j.link, j.views,
-                   c.name AS company_name, c.link AS company_link,
-                   l.region, l.district
-            FROM Jobs j
-            JOIN Companies c ON j.company_id = c.id
-            JOIN Locations l ON j.location_id = l.id
-            WHERE j.id = %s
-        """
-        cursor.execute(query_job, (job_id,))
-        job = cursor.fetchone()
+        job_detail = _fetch_job_details(cursor, [job_id]).get(job_id)
 
-        if not job:
+        if not job_detail:
             return jsonify({"status": "error", "message": "Job not found"}), 404
 
-        # 조회수 증가
-        cursor.execute("UPDATE Jobs SET views = views + 1 WHERE id = %s", (job_id,))
-        connection.commit()
+        return jsonify({"status": "success", "data": job_detail}), 200
 
-        # Updated views fetch
-        job['views'] += 1
+    except Exception as e:
+        print(f"Error processing job_id={job_id}: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
 
-        # JobTags
-        query_tags = """
-            SELECT t.name
-            FROM JobTags jt
-            JOIN Tags t ON jt.tag_id = t.id
-            WHERE jt.job_id = %s
-        """
-        cursor.execute(query_tags, (job_id,))
-        tags = [tag['name'] for tag in cursor.fetchall()]
+    finally:
+        cursor.close()
+        connection.close()
+
+@bp.route('/batch', methods=['GET'])
+@jwt_required
+def get_job_details():
+    raw_ids = request.args.get('ids', default='', type=str)  # 예: ids=1,2,3
+
+    try:
+        job_ids = list(dict.fromkeys(int(job_id) for job_id in raw_ids.split(',') if job_id.strip()))
+    except ValueError:
+        return jsonify({"status": "error", "message": "ids must be a comma-separated list of job ids."}), 400
+
+    if not job_ids:
+        return jsonify({"status": "error", "message": "ids is required."}), 400
+
+    if len(job_ids) > MAX_BATCH_IDS:
+        return jsonify({"status": "error", "message": f"At most {MAX_BATCH_IDS} ids can be requested at once."}), 400
+
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        details = _fetch_job_details(cursor, job_ids)
+
+        # 목록 카드 렌더링용이므로 조회수는 증가시키지 않고, 반영 전 조회수만 더함
+        for job_id, job_detail in details.items():
+            job_detail['views'] += view_counter.pending(job_id)
+
+        return jsonify({
+            "status": "success",
+            "data": [details[job_id] for job_id in job_ids if job_id in details],
+            "not_found": [job_id for job_id in job_ids if job_id not in details]
+        }), 200
+
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    finally:
+        cursor.close()
+        connection.close()
+
+def _fetch_job_details(cursor, job_ids):
+    """
+    공고 상세(회사, 지역, 태그 포함)를 한 번의 쿼리로 조회한다.
+
+    Args:
+        cursor: DictCursor
+        job_ids (list): 조회할 공고 id 목록
+
+    Returns:
+        dict: {job_id: job_detail}. 없는 공고는 포함되지 않는다.
+    """
+    # Jobs, Companies, Locations 와 태그 목록(JSON 배열)을 함께 조회
+    placeholders = ', '.join(['%s'] * len(job_ids))
+    query = f"""
+        SELECT j.id, j.title, j.salary, j.career, j.education, j.employment, j.deadline, j.link, j.views,
+               c.name AS company_name, c.link AS company_link,
+               l.region, l.district,
+               JSON_ARRAYAGG(t.name) AS tags
+        FROM Jobs j
+        JOIN Companies c ON j.company_id = c.id
+        JOIN Locations l ON j.location_id = l.id
+        LEFT JOIN JobTags jt ON jt.job_id = j.id
+        LEFT JOIN Tags t ON jt.tag_id = t.id
+        WHERE j.id IN ({placeholders})
+        GROUP BY j.id
+    """
+    cursor.execute(query, list(job_ids))
+
+    details = {}
+    for job in cursor.fetchall():
+        # 태그가 없는 공고는 LEFT JOIN 결과로 [null] 이 된다
+        tags = [tag for tag in json.loads(job['tags'] or '[]') if tag is not None]
 
         # 반환 데이터
-        job_detail = {
+        details[job['id']] = {
             "id": job['id'],
             "title": job['title'],
             "salary": job['salary'],
@@ -540,13 +673,4 @@ def get_job_detail(job_id):
             "views": job['views'],
             "tags": tags
         }
-
-        return jsonify({"status": "success", "data": job_detail}), 200
-
-    except Exception as e:
-        print(f"Error processing job_id={job_id}: {str(e)}")
-        return jsonify({"status": "error", "message": str(e)}), 500
-
-    finally:
-        cursor.close()
-        connection.close()
+    return details
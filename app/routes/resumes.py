@@ -1,8 +1,8 @@
 import pymysql
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import get_jwt_identity
 from app.utils.DB_Utils import get_db_connection
-from app.utils.jwt_token import jwt_required
+from app.utils.jwt_token import get_jwt_identity, jwt_required
+from app.utils.pagination import InvalidCursor, decode_cursor, next_cursor, after_key
 
 bp = Blueprint('resumes', __name__, url_prefix='/resumes')
 
@@ -52,21 +52,32 @@ def get_resumes():
     user_id = get_jwt_identity()
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=20, type=int)
+    page_cursor = request.args.get('cursor')  # 이전 응답의 next_cursor
     offset = (page - 1) * per_page
+    keyset, keyset_params = '', []
+
+    # cursor 가 있으면 (updated_at, id) 가 마지막 이력서 이후인 항목부터 조회
+    if page_cursor:
+        try:
+            condition, keyset_params = after_key('updated_at', 'id', *decode_cursor(page_cursor, 2), descending=True)
+        except InvalidCursor as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        keyset = f"AND {condition}"
+        offset = 0
 
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     try:
         # 이력서 목록 조회
-        query = """
+        query = f"""
             SELECT id, content, created_at, updated_at
             FROM Resumes
-            WHERE user_id = %s
-            ORDER BY updated_at DESC
+            WHERE user_id = %s {keyset}
+            ORDER BY updated_at DESC, id DESC
             LIMIT %s OFFSET %s
         """
-        cursor.execute(query, (user_id, per_page, offset))
+        cursor.execute(query, (user_id, *keyset_params, per_page, offset))
         resumes = cursor.fetchall()
 
         if not resumes:
@@ -78,7 +89,8 @@ def get_resumes():
             "pagination": {
                 "current_page": page,
                 "per_page": per_page,
-                "total_items": len(resumes)
+                "total_items": len(resumes),
+                "next_cursor": next_cursor(resumes, per_page, 'updated_at', 'id'),
             }
         }), 200
 
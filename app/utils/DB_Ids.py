@@ -1,5 +1,181 @@
-from .DB_Utils import load_tags_to_memory, load_locations_to_memory
+import os
+import threading
+import time
 
-global locations, tags
-locations = load_locations_to_memory()
-tags = load_tags_to_memory()
\ No newline at end of file
+from dotenv import load_dotenv
+
+from .DB_Utils import get_db_connection
+from .versions import bump_version, read_versions, watcher
+
+load_dotenv()
+
+REFERENCE_CACHE_TTL = float(os.getenv('REFERENCE_CACHE_TTL', 600))  # 참조 데이터 갱신 주기(초)
+
+
+class ReferenceCache:
+    """
+    Locations, Tags 참조 데이터를 메모리에 올려 두는 캐시.
+
+    처음 조회할 때 DB 에서 읽어 오고(lazy), TTL 이 지나면 요청을 막지 않고
+    백그라운드 스레드에서 다시 읽어 온다. 갱신에 실패하면 기존 데이터를 계속 사용한다.
+    다른 워커가 태그/지역을 추가하면 ReferenceVersions 의 버전 변경을 감지하여
+    새로 추가된 행만 읽어 온다.
+
+    Args:
+        ttl (float): 갱신 주기(초)
+    """
+
+    def __init__(self, ttl=REFERENCE_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._loaded_at = 0.0
+        self._stale = False  # invalidate() 후 다음 조회 시 다시 읽어야 하는 경우
+
+        # 조회용 맵은 통째로 교체하므로 읽을 때는 lock 이 필요 없다
+        # (변경하는 쪽은 self._lock 안에서 복사본을 수정한 뒤 교체한다)
+        self._locations = None   # (region, district) -> location_id
+        self._regions = {}       # region -> (location_id, ...)
+        self._tags = {}          # tag name -> tag_id
+        self._versions = {}      # 현재 메모리에 반영된 ReferenceVersions 버전
+
+    def _fetch(self):
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            # 버전을 먼저 읽어야 이후 변경을 놓치지 않는다
+            versions = read_versions(cursor)
+            cursor.execute("SELECT id, region, district FROM Locations")
+            location_rows = cursor.fetchall()
+            cursor.execute("SELECT id, name FROM Tags")
+            tag_rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            connection.close()
+
+        locations = {(region, district): location_id for location_id, region, district in location_rows}
+        regions = {}
+        for (region, _), location_id in locations.items():
+            regions.setdefault(region, []).append(location_id)
+        regions = {region: tuple(ids) for region, ids in regions.items()}
+        tags = {name: tag_id for tag_id, name in tag_rows}
+        return locations, regions, tags, versions
+
+    def _swap(self, locations, regions, tags, versions):
+        self._regions = regions
+        self._tags = tags
+        self._locations = locations
+        self._versions = {'locations': versions.get('locations', 0), 'tags': versions.get('tags', 0)}
+        self._loaded_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        try:
+            fetched = self._fetch()
+            with self._lock:
+                self._swap(*fetched)
+        except Exception as e:
+            print(f"참조 데이터 갱신 실패 (기존 데이터 유지): {e}")
+        finally:
+            self._refreshing = False
+
+    def _ensure_loaded(self):
+        if self._locations is None or self._stale:
+            with self._lock:
+                if self._locations is None or self._stale:
+                    self._swap(*self._fetch())
+                    self._stale = False
+            watcher.subscribe('tags', self._on_tags_version)
+            watcher.subscribe('locations', self._on_locations_version)
+            return
+
+        if time.monotonic() - self._loaded_at > self.ttl and not self._refreshing:
+            with self._lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            threading.Thread(target=self._refresh_in_background, name='reference-cache-refresh', daemon=True).start()
+
+    def _on_tags_version(self, version):
+        if self._locations is None or version <= self._versions.get('tags', 0):
+            return
+
+        # 태그는 추가만 되므로 알고 있는 가장 큰 id 이후만 읽는다
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT id, name FROM Tags WHERE id > %s", (max(self._tags.values(), default=0),))
+            added = {name: tag_id for tag_id, name in cursor.fetchall()}
+        finally:
+            cursor.close()
+            connection.close()
+
+        # 읽는 동안 add_tag 로 추가된 태그를 잃지 않도록 lock 안에서 현재 맵을 복사해 합친다
+        with self._lock:
+            tags = dict(self._tags)
+            tags.update(added)
+            self._tags = tags
+            self._versions['tags'] = max(version, self._versions.get('tags', 0))
+
+    def _on_locations_version(self, version):
+        if self._locations is None or version <= self._versions.get('locations', 0):
+            return
+
+        # 지역은 수십 건이므로 전체를 다시 읽는다
+        with self._lock:
+            self._swap(*self._fetch())
+
+    def invalidate(self):
+        """
+        다음 조회 시 DB 에서 다시 읽어 오도록 표시한다.
+        다른 스레드가 읽는 중일 수 있으므로 기존 맵은 새 데이터로 교체될 때까지 유지한다.
+        """
+        with self._lock:
+            self._stale = True
+
+    def location_id(self, region, district):
+        """(region, district) 에 해당하는 location id. 없으면 None."""
+        self._ensure_loaded()
+        return self._locations.get((region, district))
+
+    def region_location_ids(self, region):
+        """region 에 속한 모든 location id 튜플. 없으면 빈 튜플."""
+        self._ensure_loaded()
+        return self._regions.get(region, ())
+
+    def tag_id(self, name):
+        """태그 이름에 해당하는 tag id. 없으면 None."""
+        self._ensure_loaded()
+        return self._tags.get(name)
+
+    def add_tag(self, name, tag_id):
+        """commit 된 새 태그를 캐시에 반영한다."""
+        self._ensure_loaded()
+        with self._lock:
+            tags = dict(self._tags)
+            tags[name] = tag_id
+            self._tags = tags
+
+    def create_tag(self, cursor, name):
+        """
+        태그를 추가하고 tag id 를 반환한다. 다른 워커가 먼저 추가한 태그라면 기존 id 를 반환한다.
+        새로 추가된 경우 태그 버전을 올려 다른 워커가 가져가도록 한다.
+        commit 은 호출자가 수행하며, rollback 된 태그가 캐시에 남지 않도록 commit 후 add_tag 로 이 워커에 반영한다.
+
+        Args:
+            cursor: 호출자의 트랜잭션 커서
+            name (str): 태그 이름
+
+        Returns:
+            int: tag id
+        """
+        cursor.execute(
+            "INSERT INTO Tags (name) VALUES (%s) ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)",
+            (name,)
+        )
+        tag_id = cursor.lastrowid
+        if cursor.rowcount == 1:  # 새로 추가된 경우에만 1
+            bump_version(cursor, 'tags')
+        return tag_id
+
+
+reference = ReferenceCache()
@@ -1,6 +1,14 @@
+import atexit
+import collections
+import threading
+import time
+
 import pymysql
 import os
 from dotenv import load_dotenv
+from flask import g, has_app_context, current_app
+
+from app.utils import query_stats
 
 # Load .env file
 load_dotenv()
@@ -8,44 +16,234 @@ load_dotenv()
 
 # Database Configuration
 
-def get_db_connection():
-    """
-    데이터베이스 연결을 생성하는 함수.
-
-    Returns:
-        connection: pymysql 연결 객체
-    """
-    DB_CONFIG = {
+def _db_config():
+    return {
         "host": os.getenv('DB_HOST'),
         "port": int(os.getenv('DB_PORT')),
         "user": os.getenv('DB_USER'),
         "password": os.getenv('DB_PASSWORD'),
         "database": os.getenv('DB_NAME')
     }
-    try:
-        connection = pymysql.connect(**DB_CONFIG)
+
+
+# Connection Pool 설정 (.env 로 조정 가능)
+POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))            # 커넥션 대기 최대 시간(초)
+POOL_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', 1800))         # 유휴 커넥션 폐기 기준(초)
+POOL_PING_AFTER = float(os.getenv('DB_POOL_PING_AFTER', 5))      # 이 시간 이상 유휴였던 커넥션은 ping 후 반환
+
+
+class PoolTimeoutError(pymysql.MySQLError):
+    """커넥션 풀이 가득 차서 제한 시간 안에 커넥션을 얻지 못한 경우."""
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 pymysql 커넥션 풀.
+
+    Args:
+        min_size (int): 처음 사용 시 미리 만들어 둘 커넥션 수
+        max_size (int): 동시에 열 수 있는 최대 커넥션 수
+        timeout (float): 풀이 가득 찼을 때 반환을 기다리는 최대 시간(초)
+        recycle (float): 이 시간 이상 유휴 상태였던 커넥션은 닫고 새로 연결
+        ping_after (float): 이 시간 이상 유휴 상태였던 커넥션은 반환 전 ping 으로 확인
+    """
+
+    def __init__(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT,
+                 recycle=POOL_RECYCLE, ping_after=POOL_PING_AFTER):
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+
+        self._idle = collections.deque()  # (connection, 반환 시각)
+        self._size = 0                     # 현재 열려 있는 커넥션 수 (사용 중 + 유휴)
+        self._cond = threading.Condition()
+        self._filled = False
+        self._pid = os.getpid()
+
+    def _connect(self):
+        connection = pymysql.connect(**_db_config())
         print("Database connection established.")
         return connection
-    except pymysql.MySQLError as e:
-        print(f"Error connecting to the database: {e}")
-        raise
-
-def load_locations_to_memory():
-    """Load Locations data into memory."""
-    connection = get_db_connection()
-    cursor = connection.cursor()
-    cursor.execute("SELECT id, region, district FROM Locations")
-    locations = { (row[1], row[2]): row[0] for row in cursor.fetchall() }
-    cursor.close()
-    connection.close()
-    return locations
-
-def load_tags_to_memory():
-    """Load Tags data into memory."""
-    connection = get_db_connection()
-    cursor = connection.cursor()
-    cursor.execute("SELECT id, name FROM Tags")
-    tags = { row[1]: row[0] for row in cursor.fetchall() }
-    cursor.close()
-    connection.close()
-    return tags
+
+    def _reset_after_fork(self):
+        # fork 된 워커는 부모의 소켓을 공유하면 안 되므로 풀 상태를 비운다
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._size = 0
+            self._filled = False
+
+    def _fill_min(self):
+        self._filled = True
+        while self._size < self.min_size:
+            self._size += 1
+            try:
+                connection = self._connect()
+            except pymysql.MySQLError:
+                self._size -= 1
+                raise
+            self._idle.append((connection, time.monotonic()))
+
+    def _discard(self, connection):
+        self._size -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """
+        풀에서 커넥션을 꺼낸다. 유휴 커넥션이 없으면 새로 연결하고,
+        최대 크기에 도달했으면 timeout 동안 반환을 기다린다.
+
+        Returns:
+            connection: pymysql 연결 객체
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            self._reset_after_fork()
+            if not self._filled:
+                self._fill_min()
+
+            while True:
+                while self._idle:
+                    connection, released_at = self._idle.pop()
+                    idle_for = time.monotonic() - released_at
+
+                    # 오래 쉬었던 커넥션은 서버가 이미 끊었을 수 있으므로 교체
+                    if idle_for > self.recycle:
+                        self._discard(connection)
+                        continue
+
+                    if idle_for > self.ping_after:
+                        try:
+                            connection.ping(reconnect=False)
+                        except Exception:
+                            self._discard(connection)
+                            continue
+                    return connection
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a database connection "
+                        f"(pool max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+        # 연결(handshake)은 lock 밖에서 수행
+        try:
+            return self._connect()
+        except pymysql.MySQLError as e:
+            print(f"Error connecting to the database: {e}")
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, connection):
+        """사용이 끝난 커넥션을 풀에 돌려준다. 커밋되지 않은 작업은 rollback 된다."""
+        healthy = connection.open
+        if healthy:
+            try:
+                connection.rollback()
+            except Exception:
+                healthy = False
+
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            if healthy:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._discard(connection)
+            self._cond.notify()
+
+    def close_all(self):
+        """유휴 커넥션을 모두 닫는다. (사용 중인 커넥션은 반환 시 다시 풀에 들어간다)"""
+        with self._cond:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._discard(connection)
+            self._filled = False
+
+
+class PooledConnection:
+    """
+    풀에서 빌린 커넥션을 감싸는 객체.
+    기존 코드처럼 close() 를 호출하면 실제로 끊지 않고 풀에 반환한다.
+    """
+
+    def __init__(self, pool, connection, request_bound=False):
+        self._pool = pool
+        self._connection = connection
+        self._request_bound = request_bound
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return query_stats.wrap_cursor(self._connection.cursor(*args, **kwargs))
+
+    def close(self):
+        # 요청에 묶인 커넥션은 요청 종료(teardown) 시 반환된다
+        if self._request_bound:
+            return
+        self._return_to_pool()
+
+    def _return_to_pool(self):
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+
+
+pool = ConnectionPool()
+atexit.register(pool.close_all)
+
+
+def get_db_connection():
+    """
+    데이터베이스 연결을 풀에서 가져오는 함수.
+    init_app 이 등록된 Flask 요청 안에서는 요청당 하나의 커넥션을 공유하고,
+    요청이 끝날 때 자동으로 풀에 반환된다.
+
+    Returns:
+        connection: pymysql 연결 객체 (close() 시 풀에 반환)
+    """
+    if has_app_context() and 'db_pool' in current_app.extensions:
+        connection = g.get('_db_connection')
+        if connection is None:
+            connection = PooledConnection(pool, pool.acquire(), request_bound=True)
+            g._db_connection = connection
+        return connection
+
+    return PooledConnection(pool, pool.acquire())
+
+
+def release_request_connection():
+    """
+    요청에 묶인 커넥션을 요청이 끝나기 전에 풀에 반환한다. (커밋되지 않은 작업은 rollback 된다)
+    비밀번호 해시처럼 DB 를 쓰지 않고 오래 걸리는 작업 전에 호출하며, 이후 get_db_connection 은 새 커넥션을 빌린다.
+    """
+    connection = g.pop('_db_connection', None)
+    if connection is not None:
+        connection._return_to_pool()
+
+
+def _release_request_connection(exception=None):
+    release_request_connection()
+
+
+def init_app(app):
+    """요청 단위 커넥션 반환(teardown)을 Flask 앱에 등록한다."""
+    app.extensions['db_pool'] = pool
+    app.teardown_appcontext(_release_request_connection)
+
@@ -0,0 +1,51 @@
+"""
+비밀번호 해시 벤치마크.
+
+현재 scrypt 비용 설정(PASSWORD_SCRYPT_*)으로 해시 한 번에 걸리는 시간과, 스레드 1개 / PasswordHasher 풀로
+초당 처리할 수 있는 해시 수를 출력한다. 로그인 한 번은 verify 한 번이므로 hashes/sec 이 곧 logins/sec 이다.
+비용을 올리면 무차별 대입이 어려워지는 대신 코어당 처리량이 줄어들므로, 예상 로그인 부하에 맞춰 고른다.
+
+사용 예:
+    python -m app.utils.bench_passwords --count 40
+    PASSWORD_SCRYPT_N=32768 python -m app.utils.bench_passwords
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.passwords import PASSWORD_HASH_WORKERS, PasswordHasher
+
+
+def main():
+    parser = argparse.ArgumentParser(description='비밀번호 해시 벤치마크')
+    parser.add_argument('--count', type=int, default=40, help='측정할 해시 수')
+    parser.add_argument('--workers', type=int, default=PASSWORD_HASH_WORKERS, help='풀 스레드 수')
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(workers=args.workers, max_pending=args.count)
+    stored = hasher.hash('benchmark-password')
+    cores = os.cpu_count() or 1
+    print(f"[bench] scrypt n={hasher.n} r={hasher.r} p={hasher.p} "
+          f"memory={128 * hasher.n * hasher.r / 1024 / 1024:.0f}MiB per hash, cores={cores}")
+
+    started = time.perf_counter()
+    for _ in range(args.count):
+        hasher._verify('benchmark-password', stored)
+    single = time.perf_counter() - started
+    print(f"[bench] mode=single  hashes={args.count} seconds={single:.3f} "
+          f"ms_per_hash={single / args.count * 1000:.1f} hashes_per_sec={args.count / single:,.1f}")
+
+    # 요청 스레드가 동시에 verify 를 호출하는 상황
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.count) as requests:
+        results = list(requests.map(lambda _: hasher.verify('benchmark-password', stored), range(args.count)))
+    pooled = time.perf_counter() - started
+    assert all(ok for ok, _ in results)
+    print(f"[bench] mode=pool    hashes={args.count} seconds={pooled:.3f} workers={hasher.workers} "
+          f"hashes_per_sec={args.count / pooled:,.1f} speedup={single / pooled:.1f}x")
+    print(f"[bench] 코어당 약 {args.count / single:,.1f} logins/sec (현재 비용 설정)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+/jobs/filter 용 메모리 facet 색인.
+
+지역(region, district), 시/도(region), 태그마다 해당 공고 id 의 압축 bitmap(Roaring)을 두고
+필터 요청을 bitmap 연산으로 처리한다. 같은 종류의 조건끼리는 OR, 지역과 태그는 AND 로
+결합하며(기존 SQL 과 동일), 각 facet 값을 조건에 추가했을 때의 결과 수도 함께 계산한다.
+"""
+import os
+
+from dotenv import load_dotenv
+from pyroaring import BitMap
+
+from app.utils.versions import ChangeFeedIndex
+
+load_dotenv()
+
+FACET_LIMIT = int(os.getenv('FACET_LIMIT', 20))  # facet 종류별로 반환할 최대 항목 수
+
+JOB_LOCATIONS_QUERY = """
+    SELECT j.id, l.region, l.district
+    FROM Jobs j
+    JOIN Locations l ON j.location_id = l.id
+"""
+
+JOB_TAGS_QUERY = """
+    SELECT jt.job_id, t.name
+    FROM JobTags jt
+    JOIN Tags t ON jt.tag_id = t.id
+"""
+
+
+def _count_if_added(context, base, bitmap):
+    """
+    조건 하나를 OR 로 추가했을 때의 결과 수. |context ∩ (selected ∪ bitmap)|
+
+    Args:
+        context (BitMap): 다른 종류의 조건으로 좁혀진 집합
+        base (BitMap): 현재 결과 (context ∩ selected). 해당 종류의 조건이 없으면 빈 bitmap
+        bitmap (BitMap): 추가할 facet 값의 bitmap
+    """
+    return len(base) + context.intersection_cardinality(bitmap) - base.intersection_cardinality(bitmap)
+
+
+class FacetIndex(ChangeFeedIndex):
+    """지역/시도/태그별 공고 id bitmap 색인."""
+
+    feed = 'jobs'
+
+    def __init__(self, facet_limit=FACET_LIMIT):
+        super().__init__()
+        self.facet_limit = facet_limit
+        self._reset()
+
+    def _reset(self):
+        self._all = BitMap()
+        self._locations = {}   # (region, district) -> BitMap
+        self._regions = {}     # region -> BitMap
+        self._tags = {}        # tag name -> BitMap
+        self._job_facets = {}  # job_id -> ((region, district), (tag name, ...))
+
+    def _index(self, job_id, location, tags):
+        self._all.add(job_id)
+        self._locations.setdefault(location, BitMap()).add(job_id)
+        self._regions.setdefault(location[0], BitMap()).add(job_id)
+        for tag in tags:
+            self._tags.setdefault(tag, BitMap()).add(job_id)
+        self._job_facets[job_id] = (location, tuple(tags))
+
+    def _unindex(self, job_id):
+        facets = self._job_facets.pop(job_id, None)
+        if facets is None:
+            return
+        location, tags = facets
+        self._all.discard(job_id)
+        self._discard(self._locations, location, job_id)
+        self._discard(self._regions, location[0], job_id)
+        for tag in tags:
+            self._discard(self._tags, tag, job_id)
+
+    @staticmethod
+    def _discard(bitmaps, key, job_id):
+        bitmap = bitmaps.get(key)
+        if bitmap is not None:
+            bitmap.discard(job_id)
+            if not bitmap:
+                del bitmaps[key]
+
+    def _load_all(self, cursor):
+        cursor.execute(JOB_LOCATIONS_QUERY)
+        location_rows = cursor.fetchall()
+        cursor.execute(JOB_TAGS_QUERY)
+        tag_rows = cursor.fetchall()
+
+        job_tags = {}
+        for row in tag_rows:
+            job_tags.setdefault(row['job_id'], []).append(row['name'])
+
+        # id 목록을 모아 한 번에 bitmap 으로 만든다 (add 를 반복하는 것보다 빠름)
+        locations, regions, tags, job_facets = {}, {}, {}, {}
+        for row in location_rows:
+            location = (row['region'], row['district'])
+            names = tuple(job_tags.get(row['id'], ()))
+            locations.setdefault(location, []).append(row['id'])
+            regions.setdefault(row['region'], []).append(row['id'])
+            for name in names:
+                tags.setdefault(name, []).append(row['id'])
+            job_facets[row['id']] = (location, names)
+
+        with self._lock:
+            self._all = BitMap(job_facets)
+            self._locations = {key: BitMap(ids) for key, ids in locations.items()}
+            self._regions = {key: BitMap(ids) for key, ids in regions.items()}
+            self._tags = {key: BitMap(ids) for key, ids in tags.items()}
+            self._job_facets = job_facets
+
+    def _load_ids(self, cursor, ids):
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(JOB_LOCATIONS_QUERY + f" WHERE j.id IN ({placeholders})", ids)
+        location_rows = cursor.fetchall()
+        cursor.execute(JOB_TAGS_QUERY + f" WHERE jt.job_id IN ({placeholders})", ids)
+        job_tags = {}
+        for row in cursor.fetchall():
+            job_tags.setdefault(row['job_id'], []).append(row['name'])
+
+        with self._lock:
+            for job_id in ids:
+                self._unindex(job_id)
+            for row in location_rows:
+                self._index(row['id'], (row['region'], row['district']), job_tags.get(row['id'], ()))
+
+    def _location_bitmap(self, value):
+        """'region district' 는 해당 지역, 'region' 은 시/도 전체의 bitmap. 없으면 None."""
+        if ' ' in value:
+            return self._locations.get(tuple(value.split(maxsplit=1)))
+        return self._regions.get(value)
+
+    def filter(self, locations, tags):
+        """
+        지역/태그 조건에 맞는 공고 id 와 facet 별 결과 수를 계산한다.
+        알 수 없는 지역/태그는 무시한다.
+
+        Args:
+            locations (list): 'region' 또는 'region district' 목록 (OR)
+            tags (list): 태그 이름 목록 (OR)
+
+        Returns:
+            tuple: (결과 BitMap, facets). 인식된 조건이 하나도 없으면 (None, None)
+                facets 는 {"locations": [...], "regions": [...], "tags": [...]} 형태로,
+                각 항목의 count 는 그 값을 조건에 추가했을 때의 결과 수이다.
+        """
+        self.ensure_built()
+        with self._lock:
+            locations = set(locations)
+            location_maps = [bm for bm in map(self._location_bitmap, locations) if bm is not None]
+            selected_tags = [tag for tag in dict.fromkeys(tags) if tag in self._tags]
+            if not location_maps and not selected_tags:
+                return None, None
+
+            selected_locations = BitMap.union(*location_maps) if location_maps else None
+            selected_tag_jobs = BitMap.union(*(self._tags[tag] for tag in selected_tags)) if selected_tags else None
+
+            # 다른 종류의 조건으로 좁혀진 집합 (조건이 없으면 전체)
+            location_context = selected_locations if selected_locations is not None else self._all
+            tag_context = selected_tag_jobs if selected_tag_jobs is not None else self._all
+
+            result = location_context & tag_context
+            location_base = result if selected_locations is not None else BitMap()
+            tag_base = result if selected_tag_jobs is not None else BitMap()
+
+            facets = {
+                "locations": self._top(
+                    ({"region": region, "district": district,
+                      "count": _count_if_added(tag_context, location_base, bitmap)}
+                     for (region, district), bitmap in self._locations.items()
+                     if f"{region} {district}" not in locations)
+                ),
+                "regions": self._top(
+                    ({"region": region, "count": _count_if_added(tag_context, location_base, bitmap)}
+                     for region, bitmap in self._regions.items() if region not in locations)
+                ),
+                "tags": self._top(
+                    ({"name": name, "count": _count_if_added(location_context, tag_base, bitmap)}
+                     for name, bitmap in self._tags.items() if name not in selected_tags)
+                ),
+            }
+        return result, facets
+
+    def _top(self, items):
+        """결과 수가 0 인 항목을 빼고 많은 순으로 facet_limit 개."""
+        items = [item for item in items if item['count']]
+        items.sort(key=lambda item: -item['count'])
+        return items[:self.facet_limit]
+
+
+facet_index = FacetIndex()
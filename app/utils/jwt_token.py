@@ -1,11 +1,16 @@
 import jwt
 import datetime
+import hashlib
+import time
+import uuid
 from app.utils.DB_Utils import get_db_connection
+from app.utils.response_cache import TTLCache
+from app.utils.revocation import revocation_index
 from functools import wraps
-from flask import jsonify, request
-from flask_jwt_extended import (
-    get_jwt_identity, verify_jwt_in_request, decode_token
-)
+from flask import g, jsonify, request
+import flask_jwt_extended
+from flask_jwt_extended import verify_jwt_in_request, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
 import os
 from dotenv import load_dotenv
 
@@ -13,11 +18,22 @@ load_dotenv()
 
 SECRET_KEY = os.getenv('SECRET_KEY')
 REFRESH_SECRET_KEY = os.getenv('REFRESH_SECRET_KEY')
+ACCESS_TOKEN_LIFETIME = datetime.timedelta(minutes=15)
+REFRESH_TOKEN_LIFETIME = datetime.timedelta(days=7)
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 4096))                # 워커당 토큰 캐시 최대 항목 수
+REJECTED_TOKEN_CACHE_TTL = float(os.getenv('REJECTED_TOKEN_CACHE_TTL', 30))  # 만료/무효 토큰 응답 캐시 유효 시간(초)
+
+# 토큰 sha256 -> 검증된 claim(jwt_data). 항목마다 토큰의 exp 까지 유지
+verified_tokens = TTLCache(TOKEN_CACHE_SIZE, ttl=0)
+# 토큰 sha256 -> 401 응답 본문 (만료 토큰 재사용 시 DB 조회 생략)
+rejected_tokens = TTLCache(TOKEN_CACHE_SIZE, ttl=REJECTED_TOKEN_CACHE_TTL)
+# 회전되어 더 이상 쓸 수 없는 refresh token sha256 -> user_id (재사용 시 DB 조회 없이 거부)
+rotated_refresh_tokens = TTLCache(TOKEN_CACHE_SIZE, ttl=REFRESH_TOKEN_LIFETIME.total_seconds())
 
 def create_access_token(user_id):
     payload = {
         "user_id": user_id,
-        "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=15),  # 유효기간: 15분
+        "exp": datetime.datetime.utcnow() + ACCESS_TOKEN_LIFETIME,  # 유효기간: 15분
         "iat": datetime.datetime.utcnow()
     }
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
@@ -25,8 +41,9 @@ def create_access_token(user_id):
 def create_refresh_token(user_id):
     payload = {
         "user_id": user_id,
-        "exp": datetime.datetime.utcnow() + datetime.timedelta(days=7),  # 유효기간: 7일
-        "iat": datetime.datetime.utcnow()
+        "exp": datetime.datetime.utcnow() + REFRESH_TOKEN_LIFETIME,  # 유효기간: 7일
+        "iat": datetime.datetime.utcnow(),
+        "jti": uuid.uuid4().hex  # 같은 초에 회전해도 토큰(해시)이 겹치지 않도록
     }
     return jwt.encode(payload, REFRESH_SECRET_KEY, algorithm="HS256")
 
@@ -39,57 +56,136 @@ def decode_refresh_token(token, secret_key):
     except jwt.InvalidTokenError:
         raise ValueError("Invalid token")
 
+def token_digest(token):
+    """토큰의 sha256 (hex). 캐시 키와 RefreshTokens.token_hash 에 사용한다."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_jwt():
+    """
+    현재 요청의 access token claim.
+    jwt_required 가 검증 캐시에서 꺼낸 claim 은 flask_jwt_extended 의 요청 컨텍스트에 없으므로
+    routes 는 flask_jwt_extended.get_jwt 대신 이 함수를 사용한다.
+    """
+    claims = g.get('jwt_claims')
+    return claims if claims is not None else flask_jwt_extended.get_jwt()
+
+
+def get_jwt_identity():
+    """현재 요청의 사용자 id (access token 의 sub)"""
+    return get_jwt().get('sub')
+
+
+def invalidate_user_tokens(user_id):
+    """사용자의 토큰 검증/거부 캐시를 지운다. (refresh token 이 바뀌거나 계정이 삭제된 경우, 이 워커 한정)"""
+    tag = f"user:{user_id}"
+    verified_tokens.invalidate(tag)
+    rejected_tokens.invalidate(tag)
+
+
+def _revoked(user_ids):
+    """폐기 목록이 바뀌면 해당 사용자의 검증 캐시를 지워 다음 요청에서 폐기 여부를 다시 확인한다."""
+    if user_ids is None:
+        verified_tokens.clear()
+    else:
+        verified_tokens.invalidate(*(f"user:{user_id}" for user_id in user_ids))
+
+
+revocation_index.on_revoke(_revoked)
+
+
+def _reject(digest, body, user_id=None):
+    rejected_tokens.set(digest, body, tags=[f"user:{user_id}"] if user_id else ())
+    return jsonify(body), 401
+
+
 def jwt_required(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            # JWT 검증
-            verify_jwt_in_request()
-            user_id = get_jwt_identity()
-
-            if not user_id:
-                return jsonify({"status": "error", "message": "User not authenticated"}), 401
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        digest = token_digest(token) if token else None
+
+        # 같은 만료/무효 토큰이 반복해서 오면 서명 검증과 DB 조회 없이 같은 응답을 반환한다
+        rejected = rejected_tokens.get(digest) if digest else None
+        if rejected is not None:
+            return jsonify(rejected), 401
+
+        # JWT 검증 (검증된 토큰은 만료 시각까지 캐시하여 서명 검증을 건너뛴다)
+        # 캐시된 경우 flask_jwt_extended 의 user_lookup_loader/token_in_blocklist_loader 는 호출되지 않는다.
+        # (이 앱은 등록하지 않으며, 폐기 여부는 revocation_index 가 확인하고 폐기 시 캐시를 지운다)
+        jwt_data = verified_tokens.get(digest) if digest else None
+        if jwt_data is None:
+            generation = verified_tokens.generation
+            try:
+                _, jwt_data = verify_jwt_in_request()
+            except (JWTExtendedException, jwt.InvalidTokenError):
+                return _reject_unverified(token, digest)
 
-            # 정상적인 access token인 경우
-            return func(*args, **kwargs)
+            # 로그아웃한 토큰 (검증 캐시에 있는 토큰은 폐기될 때 캐시에서 지워지므로 여기서만 확인)
+            try:
+                revoked = revocation_index.is_revoked(jwt_data)
+            except Exception as e:
+                # DB 장애 등: 토큰이 폐기됐는지 알 수 없으므로 거부 캐시에 남기지 않는다
+                print(f"토큰 폐기 여부 확인 실패: {e}")
+                return jsonify({"status": "error", "message": "Unable to verify token at this time."}), 503
+            if revoked:
+                return _reject(digest, {"status": "error", "message": "Token has been revoked."}, jwt_data.get('sub'))
+
+            remaining = jwt_data.get('exp', 0) - time.time()
+            if remaining > 0:
+                verified_tokens.set(digest, jwt_data,
+                                    tags=[f"user:{jwt_data.get('sub')}"], generation=generation, ttl=remaining)
+
+        g.jwt_claims = jwt_data
+        if not get_jwt_identity():
+            return jsonify({"status": "error", "message": "User not authenticated"}), 401
+
+        # 정상적인 access token인 경우
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _reject_unverified(token, digest):
+    """
+    검증에 실패한 토큰(없음, 만료, 서명 오류 등)의 401 응답.
+    결과가 확정된 경우에만 거부 캐시에 남기고, refresh token 조회가 실패하면 503 을 반환한다.
+    """
+    if not token:
+        return jsonify({"status": "error", "message": "Token is missing"}), 401
+
+    # 만료된 access token 처리
+    try:
+        decoded_token = decode_token(token, allow_expired=True)
+    except (JWTExtendedException, jwt.InvalidTokenError) as e:
+        return _reject(digest, {"status": "error", "message": str(e)})
+    user_id = decoded_token.get('sub')
 
-        except Exception as e:
-            # 만료된 access token 처리
-            expired_token = request.headers.get('Authorization', '').replace('Bearer ', '')
-            if not expired_token:
-                return jsonify({"status": "error", "message": "Token is missing"}), 401
+    if not user_id:
+        return _reject(digest, {"status": "error", "message": "Invalid token: user ID not found"})
 
-            try:
-                decoded_token = decode_token(expired_token, allow_expired=True)
-                user_id = decoded_token.get('sub')
-
-                if not user_id:
-                    return jsonify({"status": "error", "message": "Invalid token: user ID not found"}), 401
-
-                # Refresh token 확인
-                connection = get_db_connection()
-                cursor = connection.cursor()
-                try:
-                    cursor.execute("SELECT token FROM RefreshTokens WHERE user_id = %s", (user_id,))
-                    refresh_token_entry = cursor.fetchone()
-                finally:
-                    cursor.close()
-                    connection.close()
-
-                if not refresh_token_entry:
-                    return jsonify({
-                        "status": "error",
-                        "message": "Refresh token not found. Please re-authenticate."
-                    }), 401
-
-                # 클라이언트에게 refresh token으로 새 access token 발급 요청 안내
-                return jsonify({
-                    "status": "error",
-                    "message": "Access token expired. Use the provided refresh token to obtain a new access token.",
-                    "refresh_token": refresh_token_entry[0]
-                }), 401
-
-            except Exception as inner_e:
-                return jsonify({"status": "error", "message": str(inner_e)}), 401
-
-    return wrapper
\ No newline at end of file
+    # Refresh token 확인 (원문은 저장하지 않으므로 존재 여부만 확인)
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM RefreshTokens WHERE user_id = %s AND token_hash IS NOT NULL", (user_id,))
+            refresh_token_entry = cursor.fetchone()
+        finally:
+            cursor.close()
+            connection.close()
+    except Exception as e:
+        print(f"refresh token 확인 실패: {e}")
+        return jsonify({"status": "error", "message": "Unable to verify token at this time."}), 503
+
+    if not refresh_token_entry:
+        return _reject(digest, {
+            "status": "error",
+            "message": "Refresh token not found. Please re-authenticate."
+        }, user_id)
+
+    # 클라이언트에게 refresh token으로 새 access token 발급 요청 안내
+    return _reject(digest, {
+        "status": "error",
+        "message": "Access token expired. Use your refresh token at /auth/refresh to obtain a new access token."
+    }, user_id)
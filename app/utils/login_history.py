@@ -0,0 +1,184 @@
+"""
+로그인 기록 write-behind 저장.
+
+로그인 요청마다 LoginHistory 에 INSERT 하는 대신 워커 메모리에 (user_id, 로그인 시각)을 모아 두고,
+주기적으로 multi-row INSERT 한 번으로 기록한다. 프로세스 종료 시에도 남은 기록을 저장한다.
+최근 로그인 시각은 Users.last_login 에 로그인 요청에서 바로 기록하므로 /auth/info 는 이 테이블을 읽지 않는다.
+
+보관 기간(LOGIN_HISTORY_RETENTION_DAYS)이 지난 기록은 주기적으로 나누어 삭제하여 테이블 크기를 일정하게 유지한다.
+(LoginHistory 는 Users 를 참조하는 외래 키가 있어 MySQL 파티션을 쓸 수 없으므로 login_time 인덱스로 범위 삭제한다)
+
+사용 예:
+    python -m app.utils.login_history prune   # 보관 기간이 지난 기록 삭제 (cron 등에서 실행)
+"""
+import argparse
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+
+import pymysql
+from dotenv import load_dotenv
+
+from app.utils.DB_Utils import get_db_connection
+
+load_dotenv()
+
+LOGIN_HISTORY_FLUSH_INTERVAL = float(os.getenv('LOGIN_HISTORY_FLUSH_INTERVAL', 5))  # 로그인 기록 저장 주기(초)
+LOGIN_HISTORY_MAX_PENDING = int(os.getenv('LOGIN_HISTORY_MAX_PENDING', 10000))  # 저장 대기 기록 상한 (넘으면 버림)
+LOGIN_HISTORY_RETENTION_DAYS = int(os.getenv('LOGIN_HISTORY_RETENTION_DAYS', 90))  # 로그인 기록 보관 기간(일)
+LOGIN_HISTORY_FLUSH_BATCH = 1000  # INSERT 한 번에 기록할 최대 행 수
+LOGIN_HISTORY_PRUNE_BATCH = 10000  # DELETE 한 번에 삭제할 최대 행 수
+LOGIN_HISTORY_PRUNE_INTERVAL = 3600  # 보관 기간 정리 주기(초)
+
+
+class LoginHistoryWriter:
+    """
+    로그인 기록을 모아 주기적으로 DB 에 저장하고, 보관 기간이 지난 기록을 정리한다.
+
+    Args:
+        interval (float): 저장 주기(초). 프로세스가 비정상 종료되면 이 시간만큼의 기록을 잃을 수 있다.
+        max_pending (int): 저장 대기 기록 상한. DB 장애가 길어져도 메모리가 계속 늘지 않도록 넘는 기록은 버린다.
+        retention_days (int): 보관 기간(일)
+    """
+
+    def __init__(self, interval=LOGIN_HISTORY_FLUSH_INTERVAL, max_pending=LOGIN_HISTORY_MAX_PENDING,
+                 retention_days=LOGIN_HISTORY_RETENTION_DAYS):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = []  # (user_id, login_time)
+        self._dropped = 0
+        self._thread = None
+        self._pid = None
+
+    def append(self, user_id, login_time=None):
+        """로그인 기록을 저장 대기열에 추가한다."""
+        login_time = login_time or datetime.now().replace(microsecond=0)
+        with self._lock:
+            self._start()
+            if len(self._pending) >= self.max_pending:
+                self._dropped += 1
+                return
+            self._pending.append((user_id, login_time))
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        if self._pid is not None and self._pid != os.getpid():
+            # fork 이전 프로세스의 기록은 부모가 저장한다
+            self._pending = []
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='login-history-flush', daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """모아 둔 기록을 DB 에 저장한다. 실패하면 기록을 되돌려 다음 주기에 다시 시도한다."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                print(f"로그인 기록 대기열이 가득 차 {dropped}건을 저장하지 못했습니다.")
+            if not rows:
+                return
+
+            connection = get_db_connection()
+            cursor = connection.cursor()
+            try:
+                for start in range(0, len(rows), LOGIN_HISTORY_FLUSH_BATCH):
+                    self._insert(cursor, rows[start:start + LOGIN_HISTORY_FLUSH_BATCH])
+                connection.commit()
+            except Exception:
+                # 트랜잭션은 커넥션을 풀에 반환할 때 rollback 된다
+                with self._lock:
+                    self._pending = rows + self._pending
+                raise
+            finally:
+                cursor.close()
+                connection.close()
+
+    @staticmethod
+    def _insert(cursor, rows):
+        values = ', '.join(['(%s, %s)'] * len(rows))
+        try:
+            cursor.execute(f"INSERT INTO LoginHistory (user_id, login_time) VALUES {values}",
+                           [value for row in rows for value in row])
+        except pymysql.IntegrityError:
+            # 저장 전에 탈퇴한 사용자가 섞인 경우: 한 행씩 기록하고 해당 행만 버린다
+            for row in rows:
+                try:
+                    cursor.execute("INSERT INTO LoginHistory (user_id, login_time) VALUES (%s, %s)", row)
+                except pymysql.IntegrityError:
+                    pass
+
+    def prune(self, days=None):
+        """
+        보관 기간이 지난 기록을 LOGIN_HISTORY_PRUNE_BATCH 행씩 나누어 삭제한다. (잠금 시간을 짧게 유지)
+
+        Returns:
+            int: 삭제한 행 수
+        """
+        days = self.retention_days if days is None else days
+        deleted = 0
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            while True:
+                cursor.execute(
+                    "DELETE FROM LoginHistory WHERE login_time < NOW() - INTERVAL %s DAY LIMIT %s",
+                    (days, LOGIN_HISTORY_PRUNE_BATCH)
+                )
+                connection.commit()
+                deleted += cursor.rowcount
+                if cursor.rowcount < LOGIN_HISTORY_PRUNE_BATCH:
+                    return deleted
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _run(self):
+        last_prune = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"로그인 기록 저장 실패 (다음 주기에 재시도): {e}")
+            try:
+                if time.monotonic() - last_prune > LOGIN_HISTORY_PRUNE_INTERVAL:
+                    last_prune = time.monotonic()
+                    self.prune()
+            except Exception as e:
+                print(f"로그인 기록 정리 실패: {e}")
+
+
+login_history = LoginHistoryWriter()
+
+
+def _flush_at_exit():
+    try:
+        login_history.flush()
+    except Exception as e:
+        print(f"종료 시 로그인 기록 저장 실패: {e}")
+
+
+atexit.register(_flush_at_exit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로그인 기록 관리')
+    commands = parser.add_subparsers(dest='command', required=True)
+    prune = commands.add_parser('prune', help='보관 기간이 지난 로그인 기록 삭제')
+    prune.add_argument('--days', type=int, default=LOGIN_HISTORY_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    if args.command == 'prune':
+        print(f"삭제 완료: {login_history.prune(args.days)}행")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,489 @@
+"""
+버전 기반 스키마 마이그레이션 및 쿼리 실행 계획 검사 도구.
+
+사용법:
+    python -m app.utils.migrations migrate   # 적용되지 않은 마이그레이션 실행 (배포 시)
+    python -m app.utils.migrations status    # 적용 현황 출력
+    python -m app.utils.migrations check     # routes 의 SQL 을 EXPLAIN 하여 full scan 검사
+"""
+import ast
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import pymysql
+
+from app.utils.DB_Utils import get_db_connection
+
+# 마이그레이션 단계 정의
+# - str: 그대로 실행되는 DDL
+# - Index: 같은 이름의 인덱스가 없을 때만 생성
+# - Column: 같은 이름의 컬럼이 없을 때만 추가
+# - DropIndex: 인덱스가 있을 때만 삭제
+# - DropColumn: 컬럼이 있을 때만 삭제
+Index = namedtuple('Index', 'table name columns unique', defaults=(False,))
+Column = namedtuple('Column', 'table name definition')
+DropIndex = namedtuple('DropIndex', 'table name')
+DropColumn = namedtuple('DropColumn', 'table name')
+Migration = namedtuple('Migration', 'version name steps')
+
+
+MIGRATIONS = [
+    Migration(1, 'create_tables', [
+        """
+        CREATE TABLE IF NOT EXISTS Users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_users_email (email)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Locations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            region VARCHAR(50) NOT NULL,
+            district VARCHAR(50) NOT NULL,
+            UNIQUE KEY uq_locations_region_district (region, district)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Tags (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            UNIQUE KEY uq_tags_name (name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Companies (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            location_id INT NULL,
+            link VARCHAR(512) NULL,
+            FOREIGN KEY (location_id) REFERENCES Locations (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Jobs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            company_id INT NOT NULL,
+            location_id INT NOT NULL,
+            career VARCHAR(100) NULL,
+            education VARCHAR(100) NULL,
+            employment VARCHAR(100) NULL,
+            salary VARCHAR(100) NULL,
+            register_date DATE NULL,
+            deadline DATE NULL,
+            link VARCHAR(512) NULL,
+            views INT NOT NULL DEFAULT 0,
+            FOREIGN KEY (company_id) REFERENCES Companies (id),
+            FOREIGN KEY (location_id) REFERENCES Locations (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS JobTags (
+            job_id INT NOT NULL,
+            tag_id INT NOT NULL,
+            PRIMARY KEY (job_id, tag_id),
+            FOREIGN KEY (job_id) REFERENCES Jobs (id),
+            FOREIGN KEY (tag_id) REFERENCES Tags (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Resumes (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            content TEXT NOT NULL,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES Users (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Applications (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            job_id INT NOT NULL,
+            resume_id INT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES Users (id),
+            FOREIGN KEY (job_id) REFERENCES Jobs (id),
+            FOREIGN KEY (resume_id) REFERENCES Resumes (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Favorites (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            job_id INT NOT NULL,
+            favorited_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES Users (id),
+            FOREIGN KEY (job_id) REFERENCES Jobs (id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS RefreshTokens (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            token VARCHAR(512) NULL,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_refresh_tokens_user (user_id),
+            FOREIGN KEY (user_id) REFERENCES Users (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS LoginHistory (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            login_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES Users (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+    ]),
+    Migration(2, 'add_query_indexes', [
+        # /jobs/sort
+        Index('Jobs', 'idx_jobs_deadline', ('deadline', 'id')),
+        # insert_company, create_job, update_job 의 회사명 조회
+        Index('Companies', 'idx_companies_name', ('name',)),
+        # /bookmarks 목록, 북마크 토글
+        Index('Favorites', 'idx_favorites_user_favorited', ('user_id', 'favorited_at')),
+        Index('Favorites', 'idx_favorites_user_job', ('user_id', 'job_id')),
+        # /applications 목록, 중복 지원 확인
+        Index('Applications', 'idx_applications_user_applied', ('user_id', 'applied_at')),
+        Index('Applications', 'idx_applications_user_job', ('user_id', 'job_id')),
+        # /jobs/filter 의 태그 조건
+        Index('JobTags', 'idx_job_tags_tag_job', ('tag_id', 'job_id')),
+        # /resumes 목록
+        Index('Resumes', 'idx_resumes_user_updated', ('user_id', 'updated_at')),
+        # /auth/refresh
+        Index('RefreshTokens', 'idx_refresh_tokens_token', ('token',)),
+        # 사용자별 로그인 기록
+        Index('LoginHistory', 'idx_login_history_user_time', ('user_id', 'login_time')),
+    ]),
+    Migration(3, 'create_reference_versions', [
+        # 워커 간 메모리 캐시 동기화용 버전 카운터 (app/utils/versions.py)
+        """
+        CREATE TABLE IF NOT EXISTS ReferenceVersions (
+            name VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        "INSERT IGNORE INTO ReferenceVersions (name, version) VALUES ('locations', 1), ('tags', 1)",
+    ]),
+    Migration(4, 'create_change_log', [
+        # 행 단위 변경 기록 (공고 검색 색인 등 워커별 메모리 색인 갱신용)
+        """
+        CREATE TABLE IF NOT EXISTS ChangeLog (
+            name VARCHAR(50) NOT NULL,
+            version BIGINT NOT NULL,
+            entity_id BIGINT NOT NULL,
+            changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (name, version),
+            KEY idx_change_log_changed_at (changed_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        "INSERT IGNORE INTO ReferenceVersions (name, version) VALUES ('jobs', 0)",
+    ]),
+    Migration(5, 'add_jobs_rec_idx', [
+        # 크롤링 공고의 사람인 rec_idx (재적재 시 upsert 키) 와 내용 해시 (app/Crawling/bulk_loader.py)
+        Column('Jobs', 'rec_idx', 'BIGINT NULL'),
+        Column('Jobs', 'content_hash', 'CHAR(64) NULL'),
+        # 기존 공고의 링크에서 rec_idx 채우기. 이전 적재로 중복된 공고는 가장 먼저 들어온 행에만 채운다
+        """
+        UPDATE Jobs j
+        JOIN (
+            SELECT MIN(id) AS id, CAST(SUBSTRING(REGEXP_SUBSTR(link, 'rec_idx=[0-9]+'), 9) AS UNSIGNED) AS parsed_rec_idx
+            FROM Jobs
+            WHERE link LIKE '%rec_idx=%'
+            GROUP BY parsed_rec_idx
+        ) first_job ON first_job.id = j.id
+        SET j.rec_idx = first_job.parsed_rec_idx
+        WHERE j.rec_idx IS NULL
+        """,
+        Index('Jobs', 'uq_jobs_rec_idx', ('rec_idx',), unique=True),
+    ]),
+    Migration(6, 'hash_refresh_tokens', [
+        # refresh token 원문 대신 고정 길이 sha256 을 저장하고 unique 인덱스로 조회 (app/routes/auth.py)
+        Column('RefreshTokens', 'token_hash', 'CHAR(64) CHARACTER SET ascii NULL'),
+        "UPDATE RefreshTokens SET token_hash = SHA2(token, 256) WHERE token IS NOT NULL AND token_hash IS NULL",
+        Index('RefreshTokens', 'uq_refresh_tokens_token_hash', ('token_hash',), unique=True),
+        DropIndex('RefreshTokens', 'idx_refresh_tokens_token'),
+        DropColumn('RefreshTokens', 'token'),
+    ]),
+    Migration(7, 'add_users_last_login', [
+        # /auth/info 의 최근 로그인 시각을 LoginHistory 대신 Users 에서 읽는다 (app/utils/login_history.py)
+        Column('Users', 'last_login', 'DATETIME NULL'),
+        """
+        UPDATE Users u
+        JOIN (SELECT user_id, MAX(login_time) AS login_time FROM LoginHistory GROUP BY user_id) h ON h.user_id = u.id
+        SET u.last_login = h.login_time, u.updated_at = u.updated_at
+        WHERE u.last_login IS NULL
+        """,
+        # 보관 기간이 지난 로그인 기록 삭제
+        Index('LoginHistory', 'idx_login_history_login_time', ('login_time',)),
+    ]),
+    Migration(8, 'create_revoked_tokens', [
+        # 로그아웃으로 폐기한 access token (app/utils/revocation.py)
+        # jti 가 있으면 토큰 하나, issued_before 가 있으면 그 시각(epoch) 이전에 발급된 사용자의 토큰 전체
+        """
+        CREATE TABLE IF NOT EXISTS RevokedTokens (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            jti VARCHAR(64) CHARACTER SET ascii NULL,
+            issued_before BIGINT NULL,
+            expires_at BIGINT NOT NULL,
+            revoked_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_revoked_tokens_jti (jti),
+            KEY idx_revoked_tokens_expires_at (expires_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        "INSERT IGNORE INTO ReferenceVersions (name, version) VALUES ('revoked_tokens', 0)",
+    ]),
+]
+
+
+def _ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaMigrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def _index_exists(cursor, table, name):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, name))
+    return cursor.fetchone() is not None
+
+
+def _column_exists(cursor, table, name):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+    """, (table, name))
+    return cursor.fetchone() is not None
+
+
+def _apply_step(cursor, step):
+    if isinstance(step, Index):
+        if not _index_exists(cursor, step.table, step.name):
+            unique = 'UNIQUE ' if step.unique else ''
+            columns = ', '.join(step.columns)
+            cursor.execute(f"CREATE {unique}INDEX {step.name} ON {step.table} ({columns})")
+    elif isinstance(step, Column):
+        if not _column_exists(cursor, step.table, step.name):
+            cursor.execute(f"ALTER TABLE {step.table} ADD COLUMN {step.name} {step.definition}")
+    elif isinstance(step, DropIndex):
+        if _index_exists(cursor, step.table, step.name):
+            cursor.execute(f"DROP INDEX {step.name} ON {step.table}")
+    elif isinstance(step, DropColumn):
+        if _column_exists(cursor, step.table, step.name):
+            cursor.execute(f"ALTER TABLE {step.table} DROP COLUMN {step.name}")
+    else:
+        cursor.execute(step)
+
+
+def applied_versions(cursor):
+    _ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM SchemaMigrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migrations():
+    """
+    적용되지 않은 마이그레이션을 버전 순서대로 실행한다.
+    각 단계는 이미 반영된 경우 건너뛰므로 여러 번 실행해도 안전하다.
+
+    Returns:
+        list: 이번에 적용된 마이그레이션 버전 목록
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    applied = []
+    try:
+        # 여러 서버가 동시에 배포되어도 한 곳에서만 실행되도록 잠금
+        cursor.execute("SELECT GET_LOCK('schema_migrations', 60)")
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError("Could not acquire the schema migration lock")
+
+        try:
+            done = applied_versions(cursor)
+            for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+                if migration.version in done:
+                    continue
+
+                print(f"마이그레이션 적용 중: {migration.version:04d}_{migration.name}")
+                for step in migration.steps:
+                    _apply_step(cursor, step)
+                cursor.execute(
+                    "INSERT INTO SchemaMigrations (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name)
+                )
+                connection.commit()
+                applied.append(migration.version)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK('schema_migrations')")
+            cursor.fetchone()
+    finally:
+        cursor.close()
+        connection.close()
+
+    if not applied:
+        print("적용할 마이그레이션이 없습니다.")
+    return applied
+
+
+def migration_status():
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        done = applied_versions(cursor)
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+    return [(m.version, m.name, m.version in done) for m in sorted(MIGRATIONS, key=lambda m: m.version)]
+
+
+# ---------------------------------------------------------------------------
+# 쿼리 실행 계획 검사
+# ---------------------------------------------------------------------------
+
+ROUTES_DIR = Path(__file__).resolve().parent.parent / 'routes'
+
+# 전체를 메모리에 올리는 작은 참조 테이블은 full scan 을 허용
+ALLOWED_FULL_SCAN_TABLES = {'Locations', 'Tags'}
+
+# f-string 안의 표현식을 EXPLAIN 용 값으로 치환 (알 수 없는 표현식이 있으면 검사 제외)
+FSTRING_SAMPLES = {
+    "order.upper()": "ASC",
+    "keyset": "",  # cursor 조건이 없는 첫 페이지 기준
+    "placeholders": "%s",  # IN (...) 목록은 값 하나 기준
+}
+
+_EXPLAINABLE = re.compile(r'^\s*(SELECT\b.*\bFROM|UPDATE\b.*\bSET|DELETE\s+FROM)\b', re.IGNORECASE | re.DOTALL)
+
+
+def _render_sql(node):
+    """AST 노드에서 SQL 문자열을 복원한다. 복원할 수 없으면 None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value)
+            else:
+                sample = FSTRING_SAMPLES.get(ast.unparse(value.value))
+                if sample is None:
+                    return None
+                parts.append(sample)
+        return ''.join(parts)
+    return None
+
+
+def collect_route_queries(routes_dir=ROUTES_DIR):
+    """
+    routes 모듈에서 SQL 문자열을 수집한다.
+
+    Returns:
+        list: (위치, SQL) 튜플 목록
+    """
+    queries = []
+    for path in sorted(Path(routes_dir).glob('*.py')):
+        tree = ast.parse(path.read_text(encoding='utf-8'))
+        # f-string 내부의 문자열 조각은 f-string 전체로만 검사
+        fragments = {id(value) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr) for value in node.values}
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.Constant, ast.JoinedStr)) or id(node) in fragments:
+                continue
+            sql = _render_sql(node)
+            location = f"{path.name}:{node.lineno}"
+            if sql is None and isinstance(node, ast.JoinedStr):
+                text = ''.join(v.value if isinstance(v, ast.Constant) else '?' for v in node.values)
+                if _EXPLAINABLE.match(text):
+                    print(f"[skip] {location}: f-string with unknown expressions")
+            elif sql and _EXPLAINABLE.match(sql):
+                sql = re.sub(r'--[^\n]*', '', sql)  # 한 줄로 합치기 전에 SQL 주석 제거
+                queries.append((location, ' '.join(sql.split())))
+    return sorted(set(queries), key=lambda q: q[0])
+
+
+def _explainable_sql(sql):
+    # LIMIT/OFFSET 은 숫자, 나머지 파라미터는 문자열 값으로 치환
+    sql = re.sub(r'LIMIT %s OFFSET %s', 'LIMIT 20 OFFSET 0', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'LIMIT %s', 'LIMIT 20', sql, flags=re.IGNORECASE)
+    return sql.replace('%s', "'1'")
+
+
+def check_query_plans(routes_dir=ROUTES_DIR):
+    """
+    routes 의 SQL 을 EXPLAIN 하여 인덱스 없이 테이블 전체를 읽는 쿼리를 찾는다.
+
+    Returns:
+        list: (위치, 테이블, SQL) 형태의 full scan 목록
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    full_scans = []
+    try:
+        for location, sql in collect_route_queries(routes_dir):
+            try:
+                cursor.execute("EXPLAIN " + _explainable_sql(sql))
+            except pymysql.MySQLError as e:
+                # 조건을 이어 붙여 완성하는 쿼리 조각 등은 건너뜀
+                print(f"[skip] {location}: {e.args[-1]}")
+                continue
+
+            for row in cursor.fetchall():
+                table = row.get('table') or ''
+                if row.get('type') == 'ALL' and table.split()[0] not in _allowed_aliases(sql):
+                    full_scans.append((location, table, sql))
+                    print(f"[full scan] {location} table={table} rows={row.get('rows')}\n    {sql}")
+    finally:
+        connection.rollback()
+        cursor.close()
+        connection.close()
+
+    print(f"검사 완료: full scan {len(full_scans)}건")
+    return full_scans
+
+
+def _allowed_aliases(sql):
+    # EXPLAIN 결과의 table 컬럼은 alias 로 표시되므로 허용 테이블의 alias 도 함께 허용
+    allowed = set(ALLOWED_FULL_SCAN_TABLES)
+    for table in ALLOWED_FULL_SCAN_TABLES:
+        for alias in re.findall(rf'\b{table}\s+(?:AS\s+)?(\w+)', sql, flags=re.IGNORECASE):
+            allowed.add(alias)
+    return allowed
+
+
+def main(argv=None):
+    command = (argv or sys.argv[1:] or ['migrate'])[0]
+
+    if command == 'migrate':
+        apply_migrations()
+    elif command == 'status':
+        for version, name, done in migration_status():
+            print(f"{'[x]' if done else '[ ]'} {version:04d}_{name}")
+    elif command == 'check':
+        if check_query_plans():
+            sys.exit(1)
+    else:
+        print(__doc__)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
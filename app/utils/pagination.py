@@ -0,0 +1,87 @@
+"""
+목록 API 의 keyset(cursor) 페이지네이션 도구.
+
+cursor 는 직전 페이지 마지막 행의 정렬 키와 id 를 base64 로 감싼 문자열이며,
+클라이언트는 응답의 pagination.next_cursor 를 그대로 다음 요청의 cursor 로 보낸다.
+cursor 가 없으면 기존 page/offset 방식으로 동작한다.
+"""
+import base64
+import json
+import math
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    """정렬 키 값들을 cursor 문자열로 만든다. (date/datetime 은 'YYYY-MM-DD HH:MM:SS' 문자열로 저장)"""
+    raw = json.dumps(list(values), default=str, separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    """
+    cursor 문자열을 정렬 키 값 목록으로 되돌린다.
+
+    Args:
+        token (str): 클라이언트가 보낸 cursor
+        size (int): 기대하는 값의 개수
+
+    Returns:
+        list: 정렬 키 값 목록
+
+    Raises:
+        InvalidCursor: 형식이 잘못되었거나 값의 개수/타입(str, int, float, None)이 맞지 않는 경우
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size or not all(map(_is_key_value, values)):
+        raise InvalidCursor("Invalid cursor.")
+    return values
+
+
+def _is_key_value(value):
+    # 정렬 키는 문자열/숫자/NULL 만 가능하다 (객체, 배열, bool, NaN 등은 SQL 파라미터나 비교에서 500 이 된다)
+    if value is None or isinstance(value, str):
+        return True
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    return isinstance(value, float) and math.isfinite(value)
+
+
+def next_cursor(rows, page_size, *keys):
+    """페이지가 가득 찼으면 마지막 행의 keys 값으로 다음 cursor 를 만든다. 마지막 페이지면 None."""
+    if not rows or len(rows) < page_size:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(last[key] for key in keys))
+
+
+def after_id(id_column, last_id, descending=False):
+    """id 하나로 정렬하는 목록의 cursor 조건."""
+    return f"{id_column} {'<' if descending else '>'} %s", [last_id]
+
+
+def after_key(column, id_column, last_value, last_id, descending=False):
+    """
+    (column, id) 로 정렬하는 목록에서 cursor 이후 행을 고르는 조건.
+    MySQL 은 NULL 을 ASC 에서 가장 앞, DESC 에서 가장 뒤에 두므로 그에 맞춰 처리한다.
+
+    Returns:
+        tuple: (SQL 조건, 파라미터 목록)
+    """
+    if not descending:
+        if last_value is None:
+            return f"(({column} IS NULL AND {id_column} > %s) OR {column} IS NOT NULL)", [last_id]
+        return f"({column} > %s OR ({column} = %s AND {id_column} > %s))", [last_value, last_value, last_id]
+
+    if last_value is None:
+        return f"({column} IS NULL AND {id_column} < %s)", [last_id]
+    return (f"({column} < %s OR ({column} = %s AND {id_column} < %s) OR {column} IS NULL)",
+            [last_value, last_value, last_id])
@@ -0,0 +1,153 @@
+"""
+비밀번호 해시.
+
+scrypt(메모리를 많이 쓰는 해시)로 저장하며, 해시/검증은 크기가 정해진 스레드 풀에서 실행한다.
+hashlib.scrypt 는 계산 중 GIL 을 놓으므로 여러 요청의 해시가 코어 수만큼 병렬로 진행되고,
+동시에 계산하는 해시 수(= 메모리 사용량)는 풀 크기로 제한된다. 대기 중인 작업이 너무 많으면
+PasswordHasherBusy 를 던져 요청 스레드가 무한정 쌓이지 않게 한다.
+
+저장 형식: scrypt$<n>$<r>$<p>$<salt base64>$<hash base64>
+비용 설정(PASSWORD_SCRYPT_*)이 바뀌었거나 예전 base64 형식이면 verify 가 needs_rehash 를 알려주어
+로그인 성공 시 새 설정으로 다시 저장한다.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PASSWORD_SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', 2 ** 14))  # CPU/메모리 비용 (2의 거듭제곱)
+PASSWORD_SCRYPT_R = int(os.getenv('PASSWORD_SCRYPT_R', 8))        # 블록 크기 (메모리 = 128 * n * r 바이트)
+PASSWORD_SCRYPT_P = int(os.getenv('PASSWORD_SCRYPT_P', 1))        # 병렬도
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))  # 동시에 계산할 해시 수
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))  # 계산 중 + 대기 중 작업 상한
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))  # 결과 대기 시간(초)
+
+SCHEME = 'scrypt'
+SALT_BYTES = 16
+HASH_BYTES = 32
+MAX_SCRYPT_MEMORY = 1024 * 1024 * 1024  # 저장된 해시의 비용 설정으로 허용할 최대 메모리 (잘못된 값으로 인한 과다 할당 방지)
+
+
+class PasswordHasherBusy(Exception):
+    """대기 중인 해시 작업이 너무 많은 경우 (503 으로 응답)"""
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES)
+
+
+def _b64(data):
+    return base64.b64encode(data).decode()
+
+
+class PasswordHasher:
+    """
+    scrypt 비밀번호 해시/검증기.
+
+    Args:
+        n, r, p (int): scrypt 비용 설정. 로그인 한 번의 CPU 시간/메모리를 정한다 (bench_passwords 로 측정)
+        workers (int): 해시를 계산하는 스레드 수
+        max_pending (int): 계산 중 + 대기 중 작업 상한
+    """
+
+    def __init__(self, n=PASSWORD_SCRYPT_N, r=PASSWORD_SCRYPT_R, p=PASSWORD_SCRYPT_P,
+                 workers=PASSWORD_HASH_WORKERS, max_pending=PASSWORD_HASH_MAX_PENDING):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.workers = workers
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pid = None
+        # 없는 이메일로 로그인해도 같은 시간이 걸리도록 비교할 해시
+        self._dummy_hash = None
+
+    def _submit(self, func, *args):
+        # fork 된 워커에서는 부모의 스레드 풀을 쓸 수 없으므로 프로세스마다 새로 만든다
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                self._pid = os.getpid()
+            executor = self._executor
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Too many password hashing requests in progress.")
+        try:
+            future = executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+        except FutureTimeoutError as e:
+            # 대기열에서 오래 기다린 작업은 취소한다 (이미 계산 중이면 끝날 때 슬롯이 반환된다)
+            future.cancel()
+            raise PasswordHasherBusy("Password hashing timed out.") from e
+
+    def _hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        digest = _scrypt(password, salt, self.n, self.r, self.p)
+        return f"{SCHEME}${self.n}${self.r}${self.p}${_b64(salt)}${_b64(digest)}"
+
+    def _verify(self, password, stored):
+        if not stored.startswith(SCHEME + '$'):
+            # 예전 형식: base64 로만 인코딩된 비밀번호
+            # 응답 시간으로 아직 변환되지 않은 계정을 구분할 수 없도록 같은 비용의 계산을 한다
+            _scrypt(password, b'\0' * SALT_BYTES, self.n, self.r, self.p)
+            legacy = base64.b64encode(password.encode()).decode()
+            return hmac.compare_digest(legacy.encode(), stored.encode()), True
+
+        try:
+            _, n, r, p, salt, expected = stored.split('$')
+            n, r, p = int(n), int(r), int(p)
+            salt, expected = base64.b64decode(salt), base64.b64decode(expected)
+            if n < 2 or n & (n - 1) or r < 1 or p < 1 or 128 * n * r > MAX_SCRYPT_MEMORY:
+                raise ValueError(f"scrypt 비용 설정이 올바르지 않습니다: n={n}, r={r}, p={p}")
+            digest = _scrypt(password, salt, n, r, p)
+        except (ValueError, MemoryError):
+            # 손상된 해시: 실패로 처리하되 다른 계정과 같은 시간이 걸리도록 현재 설정으로 계산한다
+            _scrypt(password, b'\0' * SALT_BYTES, self.n, self.r, self.p)
+            return False, False
+        ok = hmac.compare_digest(digest, expected)
+        return ok, ok and (n, r, p) != (self.n, self.r, self.p)
+
+    def hash(self, password):
+        """
+        비밀번호를 해시한다.
+
+        Returns:
+            str: 저장용 해시 문자열
+
+        Raises:
+            PasswordHasherBusy: 대기 중인 작업이 너무 많은 경우
+        """
+        return self._submit(self._hash, password)
+
+    def verify(self, password, stored):
+        """
+        비밀번호를 저장된 해시와 비교한다. stored 가 None 이면(없는 사용자) 같은 비용의 계산만 하고 실패한다.
+
+        Returns:
+            tuple: (일치 여부, 새 설정으로 다시 저장해야 하는지)
+
+        Raises:
+            PasswordHasherBusy: 대기 중인 작업이 너무 많은 경우
+        """
+        if stored is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = self.hash(os.urandom(16).hex())
+            self._submit(self._verify, password, self._dummy_hash)
+            return False, False
+        return self._submit(self._verify, password, stored)
+
+
+password_hasher = PasswordHasher()
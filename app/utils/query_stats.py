@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+from flask import g, has_request_context, request
+
+load_dotenv()
+
+# SQL 계측 설정 (.env 로 조정 가능)
+ENABLED = os.getenv('DB_QUERY_STATS', 'false').lower() in ('1', 'true', 'yes', 'on')
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))   # 이 시간(ms) 이상 걸린 쿼리는 slow query log 에 기록
+SLOW_QUERY_LOG = os.getenv('DB_SLOW_QUERY_LOG')             # 지정하면 slow query log 를 파일로도 기록
+
+request_logger = logging.getLogger('app.db.requests')
+slow_logger = logging.getLogger('app.db.slow')
+
+
+class RequestStats:
+    """한 요청 동안 실행된 쿼리의 누적 통계."""
+
+    __slots__ = ('queries', 'rows', 'elapsed')
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.elapsed = 0.0
+
+    def as_dict(self):
+        return {"queries": self.queries, "rows": self.rows, "db_ms": round(self.elapsed * 1000, 2)}
+
+
+def _normalize(query):
+    return ' '.join(query.split()) if isinstance(query, str) else repr(query)
+
+
+def _param_count(args):
+    if args is None:
+        return 0
+    if isinstance(args, (list, tuple, dict)):
+        return len(args)
+    return 1
+
+
+def record(query, args, rows, elapsed):
+    """
+    쿼리 1건의 실행 결과를 요청 통계와 slow query log 에 반영한다.
+
+    Args:
+        query (str): 파라미터가 바인딩되기 전의 SQL
+        args: 바인딩 파라미터
+        rows (int): 영향을 받거나 조회된 행 수
+        elapsed (float): 실행 시간(초)
+    """
+    endpoint = None
+    if has_request_context():
+        stats = g.get('_query_stats')
+        if stats is None:
+            stats = g._query_stats = RequestStats()
+        stats.queries += 1
+        stats.rows += max(rows, 0)
+        stats.elapsed += elapsed
+        endpoint = request.endpoint
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_logger.warning(json.dumps({
+            "event": "slow_query",
+            "endpoint": endpoint,
+            "statement": _normalize(query),
+            "params": _param_count(args),
+            "rows": rows,
+            "ms": round(elapsed_ms, 2),
+        }, ensure_ascii=False))
+
+
+class InstrumentedCursor:
+    """
+    pymysql 커서를 감싸 execute/executemany 의 실행 시간과 행 수를 기록한다.
+    그 밖의 속성/메서드(fetchall, lastrowid 등)는 원래 커서로 위임한다.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            record(query, args, self._cursor.rowcount, time.perf_counter() - started)
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            record(query, args, self._cursor.rowcount, time.perf_counter() - started)
+
+
+def wrap_cursor(cursor):
+    """계측이 켜져 있으면 커서를 InstrumentedCursor 로 감싼다."""
+    return InstrumentedCursor(cursor) if ENABLED else cursor
+
+
+def _add_stats_headers(response):
+    stats = g.get('_query_stats')
+    if stats is None:
+        return response
+
+    summary = stats.as_dict()
+    response.headers['X-DB-Query-Count'] = str(summary['queries'])
+    response.headers['Server-Timing'] = f"db;dur={summary['db_ms']};desc=\"{summary['queries']} queries\""
+
+    request_logger.info(json.dumps({
+        "event": "request_db_stats",
+        "endpoint": request.endpoint,
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        **summary,
+    }, ensure_ascii=False))
+    return response
+
+
+def init_app(app):
+    """요청별 쿼리 통계 헤더와 로그를 Flask 앱에 등록한다. 계측이 꺼져 있으면 아무것도 하지 않는다."""
+    if not ENABLED:
+        return
+
+    # 요청 로그는 표준 출력, slow query log 는 DB_SLOW_QUERY_LOG 파일 (미지정 시 표준 출력)
+    if not request_logger.handlers:
+        request_logger.addHandler(logging.StreamHandler(sys.stdout))
+    if not slow_logger.handlers:
+        slow_logger.addHandler(logging.FileHandler(SLOW_QUERY_LOG, encoding='utf-8') if SLOW_QUERY_LOG
+                               else logging.StreamHandler(sys.stdout))
+    for logger in (request_logger, slow_logger):
+        logger.setLevel(logging.INFO)
+
+    app.after_request(_add_stats_headers)
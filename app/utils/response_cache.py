@@ -0,0 +1,202 @@
+"""
+읽기 API 응답 캐시.
+
+GET 응답 본문을 (endpoint, 경로 인자, 정렬된 query string) 키로 보관하며 LRU/TTL 로 내보낸다.
+응답에는 본문 해시로 만든 ETag 를 붙이고, If-None-Match 가 일치하면 DB 조회 없이 304 를 반환한다.
+각 항목은 태그('jobs:list', 'job:<id>' 등)를 가지며 데이터를 변경한 쪽이 invalidate() 로
+해당 태그의 항목만 지운다. 다른 워커의 변경은 jobs 변경 피드(ChangeLog)로 전달받는다.
+조회수처럼 요청마다 바뀌는 값은 overlay 로 캐시된 본문 위에 덮어쓰며, 이때는 weak ETag 를 사용한다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from dotenv import load_dotenv
+from flask import jsonify, make_response, request
+
+from app.utils.versions import ChangeFeedIndex
+
+load_dotenv()
+
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))  # 워커당 최대 항목 수
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 30))     # 항목 유효 시간(초)
+RESPONSE_CACHE_RETRY_INTERVAL = 10  # 변경 피드 연결에 실패한 뒤 다시 시도하기까지의 시간(초)
+
+
+class TTLCache:
+    """
+    LRU + TTL 캐시. 각 항목에 태그를 달아 태그 단위로 지울 수 있다.
+
+    Args:
+        maxsize (int): 최대 항목 수. 넘으면 가장 오래 사용하지 않은 항목부터 제거
+        ttl (float): 항목 유효 시간(초)
+    """
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, tags, value)
+        self._tags = {}                # tag -> {key}
+        self.generation = 0            # invalidate 할 때마다 증가
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, tags=(), generation=None, ttl=None):
+        """
+        항목을 저장한다. generation 을 주면 그 이후 invalidate 가 있었을 때 저장하지 않는다.
+        (값을 만드는 동안 변경된 데이터가 캐시에 남지 않도록)
+        ttl 을 주면 이 항목만 기본 유효 시간 대신 ttl 초 동안 유지한다.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), tuple(tags), value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *tags):
+        """태그가 달린 항목을 모두 지운다."""
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def _not_modified(etag, weak=False):
+    response = make_response('', 304)
+    response.set_etag(etag, weak=weak)
+    return response
+
+
+class ResponseCache(ChangeFeedIndex):
+    """
+    jobs 읽기 API 응답 캐시.
+    다른 워커의 공고 변경은 jobs 변경 피드로 받아 해당 공고와 목록 캐시를 지운다.
+    """
+
+    feed = 'jobs'
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        super().__init__()
+        self.cache = TTLCache(maxsize, ttl)
+        self._failed_at = None  # 마지막으로 변경 피드 연결에 실패한 시각
+
+    def ensure_built(self):
+        """
+        변경 피드에 연결한다. DB 장애 중에는 요청마다 연결을 기다리지 않도록
+        실패 후 RESPONSE_CACHE_RETRY_INTERVAL 동안은 다시 시도하지 않는다. (그동안 항목은 TTL 로만 만료)
+        """
+        if self._failed_at is not None and time.monotonic() - self._failed_at < RESPONSE_CACHE_RETRY_INTERVAL:
+            return
+        try:
+            super().ensure_built()
+        except Exception:
+            self._failed_at = time.monotonic()
+            raise
+        self._failed_at = None
+
+    def _load_all(self, cursor):
+        # 변경 기록이 끊긴 경우: 어떤 공고가 바뀌었는지 모르므로 전부 비운다
+        self.cache.clear()
+
+    def _load_ids(self, cursor, ids):
+        self.invalidate_jobs(ids)
+
+    def invalidate(self, *tags):
+        self.cache.invalidate(*tags)
+
+    def invalidate_jobs(self, job_ids):
+        """공고 변경 시 목록 응답과 해당 공고의 상세 응답을 지운다."""
+        self.cache.invalidate('jobs:list', *(f'job:{job_id}' for job_id in job_ids))
+
+    def cached(self, tags, overlay=None):
+        """
+        GET view 의 응답을 캐시하는 decorator. 200 응답만 저장한다.
+
+        Args:
+            tags (callable): URL 경로 인자(request.view_args)를 받아 캐시 태그 목록을 반환하는 함수
+            overlay (callable): 캐시된 JSON 에 요청마다 바뀌는 값(조회수 등)을 덮어쓰는 함수.
+                overlay(data, **view_args) 형태로 호출되며, 이 경우 ETag 는 weak ETag 가 된다.
+        """
+        def build(body, status, mimetype, etag):
+            if overlay is None:
+                response = make_response(body, status)
+                response.mimetype = mimetype
+                response.set_etag(etag)
+                return response
+            data = json.loads(body)
+            overlay(data, **(request.view_args or {}))
+            response = make_response(jsonify(data), status)
+            response.set_etag(etag, weak=True)
+            return response
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    self.ensure_built()
+                except Exception as e:
+                    print(f"응답 캐시 변경 피드 연결 실패: {e}")
+
+                key = (
+                    request.endpoint,
+                    tuple(sorted((request.view_args or {}).items())),
+                    tuple(sorted(request.args.items(multi=True))),
+                )
+                entry = self.cache.get(key)
+                if entry is not None:
+                    if request.if_none_match.contains_weak(entry[3]):
+                        return _not_modified(entry[3], weak=overlay is not None)
+                    return build(*entry)
+
+                generation = self.cache.generation
+                response = make_response(func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+                entry = (response.get_data(), response.status_code, response.mimetype)
+                entry += (hashlib.sha1(entry[0]).hexdigest(),)
+                self.cache.set(key, entry, tags(**(request.view_args or {})), generation)
+                if request.if_none_match.contains_weak(entry[3]):
+                    return _not_modified(entry[3], weak=overlay is not None)
+                return build(*entry)
+            return wrapper
+        return decorator
+
+
+response_cache = ResponseCache()
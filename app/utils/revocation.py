@@ -0,0 +1,217 @@
+"""
+access token 폐기 목록.
+
+로그아웃한 토큰(jti)과 '이 시각 이전에 발급된 토큰 전체'(사용자별 기준 시각)를 RevokedTokens 에 저장하고,
+워커마다 메모리에 Bloom filter(jti)와 사용자별 기준 시각을 두어 요청마다 DB 를 조회하지 않고 확인한다.
+Bloom filter 는 오탐(폐기되지 않은 jti 를 폐기된 것으로 판단)만 있으므로 걸린 경우에만 DB 에서 확인한다.
+
+다른 워커의 폐기는 revoked_tokens 변경 피드(ChangeLog)로 전달받아 추가된 행만 읽는다. (VERSION_POLL_INTERVAL 이내 반영)
+토큰이 만료된 뒤에는 폐기 기록이 필요 없으므로 expires_at 이 지난 행은 삭제한다.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from app.utils.DB_Utils import get_db_connection
+from app.utils.versions import ChangeFeedIndex, record_change
+
+load_dotenv()
+
+REVOCATION_BLOOM_CAPACITY = int(os.getenv('REVOCATION_BLOOM_CAPACITY', 100000))  # Bloom filter 에 넣을 jti 수
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv('REVOCATION_BLOOM_ERROR_RATE', 0.001))  # 목표 오탐률
+REVOCATION_PRUNE_INTERVAL = 3600  # 만료된 폐기 기록 정리 주기(초)
+REVOCATION_PRUNE_BATCH = 10000  # DELETE 한 번에 삭제할 최대 행 수
+
+
+class BloomFilter:
+    """
+    문자열 집합의 Bloom filter. 없는 값을 있다고 판단할 수는 있지만(오탐) 있는 값을 놓치지는 않는다.
+
+    Args:
+        capacity (int): 넣을 항목 수. 넘으면 오탐률이 올라간다.
+        error_rate (float): capacity 만큼 넣었을 때의 오탐률
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)  # 비트 수
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # 128비트 해시 하나를 두 개로 나누어 k 개의 위치를 만든다 (double hashing)
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationIndex(ChangeFeedIndex):
+    """
+    워커 메모리의 토큰 폐기 목록.
+
+    Args:
+        capacity (int): Bloom filter 크기. 만료되지 않은 폐기 jti 가 이보다 많아지면 더 크게 다시 만든다.
+        error_rate (float): Bloom filter 목표 오탐률
+    """
+
+    feed = 'revoked_tokens'
+
+    def __init__(self, capacity=REVOCATION_BLOOM_CAPACITY, error_rate=REVOCATION_BLOOM_ERROR_RATE):
+        super().__init__()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._cutoffs = {}    # user_id(str) -> 이 시각(epoch) 이전에 발급된 토큰은 폐기
+        self._listeners = []  # callback(user_ids), 폐기 반영 후 호출 (None: 전체를 다시 읽은 경우)
+        self.lookups = 0      # Bloom filter 에 걸려 DB 에서 확인한 횟수
+        self.false_positives = 0
+
+    def on_revoke(self, callback):
+        """폐기가 반영된 뒤 callback(user_ids) 를 호출하도록 등록한다. (토큰 검증 캐시 삭제 등)"""
+        self._listeners.append(callback)
+
+    def _notify(self, user_ids):
+        for callback in self._listeners:
+            try:
+                callback(user_ids)
+            except Exception as e:
+                print(f"토큰 폐기 반영 후 처리 실패: {e}")
+
+    def _load_all(self, cursor):
+        cursor.execute("""
+            SELECT user_id, jti, issued_before FROM RevokedTokens WHERE expires_at > UNIX_TIMESTAMP()
+        """)
+        rows = cursor.fetchall()
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        cutoffs = {}
+        for row in rows:
+            self._add(row, bloom, cutoffs)
+        with self._lock:
+            self._bloom, self._cutoffs = bloom, cutoffs
+        self._notify(None)
+
+    def _load_ids(self, cursor, ids):
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(f"SELECT user_id, jti, issued_before FROM RevokedTokens WHERE id IN ({placeholders})", ids)
+        rows = cursor.fetchall()
+        with self._lock:
+            for row in rows:
+                self._add(row, self._bloom, self._cutoffs)
+            full = self._bloom.count > self._bloom.capacity
+        if full:
+            # 만료된 jti 를 빼고 더 큰 filter 로 다시 만든다
+            self.rebuild()
+        else:
+            self._notify({str(row['user_id']) for row in rows})
+
+    @staticmethod
+    def _add(row, bloom, cutoffs):
+        if row['jti'] is not None:
+            bloom.add(row['jti'])
+        if row['issued_before'] is not None:
+            user_id = str(row['user_id'])
+            cutoffs[user_id] = max(cutoffs.get(user_id, 0), row['issued_before'])
+
+    def is_revoked(self, jwt_data):
+        """
+        검증된 access token 의 claim 으로 폐기 여부를 확인한다.
+        사용자별 기준 시각은 메모리에서, jti 는 Bloom filter 에 걸린 경우에만 DB 에서 확인한다.
+
+        Returns:
+            bool: 폐기된 토큰이면 True
+        """
+        self.ensure_built()
+        if jwt_data.get('iat', 0) < self._cutoffs.get(str(jwt_data.get('sub')), 0):
+            return True
+
+        jti = jwt_data.get('jti')
+        if jti is None or jti not in self._bloom:
+            return False
+
+        self.lookups += 1
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM RevokedTokens WHERE jti = %s", (jti,))
+            revoked = cursor.fetchone() is not None
+        finally:
+            cursor.close()
+            connection.close()
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+
+revocation_index = RevocationIndex()
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def _prune_expired(cursor):
+    """만료된 토큰의 폐기 기록을 삭제한다. 워커마다 REVOCATION_PRUNE_INTERVAL 에 한 번, 폐기할 때 함께 수행한다."""
+    global _last_prune
+    with _prune_lock:
+        if time.monotonic() - _last_prune < REVOCATION_PRUNE_INTERVAL:
+            return
+        _last_prune = time.monotonic()
+    cursor.execute("DELETE FROM RevokedTokens WHERE expires_at < UNIX_TIMESTAMP() LIMIT %s", (REVOCATION_PRUNE_BATCH,))
+
+
+def revoke_token(cursor, user_id, jti, expires_at):
+    """
+    토큰 하나(jti)를 폐기한다. (commit 은 호출자가 수행, commit 후 revocation_index.refresh 로 이 워커에 반영)
+
+    Args:
+        expires_at (int): 토큰의 exp (epoch). 이후에는 기록을 삭제한다.
+
+    Returns:
+        int: RevokedTokens id (이미 폐기된 토큰이면 None)
+    """
+    _prune_expired(cursor)
+    cursor.execute(
+        "INSERT IGNORE INTO RevokedTokens (user_id, jti, expires_at) VALUES (%s, %s, %s)",
+        (user_id, jti, expires_at)
+    )
+    if cursor.rowcount != 1:
+        return None
+    revoked_id = cursor.lastrowid
+    record_change(cursor, RevocationIndex.feed, revoked_id)
+    return revoked_id
+
+
+def revoke_user_tokens(cursor, user_id, lifetime):
+    """
+    사용자에게 지금까지 발급된 access token 을 모두 폐기한다. commit 은 호출자가 수행한다.
+    iat 가 폐기 시각(초)보다 작은 토큰만 폐기하므로 폐기 직후 같은 초에 로그인해 받은 토큰은 유효하다.
+    (같은 초에 폐기 전에 발급된 토큰은 남으므로, 요청에 사용한 토큰은 호출자가 revoke_token 으로 따로 폐기한다)
+
+    Args:
+        lifetime (timedelta): access token 유효 기간. 이 기간이 지나면 기록을 삭제한다.
+
+    Returns:
+        int: RevokedTokens id
+    """
+    _prune_expired(cursor)
+    now = int(time.time())
+    cursor.execute(
+        "INSERT INTO RevokedTokens (user_id, issued_before, expires_at) VALUES (%s, %s, %s)",
+        (user_id, now, now + int(lifetime.total_seconds()))
+    )
+    revoked_id = cursor.lastrowid
+    record_change(cursor, RevocationIndex.feed, revoked_id)
+    return revoked_id
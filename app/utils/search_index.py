@@ -0,0 +1,185 @@
+"""
+/jobs/search 용 메모리 역색인.
+
+공고 제목과 회사명을 문자 n-gram(1-gram, 2-gram)으로 나누어 색인하므로
+"[사업확장] 각 부문 신규 채용" 같은 한글 제목도 띄어쓰기와 무관하게 부분 일치로 찾을 수 있다.
+검색어의 모든 n-gram 을 포함하는 공고만 결과에 포함하고 BM25 점수로 정렬한다.
+
+BM25 점수는 색인 전체의 통계(문서 수, 평균 길이, gram 별 문서 수)에 따라 달라지므로
+색인 내용의 지문(version)을 함께 반환하여 페이지네이션 cursor 가 같은 순위를 가리키는지 확인할 수 있게 한다.
+"""
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+
+from dotenv import load_dotenv
+
+from app.utils.versions import ChangeFeedIndex
+
+load_dotenv()
+
+BM25_K1 = float(os.getenv('SEARCH_BM25_K1', 1.2))
+BM25_B = float(os.getenv('SEARCH_BM25_B', 0.75))
+
+_WORD = re.compile(r'\w+')
+
+JOB_SUMMARY_QUERY = """
+    SELECT j.id, j.title, c.name AS company_name, j.salary, j.deadline
+    FROM Jobs j
+    JOIN Companies c ON j.company_id = c.id
+"""
+
+
+def _doc_hash(job_id, title, company_name):
+    # 프로세스마다 달라지는 hash() 대신 blake2b 를 써서 워커 간에 같은 값을 얻는다
+    digest = hashlib.blake2b(f"{job_id}\0{title}\0{company_name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def tokenize(text):
+    """
+    텍스트를 n-gram 목록으로 나눈다. 단어 경계는 넘지 않는다.
+
+    Args:
+        text (str): 제목 또는 회사명
+
+    Returns:
+        list: 1-gram 과 2-gram 목록
+    """
+    grams = []
+    for word in _WORD.findall((text or '').lower()):
+        grams.extend(word)
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def query_grams(keyword):
+    """검색어의 n-gram. 두 글자 이상인 단어는 2-gram, 한 글자 단어는 1-gram 을 사용한다."""
+    grams = []
+    for word in _WORD.findall((keyword or '').lower()):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(grams))
+
+
+class SearchIndex(ChangeFeedIndex):
+    """
+    공고 제목/회사명 n-gram 역색인.
+
+    공고 요약(id, title, company_name, salary, deadline)을 함께 보관하여
+    검색 결과를 DB 조회 없이 반환한다.
+    """
+
+    feed = 'jobs'
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        super().__init__()
+        self.k1 = k1
+        self.b = b
+        self._docs = {}       # job_id -> 공고 요약
+        self._doc_grams = {}  # job_id -> Counter(gram)
+        self._doc_len = {}    # job_id -> gram 개수
+        self._postings = {}   # gram -> {job_id: tf}
+        self._total_len = 0
+        self._doc_hash = {}   # job_id -> 순위에 영향을 주는 내용(제목/회사명)의 해시
+        self._fingerprint = 0  # 모든 _doc_hash 의 XOR. 워커가 달라도 색인 내용이 같으면 같은 값
+
+    def _index(self, row):
+        job_id = row['id']
+        self._unindex(job_id)
+
+        grams = Counter(tokenize(row['title']) + tokenize(row['company_name']))
+        for gram, tf in grams.items():
+            self._postings.setdefault(gram, {})[job_id] = tf
+        self._docs[job_id] = dict(row)
+        self._doc_grams[job_id] = grams
+        self._doc_len[job_id] = sum(grams.values())
+        self._total_len += self._doc_len[job_id]
+        self._doc_hash[job_id] = _doc_hash(job_id, row['title'], row['company_name'])
+        self._fingerprint ^= self._doc_hash[job_id]
+
+    def _unindex(self, job_id):
+        grams = self._doc_grams.pop(job_id, None)
+        if grams is None:
+            return
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[gram]
+        self._docs.pop(job_id, None)
+        self._total_len -= self._doc_len.pop(job_id)
+        self._fingerprint ^= self._doc_hash.pop(job_id)
+
+    def _load_all(self, cursor):
+        cursor.execute(JOB_SUMMARY_QUERY)
+        rows = cursor.fetchall()
+        with self._lock:
+            self._docs, self._doc_grams, self._doc_len, self._postings, self._total_len = {}, {}, {}, {}, 0
+            self._doc_hash, self._fingerprint = {}, 0
+            for row in rows:
+                self._index(row)
+
+    def _load_ids(self, cursor, ids):
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(JOB_SUMMARY_QUERY + f" WHERE j.id IN ({placeholders})", ids)
+        rows = cursor.fetchall()
+        found = {row['id'] for row in rows}
+        with self._lock:
+            for row in rows:
+                self._index(row)
+            for job_id in ids:
+                if job_id not in found:
+                    self._unindex(job_id)
+
+    def search(self, keyword):
+        """
+        검색어를 포함하는 공고를 BM25 점수 순으로 반환한다.
+
+        Args:
+            keyword (str): 검색어
+
+        Returns:
+            tuple: (색인 version, (score, 공고 요약) 목록). 목록은 점수 내림차순, 같은 점수는 id 오름차순.
+                   version 이 같으면 같은 검색어의 결과 순서도 같다.
+        """
+        self.ensure_built()
+        grams = query_grams(keyword)
+
+        with self._lock:
+            version = f"{self._fingerprint:016x}"
+            postings = [self._postings.get(gram) for gram in grams]
+            if not grams or not all(postings):
+                return version, []
+
+            # 가장 짧은 posting 부터 교집합을 구한다
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return version, []
+
+            total_docs = len(self._docs)
+            avg_len = self._total_len / total_docs if total_docs else 0
+            results = []
+            for job_id in candidates:
+                doc_len = self._doc_len[job_id]
+                norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len) if avg_len else self.k1
+                score = 0.0
+                for posting in postings:
+                    tf = posting[job_id]
+                    idf = math.log(1 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                    score += idf * tf * (self.k1 + 1) / (tf + norm)
+                results.append((score, self._docs[job_id]))
+
+        results.sort(key=lambda result: (-result[0], result[1]['id']))
+        return version, results
+
+
+search_index = SearchIndex()
@@ -0,0 +1,231 @@
+"""
+여러 워커 프로세스가 가진 메모리 데이터를 맞추기 위한 버전 카운터.
+
+데이터를 변경하는 쪽은 같은 트랜잭션 안에서 bump_version() 으로 ReferenceVersions 의
+버전을 올리고, 각 워커의 watcher 는 주기적으로 버전 행만 읽어(PK 조회) 바뀐 이름의
+구독자에게 알린다. 구독자는 바뀐 부분만 다시 읽어 온다.
+
+행 단위로 바뀐 대상을 알아야 하는 경우(공고 검색 색인 등)는 record_change() 로
+ChangeLog 에 (버전, id) 를 남기고, ChangeFeedIndex 를 상속한 색인이 그 id 만 다시 읽는다.
+"""
+import os
+import threading
+import time
+
+import pymysql
+
+from dotenv import load_dotenv
+
+from app.utils.DB_Utils import get_db_connection
+
+load_dotenv()
+
+VERSION_POLL_INTERVAL = float(os.getenv('VERSION_POLL_INTERVAL', 2))  # 버전 확인 주기(초)
+CHANGE_LOG_RETENTION_HOURS = int(os.getenv('CHANGE_LOG_RETENTION_HOURS', 24))  # ChangeLog 보관 기간(시간)
+
+
+def bump_version(cursor, name):
+    """
+    name 의 버전을 1 올린다. 호출한 트랜잭션이 commit 되어야 다른 워커에 보인다.
+
+    Returns:
+        int: 올라간 버전
+    """
+    cursor.execute("""
+        INSERT INTO ReferenceVersions (name, version) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE version = LAST_INSERT_ID(version + 1)
+    """, (name,))
+    return cursor.lastrowid or 1
+
+
+def record_change(cursor, name, entity_id):
+    """
+    name 의 버전을 올리고 바뀐 행의 id 를 ChangeLog 에 남긴다. (commit 은 호출자가 수행)
+
+    Returns:
+        int: 올라간 버전
+    """
+    version = bump_version(cursor, name)
+    cursor.execute(
+        "INSERT INTO ChangeLog (name, version, entity_id) VALUES (%s, %s, %s)",
+        (name, version, entity_id)
+    )
+    return version
+
+
+def read_versions(cursor):
+    """현재 버전 전체를 {name: version} 으로 읽는다."""
+    cursor.execute("SELECT name, version FROM ReferenceVersions")
+    return {name: version for name, version in cursor.fetchall()}
+
+
+class VersionWatcher:
+    """
+    ReferenceVersions 를 주기적으로 읽어 버전이 바뀐 이름의 구독자를 호출한다.
+    폴링 스레드는 첫 구독 시(워커가 fork 된 뒤) 시작된다.
+
+    Args:
+        interval (float): 폴링 주기(초). 다른 워커의 변경이 반영되기까지의 최대 지연.
+    """
+
+    def __init__(self, interval=VERSION_POLL_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._listeners = {}   # name -> [callback(version)]
+        self._thread = None
+        self._pid = None
+
+    def subscribe(self, name, callback):
+        """name 의 버전이 바뀔 때마다 callback(version) 을 호출하도록 등록한다."""
+        with self._lock:
+            callbacks = self._listeners.setdefault(name, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+            self._start()
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='version-watcher', daemon=True)
+        self._thread.start()
+
+    def poll(self):
+        """버전을 한 번 읽어 구독자에게 알린다."""
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            versions = read_versions(cursor)
+        finally:
+            cursor.close()
+            connection.close()
+
+        with self._lock:
+            listeners = {name: list(callbacks) for name, callbacks in self._listeners.items()}
+
+        for name, callbacks in listeners.items():
+            version = versions.get(name, 0)
+            for callback in callbacks:
+                try:
+                    callback(version)
+                except Exception as e:
+                    print(f"버전 변경 처리 실패 ({name}={version}): {e}")
+
+    def _run(self):
+        last_prune = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+                if time.monotonic() - last_prune > 3600:
+                    last_prune = time.monotonic()
+                    prune_change_log()
+            except Exception as e:
+                print(f"버전 확인 실패: {e}")
+
+
+watcher = VersionWatcher()
+
+
+def prune_change_log(hours=CHANGE_LOG_RETENTION_HOURS):
+    """보관 기간이 지난 ChangeLog 를 삭제한다. 그보다 오래 뒤처진 워커는 색인을 새로 만든다."""
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "DELETE FROM ChangeLog WHERE changed_at < NOW() - INTERVAL %s HOUR LIMIT 10000",
+            (hours,)
+        )
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+class ChangeFeedIndex:
+    """
+    DB 데이터로 만든 메모리 색인의 기반 클래스.
+
+    처음 사용할 때 전체를 읽어 만들고(_load_all), 이후에는 ChangeLog 에 기록된 id 만
+    다시 읽어(_load_ids) 반영한다. 이 워커에서 변경한 행은 refresh() 로 바로 반영하고,
+    다른 워커가 변경한 행은 watcher 가 버전 변경을 감지했을 때 반영된다.
+    ChangeLog 에 빠진 버전이 있으면(대량 적재, 보관 기간 초과 등) 전체를 다시 만든다.
+
+    하위 클래스는 feed 이름과 _load_all(cursor), _load_ids(cursor, ids) 를 구현한다.
+    """
+
+    feed = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = 0
+        self._subscribed_pid = None
+
+    def ensure_built(self):
+        # 앱 로드 시 만든 색인은 fork 된 워커에 복사되지만 watcher 스레드는 없으므로 프로세스마다 구독한다
+        if self._built and self._subscribed_pid == os.getpid():
+            return
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+        watcher.subscribe(self.feed, self._on_version)
+        self._subscribed_pid = os.getpid()
+
+    def rebuild(self):
+        """DB 에서 전체를 다시 읽어 색인을 만든다."""
+        connection = get_db_connection()
+        cursor = connection.cursor(pymysql.cursors.DictCursor)
+        try:
+            # 버전을 먼저 읽어야 읽는 도중의 변경을 놓치지 않는다
+            cursor.execute("SELECT version FROM ReferenceVersions WHERE name = %s", (self.feed,))
+            row = cursor.fetchone()
+            version = row['version'] if row else 0
+            self._load_all(cursor)
+        finally:
+            cursor.close()
+            connection.close()
+        self._version = version
+        self._built = True
+
+    def refresh(self, ids):
+        """지정한 id 의 행을 DB 에서 다시 읽어 반영한다. (없어진 행은 색인에서 제거)"""
+        if not self._built or not ids:
+            return
+        connection = get_db_connection()
+        cursor = connection.cursor(pymysql.cursors.DictCursor)
+        try:
+            self._load_ids(cursor, list(set(ids)))
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _on_version(self, version):
+        if not self._built or version <= self._version:
+            return
+
+        connection = get_db_connection()
+        cursor = connection.cursor(pymysql.cursors.DictCursor)
+        try:
+            cursor.execute("""
+                SELECT version, entity_id FROM ChangeLog
+                WHERE name = %s AND version > %s AND version <= %s
+            """, (self.feed, self._version, version))
+            changes = cursor.fetchall()
+            complete = len({change['version'] for change in changes}) == version - self._version
+            if complete:
+                self._load_ids(cursor, list({change['entity_id'] for change in changes}))
+        finally:
+            cursor.close()
+            connection.close()
+
+        if complete:
+            self._version = version
+        else:
+            self.rebuild()
+
+    def _load_all(self, cursor):
+        raise NotImplementedError
+
+    def _load_ids(self, cursor, ids):
+        raise NotImplementedError
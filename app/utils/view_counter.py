@@ -0,0 +1,124 @@
+"""
+공고 조회수 write-behind 카운터.
+
+조회할 때마다 UPDATE 하는 대신 워커 메모리에 증가분을 모아 두고, 주기적으로
+여러 공고의 증가분을 UPDATE 한 번으로 반영한다. 프로세스 종료 시에도 남은 증가분을 반영한다.
+응답의 조회수는 DB 값 + 아직 반영되지 않은 증가분(pending)으로 계산한다.
+"""
+import atexit
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from app.utils.DB_Utils import get_db_connection
+
+load_dotenv()
+
+VIEW_FLUSH_INTERVAL = float(os.getenv('VIEW_FLUSH_INTERVAL', 5))  # 조회수 반영 주기(초)
+VIEW_FLUSH_BATCH = 500  # UPDATE 한 번에 반영할 최대 공고 수
+
+
+class ViewCounter:
+    """
+    공고별 조회수 증가분을 모아 주기적으로 DB 에 반영한다.
+
+    Args:
+        interval (float): 반영 주기(초). 프로세스가 비정상 종료되면 이 시간만큼의 조회수를 잃을 수 있다.
+    """
+
+    def __init__(self, interval=VIEW_FLUSH_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending = {}    # job_id -> 아직 반영하지 않은 증가분
+        self._flushing = {}   # job_id -> 반영 중인 증가분 (commit 후 캐시를 지울 때까지 pending 에 포함)
+        self._listeners = []  # callback(job_ids), 반영 후 호출
+        self._thread = None
+        self._pid = None
+
+    def increment(self, job_id, count=1):
+        with self._lock:
+            self._start()
+            self._pending[job_id] = self._pending.get(job_id, 0) + count
+
+    def pending(self, job_id):
+        """job_id 의 DB 에 아직 반영되지 않은 조회수."""
+        with self._lock:
+            return self._pending.get(job_id, 0) + self._flushing.get(job_id, 0)
+
+    def on_flush(self, callback):
+        """증가분을 DB 에 반영한 뒤 callback(job_ids) 를 호출하도록 등록한다."""
+        self._listeners.append(callback)
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        if self._pid is not None and self._pid != os.getpid():
+            # fork 이전 프로세스의 증가분은 부모가 반영한다
+            self._pending, self._flushing = {}, {}
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """모아 둔 증가분을 DB 에 반영한다. 실패하면 증가분을 되돌려 다음 주기에 다시 시도한다."""
+        with self._lock:
+            if not self._pending or self._flushing:
+                return
+            self._flushing, self._pending = self._pending, {}
+            flushing = self._flushing
+
+        job_ids = list(flushing)
+        connection = get_db_connection()
+        cursor = connection.cursor()
+        try:
+            for start in range(0, len(job_ids), VIEW_FLUSH_BATCH):
+                chunk = job_ids[start:start + VIEW_FLUSH_BATCH]
+                cases = ' '.join(['WHEN %s THEN %s'] * len(chunk))
+                placeholders = ', '.join(['%s'] * len(chunk))
+                params = [value for job_id in chunk for value in (job_id, flushing[job_id])]
+                cursor.execute(
+                    f"UPDATE Jobs SET views = views + CASE id {cases} END WHERE id IN ({placeholders})",
+                    params + chunk
+                )
+            connection.commit()
+        except Exception:
+            # 트랜잭션은 커넥션을 풀에 반환할 때 rollback 된다
+            with self._lock:
+                for job_id, count in flushing.items():
+                    self._pending[job_id] = self._pending.get(job_id, 0) + count
+                self._flushing = {}
+            raise
+        finally:
+            cursor.close()
+            connection.close()
+
+        for callback in self._listeners:
+            try:
+                callback(job_ids)
+            except Exception as e:
+                print(f"조회수 반영 후 처리 실패: {e}")
+        with self._lock:
+            self._flushing = {}
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"조회수 반영 실패 (다음 주기에 재시도): {e}")
+
+
+view_counter = ViewCounter()
+
+
+def _flush_at_exit():
+    try:
+        view_counter.flush()
+    except Exception as e:
+        print(f"종료 시 조회수 반영 실패: {e}")
+
+
+atexit.register(_flush_at_exit)
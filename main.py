@@ -1,6 +1,8 @@
 from app.Crawling import CSV_to_DB
 from flask import Flask
 from app.routes import auth, jobs, applications, bookmarks, resumes
+from app.utils import DB_Utils, query_stats
+from app.utils.jwt_token import ACCESS_TOKEN_LIFETIME
 from flask_swagger_ui import get_swaggerui_blueprint
 from flask_jwt_extended import JWTManager
 import os
@@ -19,10 +21,17 @@ app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')  # JWT 서명 키
 app.config['JWT_TOKEN_LOCATION'] = ['headers']  # 토큰을 받는 위치
 app.config['JWT_HEADER_NAME'] = 'Authorization'
 app.config['JWT_HEADER_TYPE'] = 'Bearer'
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 15 * 60  # 15분
+app.config['JWT_ACCESS_TOKEN_EXPIRES'] = ACCESS_TOKEN_LIFETIME  # 15분
 
 jwt = JWTManager(app)
 
+# 요청 단위 DB 커넥션 풀 연결
+DB_Utils.init_app(app)
+# 요청별 SQL 통계 헤더 및 slow query log (DB_QUERY_STATS=true 일 때)
+query_stats.init_app(app)
+# 검색/필터 메모리 색인을 DB 에서 미리 생성 (WSGI 서버로 실행해도 첫 요청이 색인 생성을 기다리지 않도록)
+jobs.warm_up_indexes()
+
 app.register_blueprint(auth.bp, url_prefix='/auth')
 app.register_blueprint(jobs.bp, url_prefix='/jobs')
 app.register_blueprint(applications.bp, url_prefix='/applications')